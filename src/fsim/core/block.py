@@ -1,9 +1,19 @@
 
 from __future__ import annotations 
 from dataclasses import dataclass ,field 
-from typing import Optional 
+from typing import Dict ,Optional 
 
 _ZERO =b"\x00"
+_ZERO_PAYLOADS :Dict [int ,bytes ]={}
+
+
+def zero_payload (block_size :int )->bytes :
+
+    payload =_ZERO_PAYLOADS .get (block_size )
+    if payload is None :
+        payload =_ZERO *block_size 
+        _ZERO_PAYLOADS [block_size ]=payload 
+    return payload 
 
 
 @dataclass 
@@ -46,7 +56,7 @@ class Block :
 
         if block_size <0 :
             raise ValueError ("block_size debe ser >= 0")
-        self .data =_ZERO *block_size 
+        self .data =zero_payload (block_size )
 
     def write_partial (
     self ,
@@ -0,0 +1,245 @@
+from __future__ import annotations 
+from typing import Callable ,Dict ,List ,Optional ,Sequence ,Tuple 
+
+from .extents import physical_runs 
+from .free_space import BitmapView ,PackedBitmap 
+
+
+class BuddyFreeSpaceManager :
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    *,
+    preoccupied :Optional [Sequence [int ]]=None ,
+    on_bitmap_update :Optional [Callable [[BitmapView ],None ]]=None ,
+    )->None :
+
+        if n_blocks <=0 :
+            raise ValueError ("n_blocks debe ser > 0")
+
+        self .n_blocks :int =int (n_blocks )
+        self .bitmap :PackedBitmap =PackedBitmap (self .n_blocks )
+        self ._bitmap_view =BitmapView (self .n_blocks ,self .bitmap .__getitem__ ,self .bitmap .tolist )
+        self .on_bitmap_update =on_bitmap_update 
+        self .max_order :int =self .n_blocks .bit_length ()-1 
+        self ._free_lists :List [Dict [int ,None ]]=[{}for _ in range (self .max_order +1 )]
+        self ._allocated :Dict [int ,Tuple [int ,int ]]={}
+        self ._free :int =self .n_blocks 
+        self .wasted_blocks :int =0 
+        self .splits :int =0 
+        self .merges :int =0 
+
+        start =0 
+        while start <self .n_blocks :
+            order =(self .n_blocks -start ).bit_length ()-1 
+            if start :
+                order =min (order ,(start &-start ).bit_length ()-1 )
+            self ._free_lists [order ][start ]=None 
+            start +=1 <<order 
+
+        if preoccupied :
+            self ._check_indices (preoccupied )
+            for i in preoccupied :
+                if not self .bitmap [i ]:
+                    self ._reserve_block (i )
+
+    def allocate (self ,n :int ,contiguous :bool =False ,goal :Optional [int ]=None )->List [int ]:
+
+        if n <=0 :
+            raise ValueError ("n debe ser > 0")
+        if goal is not None :
+            self ._check_index (goal )
+
+        if contiguous :
+            order =(n -1 ).bit_length ()
+            start =self ._split_block (order ,goal )
+            if start is None :
+                raise MemoryError ("No hay espacio contiguo suficiente")
+            self ._commit (start ,order ,n )
+            indices =list (range (start ,start +n ))
+        else :
+            if self ._free <n :
+                raise MemoryError ("No hay bloques libres suficientes")
+            indices =[]
+            pending =[k for k in range (n .bit_length ())if n >>k &1 ]
+            while pending :
+                order =pending .pop ()
+                start =self ._split_block (order ,goal )
+                if start is None :
+                    pending .extend ((order -1 ,order -1 ))
+                    continue 
+                self ._commit (start ,order ,1 <<order )
+                indices .extend (range (start ,start +(1 <<order )))
+            indices .sort ()
+
+        if self .on_bitmap_update :
+            self .on_bitmap_update (self ._bitmap_view )
+
+        return indices 
+
+    def free (self ,block_list :List [int ])->None :
+
+        if not block_list :
+            return 
+        self ._check_indices (block_list )
+
+        if len (set (block_list ))!=len (block_list ):
+            raise ValueError ("La lista de bloques a liberar contiene duplicados")
+
+        releases :List [int ]=[]
+        for start ,count in physical_runs (sorted (block_list )):
+            p ,end =start ,start +count 
+            while p <end :
+                entry =self ._allocated .get (p )
+                if entry is None :
+                    if self .bitmap [p ]==0 :
+                        raise ValueError (f"El bloque {p } ya está libre (posible doble liberación)")
+                    raise ValueError (f"El bloque {p } no es el inicio de una asignación")
+                if p +entry [1 ]>end :
+                    raise ValueError (f"Liberación parcial de la asignación en {p } ({entry [1 ]} bloques)")
+                releases .append (p )
+                p +=entry [1 ]
+
+        for start in releases :
+            order ,used =self ._allocated .pop (start )
+            self .wasted_blocks -=(1 <<order )-used 
+            self .bitmap .set_range (start ,1 <<order ,0 )
+            self ._release (start ,order )
+
+        if self .on_bitmap_update :
+            self .on_bitmap_update (self ._bitmap_view )
+
+    def reserve_exact (self ,indices :Sequence [int ])->None :
+
+        self ._check_indices (indices )
+
+        for i in indices :
+            if self .bitmap [i ]==1 :
+                raise ValueError (f"El bloque {i } ya está ocupado")
+        for i in sorted (set (indices )):
+            self ._reserve_block (i )
+
+    def used_count (self )->int :
+
+        return self .n_blocks -self ._free 
+
+    def free_count (self )->int :
+
+        return self ._free 
+
+    def occupancy_pct (self )->float :
+
+        return 100.0 *(self .used_count ()/self .n_blocks )
+
+    def free_runs (self )->List [Tuple [int ,int ]]:
+
+        return sorted ((start ,1 <<order )for order ,starts in enumerate (self ._free_lists )for start in starts )
+
+    def largest_free_run_size (self )->int :
+
+        for order in range (self .max_order ,-1 ,-1 ):
+            if self ._free_lists [order ]:
+                return 1 <<order 
+        return 0 
+
+    def external_fragmentation_ratio (self )->float :
+
+        if self ._free ==0 :
+            return 0.0 
+        return 1.0 -(self .largest_free_run_size ()/self ._free )
+
+    def internal_fragmentation_ratio (self )->float :
+
+        used =self .used_count ()
+        return self .wasted_blocks /used if used else 0.0 
+
+    def snapshot_bitmap (self )->List [int ]:
+
+        return self .bitmap .tolist ()
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "max_order":self .max_order ,
+        "free_blocks_by_order":{1 <<order :len (starts )for order ,starts in enumerate (self ._free_lists )if starts },
+        "wasted_blocks":self .wasted_blocks ,
+        "internal_fragmentation_pct":round (self .internal_fragmentation_ratio ()*100.0 ,2 ),
+        "splits":self .splits ,
+        "merges":self .merges ,
+        }
+
+    def _split_block (self ,order :int ,goal :Optional [int ]=None )->Optional [int ]:
+        for k in range (order ,self .max_order +1 ):
+            if self ._free_lists [k ]:
+                break 
+        else :
+            return None 
+        if goal is None :
+            start ,_ =self ._free_lists [k ].popitem ()
+        else :
+            start =min (self ._free_lists [k ],key =lambda b :(_distance (b ,1 <<k ,goal ),b ))
+            del self ._free_lists [k ][start ]
+        while k >order :
+            k -=1 
+            half =start +(1 <<k )
+            if goal is not None and goal >=half :
+                self ._free_lists [k ][start ]=None 
+                start =half 
+            else :
+                self ._free_lists [k ][half ]=None 
+            self .splits +=1 
+        return start 
+
+    def _reserve_block (self ,i :int )->None :
+        for k in range (self .max_order +1 ):
+            base =i >>k <<k 
+            if base in self ._free_lists [k ]:
+                break 
+        else :
+            raise ValueError (f"El bloque {i } ya está ocupado")
+        del self ._free_lists [k ][base ]
+        while k >0 :
+            k -=1 
+            half =base +(1 <<k )
+            if i >=half :
+                self ._free_lists [k ][base ]=None 
+                base =half 
+            else :
+                self ._free_lists [k ][half ]=None 
+            self .splits +=1 
+        self ._commit (i ,0 ,1 )
+
+    def _commit (self ,start :int ,order :int ,used :int )->None :
+        self ._allocated [start ]=(order ,used )
+        self ._free -=1 <<order 
+        self .wasted_blocks +=(1 <<order )-used 
+        self .bitmap .set_range (start ,1 <<order ,1 )
+
+    def _release (self ,start :int ,order :int )->None :
+        self ._free +=1 <<order 
+        while order <self .max_order :
+            buddy =start ^(1 <<order )
+            if buddy not in self ._free_lists [order ]:
+                break 
+            del self ._free_lists [order ][buddy ]
+            start =min (start ,buddy )
+            order +=1 
+            self .merges +=1 
+        self ._free_lists [order ][start ]=None 
+
+    def _check_index (self ,i :int )->None :
+        if not isinstance (i ,int ):
+            raise TypeError ("El índice debe ser int")
+        if i <0 or i >=self .n_blocks :
+            raise IndexError (f"Índice fuera de rango: {i } (0..{self .n_blocks -1 })")
+
+    def _check_indices (self ,idxs :Sequence [int ])->None :
+        for i in idxs :
+            self ._check_index (i )
+
+
+def _distance (start :int ,size :int ,goal :int )->int :
+    if goal <start :
+        return start -goal 
+    return max (0 ,goal -(start +size -1 ))
@@ -0,0 +1,548 @@
+from __future__ import annotations 
+from abc import ABC ,abstractmethod 
+from collections import OrderedDict 
+from typing import Dict ,List ,Optional ,Sequence ,Set ,Type 
+
+from .disk import extent_lengths ,_nbytes 
+from .disk_layer import DiskLayer 
+from .extents import physical_runs 
+from .filesystem_base import DiskLike 
+
+DEFAULT_CACHE_BLOCKS =1024 
+
+
+class CachePolicy (ABC ):
+
+    name =""
+
+    def __init__ (self ,capacity :int )->None :
+
+        if capacity <=0 :
+            raise ValueError ("La capacidad de la caché debe ser > 0")
+        self .capacity :int =int (capacity )
+
+    @abstractmethod 
+    def __contains__ (self ,key :int )->bool :
+        raise NotImplementedError 
+
+    @abstractmethod 
+    def __len__ (self )->int :
+        raise NotImplementedError 
+
+    @abstractmethod 
+    def touch (self ,key :int )->None :
+
+        raise NotImplementedError 
+
+    @abstractmethod 
+    def admit (self ,key :int )->List [int ]:
+
+        raise NotImplementedError 
+
+    @abstractmethod 
+    def discard (self ,key :int )->None :
+
+        raise NotImplementedError 
+
+
+class LRUPolicy (CachePolicy ):
+
+    name ="lru"
+
+    def __init__ (self ,capacity :int )->None :
+        super ().__init__ (capacity )
+        self ._order :OrderedDict [int ,None ]=OrderedDict ()
+
+    def __contains__ (self ,key :int )->bool :
+        return key in self ._order 
+
+    def __len__ (self )->int :
+        return len (self ._order )
+
+    def touch (self ,key :int )->None :
+        self ._order .move_to_end (key )
+
+    def admit (self ,key :int )->List [int ]:
+        evicted :List [int ]=[]
+        if len (self ._order )>=self .capacity :
+            victim ,_ =self ._order .popitem (last =False )
+            evicted .append (victim )
+        self ._order [key ]=None 
+        return evicted 
+
+    def discard (self ,key :int )->None :
+        self ._order .pop (key ,None )
+
+
+class ClockPolicy (CachePolicy ):
+
+    name ="clock"
+
+    def __init__ (self ,capacity :int )->None :
+        super ().__init__ (capacity )
+        self ._keys :List [Optional [int ]]=[None ]*self .capacity 
+        self ._ref =bytearray (self .capacity )
+        self ._slot_of :Dict [int ,int ]={}
+        self ._free :List [int ]=list (range (self .capacity -1 ,-1 ,-1 ))
+        self ._hand :int =0 
+
+    def __contains__ (self ,key :int )->bool :
+        return key in self ._slot_of 
+
+    def __len__ (self )->int :
+        return len (self ._slot_of )
+
+    def touch (self ,key :int )->None :
+        self ._ref [self ._slot_of [key ]]=1 
+
+    def admit (self ,key :int )->List [int ]:
+        evicted :List [int ]=[]
+        if self ._free :
+            slot =self ._free .pop ()
+        else :
+            while self ._ref [self ._hand ]:
+                self ._ref [self ._hand ]=0 
+                self ._hand =(self ._hand +1 )%self .capacity 
+            slot =self ._hand 
+            victim =self ._keys [slot ]
+            del self ._slot_of [victim ]
+            evicted .append (victim )
+            self ._hand =(self ._hand +1 )%self .capacity 
+        self ._keys [slot ]=key 
+        self ._ref [slot ]=0 
+        self ._slot_of [key ]=slot 
+        return evicted 
+
+    def discard (self ,key :int )->None :
+        slot =self ._slot_of .pop (key ,None )
+        if slot is not None :
+            self ._keys [slot ]=None 
+            self ._ref [slot ]=0 
+            self ._free .append (slot )
+
+
+class TwoQueuePolicy (CachePolicy ):
+
+    name ="2q"
+
+    def __init__ (self ,capacity :int ,*,kin_fraction :float =0.25 ,kout_fraction :float =0.5 )->None :
+        super ().__init__ (capacity )
+        self .kin :int =max (1 ,int (self .capacity *kin_fraction ))
+        self .kout :int =max (1 ,int (self .capacity *kout_fraction ))
+        self ._a1in :OrderedDict [int ,None ]=OrderedDict ()
+        self ._a1out :OrderedDict [int ,None ]=OrderedDict ()
+        self ._am :OrderedDict [int ,None ]=OrderedDict ()
+
+    def __contains__ (self ,key :int )->bool :
+        return key in self ._am or key in self ._a1in 
+
+    def __len__ (self )->int :
+        return len (self ._am )+len (self ._a1in )
+
+    def touch (self ,key :int )->None :
+        if key in self ._am :
+            self ._am .move_to_end (key )
+
+    def admit (self ,key :int )->List [int ]:
+        evicted :List [int ]=[]
+        if len (self )>=self .capacity :
+            if len (self ._a1in )>self .kin or not self ._am :
+                victim ,_ =self ._a1in .popitem (last =False )
+                self ._a1out [victim ]=None 
+                if len (self ._a1out )>self .kout :
+                    self ._a1out .popitem (last =False )
+            else :
+                victim ,_ =self ._am .popitem (last =False )
+            evicted .append (victim )
+
+        if key in self ._a1out :
+            del self ._a1out [key ]
+            self ._am [key ]=None 
+        else :
+            self ._a1in [key ]=None 
+        return evicted 
+
+    def discard (self ,key :int )->None :
+        self ._a1in .pop (key ,None )
+        self ._am .pop (key ,None )
+        self ._a1out .pop (key ,None )
+
+
+class ARCPolicy (CachePolicy ):
+
+    name ="arc"
+
+    def __init__ (self ,capacity :int )->None :
+        super ().__init__ (capacity )
+        self .p :float =0.0 
+        self ._t1 :OrderedDict [int ,None ]=OrderedDict ()
+        self ._t2 :OrderedDict [int ,None ]=OrderedDict ()
+        self ._b1 :OrderedDict [int ,None ]=OrderedDict ()
+        self ._b2 :OrderedDict [int ,None ]=OrderedDict ()
+
+    def __contains__ (self ,key :int )->bool :
+        return key in self ._t1 or key in self ._t2 
+
+    def __len__ (self )->int :
+        return len (self ._t1 )+len (self ._t2 )
+
+    def touch (self ,key :int )->None :
+        if key in self ._t1 :
+            del self ._t1 [key ]
+        else :
+            del self ._t2 [key ]
+        self ._t2 [key ]=None 
+
+    def admit (self ,key :int )->List [int ]:
+        c =self .capacity 
+        evicted :List [int ]=[]
+
+        if key in self ._b1 :
+            self .p =min (float (c ),self .p +max (len (self ._b2 )/len (self ._b1 ),1.0 ))
+            self ._replace (key ,evicted )
+            del self ._b1 [key ]
+            self ._t2 [key ]=None 
+            return evicted 
+
+        if key in self ._b2 :
+            self .p =max (0.0 ,self .p -max (len (self ._b1 )/len (self ._b2 ),1.0 ))
+            self ._replace (key ,evicted )
+            del self ._b2 [key ]
+            self ._t2 [key ]=None 
+            return evicted 
+
+        l1 =len (self ._t1 )+len (self ._b1 )
+        total =l1 +len (self ._t2 )+len (self ._b2 )
+        if l1 >=c :
+            if len (self ._t1 )<c :
+                self ._b1 .popitem (last =False )
+                self ._replace (key ,evicted )
+            else :
+                victim ,_ =self ._t1 .popitem (last =False )
+                evicted .append (victim )
+        elif total >=c :
+            if total >=2 *c :
+                self ._b2 .popitem (last =False )
+            self ._replace (key ,evicted )
+        self ._t1 [key ]=None 
+        return evicted 
+
+    def discard (self ,key :int )->None :
+        for lst in (self ._t1 ,self ._t2 ,self ._b1 ,self ._b2 ):
+            lst .pop (key ,None )
+
+    def _replace (self ,key :int ,evicted :List [int ])->None :
+        if len (self )<self .capacity :
+            return 
+        if self ._t1 and (len (self ._t1 )>self .p or (key in self ._b2 and len (self ._t1 )==int (self .p ))):
+            victim ,_ =self ._t1 .popitem (last =False )
+            self ._b1 [victim ]=None 
+        elif self ._t2 :
+            victim ,_ =self ._t2 .popitem (last =False )
+            self ._b2 [victim ]=None 
+        else :
+            return 
+        evicted .append (victim )
+
+
+CACHE_POLICIES :Dict [str ,Type [CachePolicy ]]={
+"lru":LRUPolicy ,
+"clock":ClockPolicy ,
+"2q":TwoQueuePolicy ,
+"arc":ARCPolicy ,
+}
+
+
+def make_policy (name :str ,capacity :int )->CachePolicy :
+
+    try :
+        policy_class =CACHE_POLICIES [name ]
+    except KeyError :
+        raise ValueError (f"Política de caché inválida: {name } (usa {', '.join (CACHE_POLICIES )})")
+    return policy_class (capacity )
+
+
+class BufferCache (DiskLayer ):
+
+    def __init__ (
+    self ,
+    disk :DiskLike ,
+    capacity_blocks :int =DEFAULT_CACHE_BLOCKS ,
+    *,
+    policy :str ="lru",
+    write_back :bool =False ,
+    dirty_limit :Optional [int ]=None ,
+    )->None :
+
+        super ().__init__ (disk )
+        self .policy :CachePolicy =make_policy (policy ,capacity_blocks )
+        if dirty_limit is None :
+            dirty_limit =max (1 ,self .policy .capacity //2 )
+        if dirty_limit <=0 :
+            raise ValueError ("dirty_limit debe ser > 0")
+        self .write_back :bool =bool (write_back )
+        self .dirty_limit :int =int (dirty_limit )
+        self ._data :Dict [int ,Optional [bytes ]]={}
+        self ._dirty :Set [int ]=set ()
+        self ._dirty_new :Set [int ]=set ()
+        self .hits :int =0 
+        self .misses :int =0 
+        self .evictions :int =0 
+        self .logical_writes :int =0 
+        self .physical_writes :int =0 
+        self .coalesced_writes :int =0 
+        self .eviction_writebacks :int =0 
+        self .flush_bursts :int =0 
+        self .flushed_blocks :int =0 
+        self .max_flush_blocks :int =0 
+        self ._prefetched :Set [int ]=set ()
+        self .prefetch_issued :int =0 
+        self .prefetch_used :int =0 
+        self .prefetch_wasted :int =0 
+
+    @property 
+    def capacity_blocks (self )->int :
+
+        return self .policy .capacity 
+
+    def read_block (self ,i :int )->bytes |None :
+
+        if i in self .policy :
+            return self ._hit (i )
+        self .misses +=1 
+        data =self .disk .read_block (i )
+        self ._install (i ,data )
+        return data 
+
+    def write_block (self ,i :int ,data :bytes |None )->None :
+
+        if data is None or not self .write_back :
+            self .disk .write_block (i ,data )
+            if data is not None :
+                self .logical_writes +=1 
+                self .physical_writes +=1 
+            self ._update (i ,data )
+            return 
+
+        self ._check_block (i ,data )
+        self .logical_writes +=1 
+        self ._update (i ,data )
+        self ._mark_dirty (i )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |None ]:
+
+        payloads :List [bytes |None ]=[]
+        missing :List [int ]=[]
+        for i in range (start ,start +count ):
+            if i in self .policy :
+                payloads .append (self ._hit (i ))
+            else :
+                missing .append (i )
+                payloads .append (None )
+
+        for run_start ,run_count in physical_runs (missing ):
+            for k ,data in enumerate (self .disk .read_range (run_start ,run_count )):
+                if isinstance (data ,memoryview ):
+                    data =data .tobytes ()
+                self .misses +=1 
+                self ._install (run_start +k ,data )
+                payloads [run_start +k -start ]=data 
+        return payloads 
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        if payload_buffer is None or not self .write_back :
+            self .disk .write_range (start ,payload_buffer ,count )
+        if payload_buffer is None :
+            for i in range (start ,start +count ):
+                self .invalidate (i )
+            return 
+
+        view =memoryview (payload_buffer ).cast ("B")
+        bs =self .block_size 
+        if count is None :
+            count =max (1 ,-(-view .nbytes //bs ))
+        if start <0 or count <=0 or start +count >self .n_blocks or view .nbytes >count *bs :
+            raise ValueError (f"Rango de escritura inválido: [{start }, {start +count }) con {view .nbytes } B")
+
+        self .logical_writes +=count 
+        if not self .write_back :
+            self .physical_writes +=count 
+        for k ,length in enumerate (extent_lengths (view .nbytes ,count ,bs )):
+            self ._update (start +k ,view [k *bs :k *bs +length ].tobytes ())
+            if self .write_back :
+                self ._mark_dirty (start +k )
+
+    def write_blocks (self ,indices :Sequence [int ],payloads )->None :
+
+        payloads_list =list (payloads )
+        if self .write_back :
+            if len (indices )!=len (payloads_list ):
+                raise ValueError ("indices y payloads deben tener la misma longitud")
+            for i ,p in zip (indices ,payloads_list ):
+                self .write_block (i ,p )
+            return 
+
+        self .disk .write_blocks (indices ,payloads_list )
+        for i ,p in zip (indices ,payloads_list ):
+            self ._update (i ,p )
+            if p is not None :
+                self .logical_writes +=1 
+                self .physical_writes +=1 
+
+    def prefetch (self ,indices :Sequence [int ])->List [bytes |None ]:
+
+        payloads :List [bytes |None ]=[]
+        missing :List [int ]=[]
+        position :Dict [int ,int ]={}
+        for k ,i in enumerate (indices ):
+            if i in self .policy :
+                payloads .append (self ._data [i ])
+            else :
+                missing .append (i )
+                position [i ]=k 
+                payloads .append (None )
+
+        for run_start ,run_count in physical_runs (missing ):
+            for k ,data in enumerate (self .disk .read_range (run_start ,run_count )):
+                if isinstance (data ,memoryview ):
+                    data =data .tobytes ()
+                i =run_start +k 
+                self ._install (i ,data )
+                self ._prefetched .add (i )
+                self .prefetch_issued +=1 
+                payloads [position [i ]]=data 
+        return payloads 
+
+    def trim (self ,indices :Sequence [int ])->None :
+
+        for i in indices :
+            self .invalidate (i )
+        trim =getattr (self .disk ,"trim",None )
+        if trim is not None :
+            trim (indices )
+
+    def prefetch_pending (self )->int :
+
+        return len (self ._prefetched )
+
+    def invalidate (self ,i :int )->None :
+
+        self .policy .discard (i )
+        self ._data .pop (i ,None )
+        self ._dirty .discard (i )
+        self ._dirty_new .discard (i )
+        self ._drop_prefetched (i )
+
+    def sync (self )->int :
+
+        if not self ._dirty :
+            return 0 
+        indices =sorted (self ._dirty )
+        self ._dirty .clear ()
+        self ._dirty_new .clear ()
+        self .disk .write_blocks (indices ,[self ._data [i ]for i in indices ])
+        self .flush_bursts +=1 
+        self .flushed_blocks +=len (indices )
+        self .physical_writes +=len (indices )
+        self .max_flush_blocks =max (self .max_flush_blocks ,len (indices ))
+        return len (indices )
+
+    def dirty_blocks_count (self )->int :
+
+        return len (self ._dirty )
+
+    def used_blocks_count (self )->int :
+
+        return self .disk .used_blocks_count ()+len (self ._dirty_new )
+
+    def is_block_used (self ,i :int )->bool :
+
+        return i in self ._dirty or self .disk .is_block_used (i )
+
+    def hit_ratio (self )->float :
+
+        total =self .hits +self .misses 
+        return self .hits /total if total else 0.0 
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "policy":self .policy .name ,
+        "capacity_blocks":self .capacity_blocks ,
+        "resident_blocks":len (self .policy ),
+        "hits":self .hits ,
+        "misses":self .misses ,
+        "evictions":self .evictions ,
+        "hit_ratio_pct":round (self .hit_ratio ()*100.0 ,2 ),
+        "write_back":self .write_back ,
+        "dirty_blocks":len (self ._dirty ),
+        "logical_writes":self .logical_writes ,
+        "physical_writes":self .physical_writes ,
+        "writes_saved":self .logical_writes -self .physical_writes -len (self ._dirty ),
+        "coalesced_writes":self .coalesced_writes ,
+        "eviction_writebacks":self .eviction_writebacks ,
+        "flush_bursts":self .flush_bursts ,
+        "max_flush_blocks":self .max_flush_blocks ,
+        "avg_flush_blocks":round (self .flushed_blocks /self .flush_bursts ,2 )if self .flush_bursts else 0.0 ,
+        }
+
+    def _update (self ,i :int ,data :bytes |None )->None :
+        if data is None :
+            self .invalidate (i )
+            return 
+        payload =data if type (data )is bytes else bytes (data )
+        self ._drop_prefetched (i )
+        if i in self .policy :
+            self .policy .touch (i )
+            self ._data [i ]=payload 
+        else :
+            self ._install (i ,payload )
+
+    def _install (self ,i :int ,data :bytes |None )->None :
+        for victim in self .policy .admit (i ):
+            payload =self ._data .pop (victim ,None )
+            self .evictions +=1 
+            self ._drop_prefetched (victim )
+            if victim in self ._dirty :
+                self ._dirty .remove (victim )
+                self ._dirty_new .discard (victim )
+                self .disk .write_block (victim ,payload )
+                self .eviction_writebacks +=1 
+                self .physical_writes +=1 
+        self ._data [i ]=data 
+
+    def _hit (self ,i :int )->bytes |None :
+        self .policy .touch (i )
+        self .hits +=1 
+        if i in self ._prefetched :
+            self ._prefetched .remove (i )
+            self .prefetch_used +=1 
+        return self ._data [i ]
+
+    def _drop_prefetched (self ,i :int )->None :
+        if i in self ._prefetched :
+            self ._prefetched .remove (i )
+            self .prefetch_wasted +=1 
+
+    def _mark_dirty (self ,i :int )->None :
+        if i in self ._dirty :
+            self .coalesced_writes +=1 
+            return 
+        if not self .disk .is_block_used (i ):
+            self ._dirty_new .add (i )
+        self ._dirty .add (i )
+        if len (self ._dirty )>=self .dirty_limit :
+            self .sync ()
+
+    def _check_block (self ,i :int ,data )->None :
+        if not isinstance (i ,int ):
+            raise TypeError ("El índice de bloque debe ser int")
+        if i <0 or i >=self .n_blocks :
+            raise IndexError (f"Índice fuera de rango: {i } (0..{self .n_blocks -1 })")
+        if not isinstance (data ,(bytes ,bytearray ,memoryview )):
+            raise TypeError ("data debe ser bytes-like o None")
+        if _nbytes (data )>self .block_size :
+            raise ValueError (
+            f"Tamaño de data ({_nbytes (data )}) excede block_size ({self .block_size })"
+            )
@@ -0,0 +1,133 @@
+from __future__ import annotations 
+from typing import Dict ,List ,Optional 
+
+from .block import zero_payload 
+from .disk import Disk ,extent_lengths 
+from .geometry import LatencyModel 
+
+
+class _Entry :
+
+    __slots__ =("payload","refs")
+
+    def __init__ (self ,payload :bytes )->None :
+        self .payload :bytes =payload 
+        self .refs :int =0 
+
+
+class DedupDisk (Disk ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    block_size :int ,
+    *,
+    prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
+    )->None :
+
+        if n_blocks <=0 :
+            raise ValueError ("n_blocks debe ser > 0")
+        if block_size <=0 :
+            raise ValueError ("block_size debe ser > 0")
+        if prefill is not None and prefill !="zeros":
+            raise ValueError ("prefill inválido. Usa None o 'zeros'.")
+
+        self .n_blocks :int =int (n_blocks )
+        self .block_size :int =int (block_size )
+        self .latency_model =latency_model 
+        self .reset_stats ()
+
+        self ._entries :Dict [bytes ,_Entry ]={}
+        self ._slots :List [Optional [_Entry ]]=[None ]*self .n_blocks 
+        self ._used :int =0 
+        self ._logical_bytes :int =0 
+
+        if prefill =="zeros":
+            entry =self ._intern (zero_payload (self .block_size ))
+            entry .refs =self .n_blocks 
+            self ._slots =[entry ]*self .n_blocks 
+            self ._used =self .n_blocks 
+            self ._logical_bytes =self .n_blocks *self .block_size 
+
+    def unique_payloads (self )->int :
+
+        return len (self ._entries )
+
+    def dedup_ratio (self )->float :
+
+        if not self ._entries :
+            return 1.0 
+        return self ._used /len (self ._entries )
+
+    def dedup_stats (self )->Dict [str ,float ]:
+
+        stored_bytes =sum (len (p )for p in self ._entries )
+        return {
+        "referenced_blocks":self ._used ,
+        "unique_payloads":len (self ._entries ),
+        "logical_bytes":self ._logical_bytes ,
+        "stored_bytes":stored_bytes ,
+        "dedup_ratio":round (self .dedup_ratio (),3 ),
+        "bytes_saved":self ._logical_bytes -stored_bytes ,
+        }
+
+    def fill_block_zeros (self ,i :int )->None :
+
+        self ._check_index (i )
+        self ._count (i ,1 ,True )
+        self .bytes_written +=self .block_size 
+        self ._store (i ,zero_payload (self .block_size ),self .block_size )
+
+    def _load (self ,i :int )->bytes |None :
+        entry =self ._slots [i ]
+        return None if entry is None else entry .payload 
+
+    def _load_view (self ,i :int )->memoryview |None :
+        entry =self ._slots [i ]
+        return None if entry is None else memoryview (entry .payload )
+
+    def _store (self ,i :int ,data ,length :int )->None :
+        payload =data if type (data )is bytes else bytes (data )
+        entry =self ._intern (payload )
+        entry .refs +=1 
+        self ._release (i )
+        self ._slots [i ]=entry 
+        self ._used +=1 
+        self ._logical_bytes +=length 
+
+    def _clear (self ,i :int )->None :
+        self ._release (i )
+        self ._slots [i ]=None 
+
+    def _load_range (self ,start :int ,count :int ,zero_copy :bool )->List [bytes |memoryview |None ]:
+        load =self ._load_view if zero_copy else self ._load 
+        return [load (i )for i in range (start ,start +count )]
+
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        if data is None :
+            for i in range (start ,start +count ):
+                self ._clear (i )
+            return 
+
+        view =memoryview (data ).cast ("B")
+        bs =self .block_size 
+        for k ,length in enumerate (extent_lengths (nbytes ,count ,bs )):
+            self ._store (start +k ,view [k *bs :k *bs +length ],length )
+
+    def _intern (self ,payload :bytes )->_Entry :
+        entry =self ._entries .get (payload )
+        if entry is None :
+            entry =_Entry (payload )
+            self ._entries [payload ]=entry 
+        return entry 
+
+    def _release (self ,i :int )->None :
+        entry =self ._slots [i ]
+        if entry is None :
+            return 
+        entry .refs -=1 
+        if entry .refs ==0 :
+            del self ._entries [entry .payload ]
+        self ._used -=1 
+        self ._logical_bytes -=len (entry .payload )
@@ -1,15 +1,20 @@
-
 from __future__ import annotations 
-from typing import Iterable ,List ,Optional ,Sequence 
-
-from .block import Block 
+import heapq 
+import mmap 
+from array import array 
+from itertools import accumulate 
+from typing import Dict ,Iterable ,Iterator ,List ,Optional ,Sequence ,Tuple 
 
+from .block import Block ,zero_payload 
+from .extents import physical_runs 
+from .geometry import LatencyModel 
 
-class Disk :
-
+EMPTY_LENGTH =-1 
 
 
+class Disk :
 
+    latency_model :Optional [LatencyModel ]=None 
 
     def __init__ (
     self ,
@@ -17,69 +22,90 @@ class Disk :
     block_size :int ,
     *,
     prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
     )->None :
 
         if n_blocks <=0 :
             raise ValueError ("n_blocks debe ser > 0")
         if block_size <=0 :
             raise ValueError ("block_size debe ser > 0")
+        if prefill is not None and prefill !="zeros":
+            raise ValueError ("prefill inválido. Usa None o 'zeros'.")
 
         self .n_blocks :int =int (n_blocks )
         self .block_size :int =int (block_size )
 
-        self ._storage :List [Block ]=[Block (i ,None )for i in range (self .n_blocks )]
-
-        if prefill is not None :
-            if prefill =="zeros":
-                for b in self ._storage :
-                    b .fill_zeros (self .block_size )
-            else :
-                raise ValueError ("prefill inválido. Usa None o 'zeros'.")
-
-
+        self ._buffer =mmap .mmap (-1 ,self .n_blocks *self .block_size )
+        self ._view :memoryview =memoryview (self ._buffer )
+        self ._lengths :array =array ("i",[EMPTY_LENGTH ])*self .n_blocks 
+        self ._used :int =0 
+        self .latency_model =latency_model 
+        self .reset_stats ()
 
+        if prefill =="zeros":
+            self ._lengths =array ("i",[self .block_size ])*self .n_blocks 
+            self ._used =self .n_blocks 
 
     def read_block (self ,i :int )->bytes |None :
 
         self ._check_index (i )
-        return self ._storage [i ].data 
+        self ._charge (i ,1 ,False )
+        payload =self ._load (i )
+        if payload is not None :
+            self .bytes_read +=len (payload )
+        return payload 
 
     def write_block (self ,i :int ,data :bytes |None )->None :
 
         self ._check_index (i )
         if data is None :
-            self ._storage [i ].clear ()
+            self .cleared_blocks +=1 
+            self ._clear (i )
             return 
 
         if not isinstance (data ,(bytes ,bytearray ,memoryview )):
             raise TypeError ("data debe ser bytes-like o None")
 
-
-        b =bytes (data )
-        if len (b )>self .block_size :
+        length =_nbytes (data )
+        if length >self .block_size :
             raise ValueError (
-            f"Tamaño de data ({len (b )}) excede block_size ({self .block_size })"
+            f"Tamaño de data ({length }) excede block_size ({self .block_size })"
             )
 
-        self ._storage [i ].set_bytes (b )
-
-
-
+        self ._charge (i ,1 ,True )
+        self .bytes_written +=length 
+        self ._store (i ,data ,length )
 
     def clear_block (self ,i :int )->None :
 
         self ._check_index (i )
-        self ._storage [i ].clear ()
+        self .cleared_blocks +=1 
+        self ._clear (i )
 
     def fill_block_zeros (self ,i :int )->None :
 
         self ._check_index (i )
-        self ._storage [i ].fill_zeros (self .block_size )
+        self ._charge (i ,1 ,True )
+        self .bytes_written +=self .block_size 
+        self ._store (i ,zero_payload (self .block_size ),self .block_size )
 
-    def read_blocks (self ,indices :Sequence [int ])->List [bytes |None ]:
+    def read_block_view (self ,i :int )->memoryview |None :
+
+        self ._check_index (i )
+        self ._charge (i ,1 ,False )
+        view =self ._load_view (i )
+        if view is not None :
+            self .bytes_read +=view .nbytes 
+        return view 
+
+    def read_blocks (self ,indices :Sequence [int ],*,zero_copy :bool =False )->List [bytes |memoryview |None ]:
 
         self ._check_indices (indices )
-        return [self ._storage [i ].data for i in indices ]
+        self ._charge_runs (indices ,False )
+        load =self ._load_view if zero_copy else self ._load 
+        payloads =[load (i )for i in indices ]
+        self .bytes_read +=sum (_nbytes (p )for p in payloads if p is not None )
+        return payloads 
 
     def write_blocks (self ,indices :Sequence [int ],payloads :Iterable [Optional [bytes ]])->None :
 
@@ -88,39 +114,223 @@ class Disk :
         if len (indices )!=len (payloads_list ):
             raise ValueError ("indices y payloads deben tener la misma longitud")
 
-
         for p in payloads_list :
             if p is None :
                 continue 
             if not isinstance (p ,(bytes ,bytearray ,memoryview )):
                 raise TypeError ("cada payload debe ser bytes-like o None")
-            if len (p )>self .block_size :
+            if _nbytes (p )>self .block_size :
                 raise ValueError (
-                f"payload excede block_size ({len (p )} > {self .block_size })"
+                f"payload excede block_size ({_nbytes (p )} > {self .block_size })"
                 )
 
-
+        self ._charge_runs ([i for i ,p in zip (indices ,payloads_list )if p is not None ],True )
         for i ,p in zip (indices ,payloads_list ):
-            self .write_block (i ,p )
+            if p is None :
+                self .cleared_blocks +=1 
+                self ._clear (i )
+            else :
+                length =_nbytes (p )
+                self .bytes_written +=length 
+                self ._store (i ,p ,length )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |memoryview |None ]:
+
+        self ._check_range (start ,count )
+        self ._charge (start ,count ,False )
+        payloads =self ._load_range (start ,count ,zero_copy )
+        self .bytes_read +=sum (_nbytes (p )for p in payloads if p is not None )
+        return payloads 
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        if payload_buffer is None :
+            if count is None :
+                raise ValueError ("count es obligatorio para limpiar un rango")
+            nbytes =0 
+        else :
+            if not isinstance (payload_buffer ,(bytes ,bytearray ,memoryview )):
+                raise TypeError ("payload_buffer debe ser bytes-like o None")
+            nbytes =_nbytes (payload_buffer )
+            if count is None :
+                count =max (1 ,-(-nbytes //self .block_size ))
+
+        self ._check_range (start ,count )
+        if nbytes >count *self .block_size :
+            raise ValueError (
+            f"payload_buffer ({nbytes } B) excede el rango de {count } bloques ({count *self .block_size } B)"
+            )
+        if payload_buffer is not None :
+            self ._charge (start ,count ,True )
+            self .bytes_written +=nbytes 
+        else :
+            self .cleared_blocks +=count 
+        self ._store_range (start ,count ,payload_buffer ,nbytes )
 
     def used_blocks_count (self )->int :
 
-        return sum (1 for b in self ._storage if b .data is not None )
+        return self ._used 
 
     def empty_blocks_count (self )->int :
 
         return self .n_blocks -self .used_blocks_count ()
 
-    def iter_blocks (self )->Iterable [Block ]:
+    def is_block_used (self ,i :int )->bool :
 
-        return iter (self ._storage )
+        self ._check_index (i )
+        return self ._load (i )is not None 
+
+    def iter_blocks (self )->Iterator [Block ]:
+
+        return (Block (i ,self ._load (i ))for i in range (self .n_blocks ))
 
     def __len__ (self )->int :
 
         return self .n_blocks 
 
+    def access_counts (self )->array :
+
+        counts =array ("i",[0 ])*self .n_blocks 
+        for start ,end ,count in self ._access_runs ():
+            counts [start :end ]=array ("i",[count ])*(end -start )
+        return counts 
+
+    def heatmap (self ,buckets :int =64 )->List [int ]:
+
+        if buckets <=0 :
+            raise ValueError ("buckets debe ser > 0")
+        width =-(-self .n_blocks //buckets )
+        heat =[0 ]*(-(-self .n_blocks //width ))
+        for start ,end ,count in self ._access_runs ():
+            while start <end :
+                k =start //width 
+                stop =min (end ,(k +1 )*width )
+                heat [k ]+=(stop -start )*count 
+                start =stop 
+        return heat 
+
+    def stats (self )->Dict [str ,float ]:
+
+        runs =list (self ._access_runs ())
+        hottest :List [List [int ]]=[]
+        for start ,end ,count in heapq .nsmallest (8 ,runs ,key =lambda r :(-r [2 ],r [0 ])):
+            hottest .extend ([i ,count ]for i in range (start ,min (end ,start +8 -len (hottest ))))
+        return {
+        "reads":self .reads ,
+        "writes":self .writes ,
+        "read_requests":self .read_requests ,
+        "write_requests":self .write_requests ,
+        "bytes_read":self .bytes_read ,
+        "bytes_written":self .bytes_written ,
+        "cleared_blocks":self .cleared_blocks ,
+        "seeks":self .seeks ,
+        "blocks_accessed":sum (end -start for start ,end ,_ in runs ),
+        "max_block_accesses":max ((count for _ ,_ ,count in runs ),default =0 ),
+        "hot_blocks":hottest ,
+        }
+
+    def reset_stats (self )->None :
+
+        self .reads :int =0 
+        self .writes :int =0 
+        self .read_requests :int =0 
+        self .write_requests :int =0 
+        self .bytes_read :int =0 
+        self .bytes_written :int =0 
+        self .cleared_blocks :int =0 
+        self .seeks :int =0 
+        self ._head :int =0 
+        self ._access_delta :Dict [int ,int ]={}
+
+    def _count (self ,start :int ,count :int ,is_write :bool )->None :
+        if is_write :
+            self .writes +=count 
+            self .write_requests +=1 
+        else :
+            self .reads +=count 
+            self .read_requests +=1 
+        if start !=self ._head :
+            self .seeks +=1 
+        self ._head =start +count 
+        delta =self ._access_delta 
+        delta [start ]=delta .get (start ,0 )+1 
+        delta [start +count ]=delta .get (start +count ,0 )-1 
+
+    def _charge (self ,start :int ,count :int ,is_write :bool )->None :
+        self ._count (start ,count ,is_write )
+        if self .latency_model is not None :
+            self .latency_model .access (start ,count ,self .block_size ,is_write )
+
+    def _charge_runs (self ,indices :Sequence [int ],is_write :bool )->None :
+        for start ,count in physical_runs (indices ):
+            self ._count (start ,count ,is_write )
+            if self .latency_model is not None :
+                self .latency_model .access (start ,count ,self .block_size ,is_write )
+
+    def _access_runs (self )->Iterator [Tuple [int ,int ,int ]]:
+        bounds =sorted (self ._access_delta )
+        counts =accumulate (self ._access_delta [b ]for b in bounds )
+        for start ,end ,count in zip (bounds ,bounds [1 :],counts ):
+            if count :
+                yield start ,end ,count 
+
+    def _load (self ,i :int )->bytes |None :
+        length =self ._lengths [i ]
+        if length ==EMPTY_LENGTH :
+            return None 
+        offset =i *self .block_size 
+        return self ._view [offset :offset +length ].tobytes ()
+
+    def _load_view (self ,i :int )->memoryview |None :
+        length =self ._lengths [i ]
+        if length ==EMPTY_LENGTH :
+            return None 
+        offset =i *self .block_size 
+        return self ._view [offset :offset +length ]
+
+    def _store (self ,i :int ,data ,length :int )->None :
+        if isinstance (data ,memoryview )and data .format !="B":
+            data =data .cast ("B")
+        offset =i *self .block_size 
+        self ._view [offset :offset +length ]=data 
+        self ._set_length (i ,length )
+
+    def _clear (self ,i :int )->None :
+        self ._set_length (i ,EMPTY_LENGTH )
+
+    def _load_range (self ,start :int ,count :int ,zero_copy :bool )->List [bytes |memoryview |None ]:
+        bs =self .block_size 
+        extent =self ._view [start *bs :(start +count )*bs ]
+        payloads :List [bytes |memoryview |None ]=[]
+        for k ,length in enumerate (self ._lengths [start :start +count ]):
+            if length ==EMPTY_LENGTH :
+                payloads .append (None )
+            else :
+                piece =extent [k *bs :k *bs +length ]
+                payloads .append (piece if zero_copy else piece .tobytes ())
+        return payloads 
 
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        previous_empty =self ._lengths [start :start +count ].tolist ().count (EMPTY_LENGTH )
+        if data is None :
+            self ._lengths [start :start +count ]=array ("i",[EMPTY_LENGTH ])*count 
+            self ._used -=count -previous_empty 
+            return 
 
+        if isinstance (data ,memoryview )and data .format !="B":
+            data =data .cast ("B")
+        offset =start *self .block_size 
+        self ._view [offset :offset +nbytes ]=data 
+        self ._lengths [start :start +count ]=extent_lengths (nbytes ,count ,self .block_size )
+        self ._used +=previous_empty 
+
+    def _set_length (self ,i :int ,length :int )->None :
+        previous =self ._lengths [i ]
+        if previous ==EMPTY_LENGTH and length !=EMPTY_LENGTH :
+            self ._used +=1 
+        elif previous !=EMPTY_LENGTH and length ==EMPTY_LENGTH :
+            self ._used -=1 
+        self ._lengths [i ]=length 
 
     def _check_index (self ,i :int )->None :
         if not isinstance (i ,int ):
@@ -131,3 +341,27 @@ class Disk :
     def _check_indices (self ,idxs :Sequence [int ])->None :
         for i in idxs :
             self ._check_index (i )
+
+    def _check_range (self ,start :int ,count :int )->None :
+        if not isinstance (start ,int )or not isinstance (count ,int ):
+            raise TypeError ("start y count deben ser int")
+        if count <=0 :
+            raise ValueError ("count debe ser > 0")
+        if start <0 or start +count >self .n_blocks :
+            raise IndexError (
+            f"Rango fuera de límites: [{start }, {start +count }) (0..{self .n_blocks })"
+            )
+
+
+def extent_lengths (nbytes :int ,count :int ,block_size :int )->array :
+
+    full ,rest =divmod (nbytes ,block_size )
+    lengths =array ("i",[block_size ])*full 
+    if rest :
+        lengths .append (rest )
+    lengths .extend (array ("i",[0 ])*(count -len (lengths )))
+    return lengths 
+
+
+def _nbytes (data )->int :
+    return data .nbytes if isinstance (data ,memoryview )else len (data )
@@ -0,0 +1,89 @@
+from __future__ import annotations 
+from typing import Any ,Iterable ,List ,Optional ,Sequence 
+
+from .disk import extent_lengths 
+from .filesystem_base import DiskLike 
+
+_IO_METHODS =frozenset ({
+"read_block",
+"write_block",
+"read_blocks",
+"write_blocks",
+"read_range",
+"write_range",
+"read_block_view",
+"fill_block_zeros",
+"clear_block",
+})
+
+
+class DiskLayer :
+
+    def __init__ (self ,disk :DiskLike )->None :
+
+        if not hasattr (disk ,"n_blocks")or not hasattr (disk ,"block_size"):
+            raise TypeError ("disk debe exponer 'n_blocks' y 'block_size'")
+        self .disk :DiskLike =disk 
+        self .n_blocks :int =disk .n_blocks 
+        self .block_size :int =disk .block_size 
+
+    def read_block (self ,i :int )->bytes |None :
+
+        return self .disk .read_block (i )
+
+    def write_block (self ,i :int ,data :bytes |None )->None :
+
+        self .disk .write_block (i ,data )
+
+    def clear_block (self ,i :int )->None :
+
+        self .write_block (i ,None )
+
+    def fill_block_zeros (self ,i :int )->None :
+
+        self .write_block (i ,bytes (self .block_size ))
+
+    def read_blocks (self ,indices :Sequence [int ],*,zero_copy :bool =False )->List [bytes |None ]:
+
+        return [self .read_block (i )for i in indices ]
+
+    def write_blocks (self ,indices :Sequence [int ],payloads :Iterable [Optional [bytes ]])->None :
+
+        payloads_list =list (payloads )
+        if len (indices )!=len (payloads_list ):
+            raise ValueError ("indices y payloads deben tener la misma longitud")
+        for i ,p in zip (indices ,payloads_list ):
+            self .write_block (i ,p )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |None ]:
+
+        return [self .read_block (i )for i in range (start ,start +count )]
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        if payload_buffer is None :
+            if count is None :
+                raise ValueError ("count es obligatorio para limpiar un rango")
+            for i in range (start ,start +count ):
+                self .write_block (i ,None )
+            return 
+
+        view =memoryview (payload_buffer ).cast ("B")
+        bs =self .block_size 
+        if count is None :
+            count =max (1 ,-(-view .nbytes //bs ))
+        if view .nbytes >count *bs :
+            raise ValueError (
+            f"payload_buffer ({view .nbytes } B) excede el rango de {count } bloques ({count *bs } B)"
+            )
+        for k ,length in enumerate (extent_lengths (view .nbytes ,count ,bs )):
+            self .write_block (start +k ,view [k *bs :k *bs +length ].tobytes ())
+
+    def __len__ (self )->int :
+
+        return self .n_blocks 
+
+    def __getattr__ (self ,name :str )->Any :
+        if name in _IO_METHODS or name =="disk"or name .startswith ("_"):
+            raise AttributeError (name )
+        return getattr (self .disk ,name )
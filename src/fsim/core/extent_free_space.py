@@ -0,0 +1,408 @@
+from __future__ import annotations 
+import random 
+from typing import Any ,Callable ,Dict ,Iterator ,List ,Optional ,Sequence ,Tuple 
+
+from .extents import physical_runs 
+from .free_space import ALLOCATION_POLICIES ,GOAL_WINDOW_BLOCKS ,BitmapView ,nearest_blocks ,nearest_run 
+
+
+class _Node :
+
+    __slots__ =("key","length","prio","left","right","max_len")
+
+    def __init__ (self ,key :Any ,length :int ,prio :float )->None :
+        self .key =key 
+        self .length =length 
+        self .prio =prio 
+        self .left :Optional [_Node ]=None 
+        self .right :Optional [_Node ]=None 
+        self .max_len =length 
+
+
+class ExtentTreap :
+
+    def __init__ (self ,seed :int =0 )->None :
+
+        self ._root :Optional [_Node ]=None 
+        self ._size :int =0 
+        self ._rng =random .Random (seed )
+
+    def __len__ (self )->int :
+
+        return self ._size 
+
+    def insert (self ,key :Any ,length :int )->None :
+
+        left ,right =_split (self ._root ,key )
+        self ._root =_merge (_merge (left ,_Node (key ,length ,self ._rng .random ())),right )
+        self ._size +=1 
+
+    def remove (self ,key :Any )->None :
+
+        self ._root =_remove (self ._root ,key )
+        self ._size -=1 
+
+    def floor (self ,key :Any )->Optional [_Node ]:
+
+        node ,best =self ._root ,None 
+        while node is not None :
+            if node .key <=key :
+                best ,node =node ,node .right 
+            else :
+                node =node .left 
+        return best 
+
+    def ceiling (self ,key :Any )->Optional [_Node ]:
+
+        node ,best =self ._root ,None 
+        while node is not None :
+            if node .key >=key :
+                best ,node =node ,node .left 
+            else :
+                node =node .right 
+        return best 
+
+    def last (self )->Optional [_Node ]:
+
+        node =self ._root 
+        while node is not None and node .right is not None :
+            node =node .right 
+        return node 
+
+    def first_fit (self ,length :int ,lo :Any =None )->Optional [_Node ]:
+
+        return _first_fit (self ._root ,length ,lo )
+
+    def max_length (self )->int :
+
+        return self ._root .max_len if self ._root is not None else 0 
+
+    def items (self )->Iterator [Tuple [Any ,int ]]:
+
+        stack :List [_Node ]=[]
+        node =self ._root 
+        while stack or node is not None :
+            while node is not None :
+                stack .append (node )
+                node =node .left 
+            node =stack .pop ()
+            yield node .key ,node .length 
+            node =node .right 
+
+
+class ExtentFreeSpaceManager :
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    *,
+    policy :str ="first",
+    preoccupied :Optional [Sequence [int ]]=None ,
+    on_bitmap_update :Optional [Callable [[BitmapView ],None ]]=None ,
+    )->None :
+
+        if n_blocks <=0 :
+            raise ValueError ("n_blocks debe ser > 0")
+        if policy not in ALLOCATION_POLICIES :
+            raise ValueError (f"Política de asignación inválida: {policy } (usa {', '.join (ALLOCATION_POLICIES )})")
+
+        self .n_blocks :int =int (n_blocks )
+        self .policy :str =policy 
+        self .on_bitmap_update =on_bitmap_update 
+        self ._bitmap_view =BitmapView (self .n_blocks ,self ._bit ,self .snapshot_bitmap )
+        self ._by_start =ExtentTreap (seed =1 )
+        self ._by_length =ExtentTreap (seed =2 )
+        self ._free :int =0 
+        self ._cursor :int =0 
+        self .coalesces :int =0 
+        self .splits :int =0 
+        self ._add_extent (0 ,self .n_blocks )
+
+        if preoccupied :
+            self .reserve_exact (preoccupied )
+
+    def allocate (self ,n :int ,contiguous :bool =False ,goal :Optional [int ]=None )->List [int ]:
+
+        if n <=0 :
+            raise ValueError ("n debe ser > 0")
+        if goal is not None :
+            self ._check_index (goal )
+
+        if contiguous :
+            start =nearest_run (self ._goal_window_runs (goal ),n ,goal )if goal is not None else None 
+            if start is None :
+                found =self ._find_extent (n )
+                if found is None :
+                    raise MemoryError ("No hay espacio contiguo suficiente")
+                start =found [0 ]
+            self ._take_blocks (start ,n )
+            self ._cursor =start +n 
+            indices =list (range (start ,start +n ))
+        else :
+            if self ._free <n :
+                raise MemoryError ("No hay bloques libres suficientes")
+            indices =self ._gather_near_goal (n ,goal )if goal is not None else []
+            for start ,count in physical_runs (indices ):
+                self ._take_blocks (start ,count )
+            found =self ._find_extent (n )if not indices and self .policy in ("best","worst")else None 
+            if found is not None :
+                start ,length =found 
+                self ._take (start ,length ,start ,n )
+                indices .extend (range (start ,start +n ))
+            while len (indices )<n :
+                start ,length =self ._next_extent ()
+                count =min (length ,n -len (indices ))
+                self ._take (start ,length ,start ,count )
+                indices .extend (range (start ,start +count ))
+                self ._cursor =start +count 
+            self ._cursor =indices [-1 ]+1 
+
+        if self .on_bitmap_update :
+            self .on_bitmap_update (self ._bitmap_view )
+
+        return indices 
+
+    def free (self ,block_list :List [int ])->None :
+
+        if not block_list :
+            return 
+        self ._check_indices (block_list )
+
+        if len (set (block_list ))!=len (block_list ):
+            raise ValueError ("La lista de bloques a liberar contiene duplicados")
+
+        runs =physical_runs (sorted (block_list ))
+        if any (self ._first_free_in (start ,start +count )is not None for start ,count in runs ):
+            for i in block_list :
+                if self ._first_free_in (i ,i +1 )is not None :
+                    raise ValueError (f"El bloque {i } ya está libre (posible doble liberación)")
+
+        for start ,count in runs :
+            end =start +count 
+            pred =self ._by_start .floor (start )
+            if pred is not None and pred .key +pred .length ==start :
+                pred_start ,pred_len =pred .key ,pred .length 
+                self ._remove_extent (pred_start ,pred_len )
+                start =pred_start 
+                self .coalesces +=1 
+            succ =self ._by_start .ceiling (end )
+            if succ is not None and succ .key ==end :
+                succ_len =succ .length 
+                self ._remove_extent (end ,succ_len )
+                end +=succ_len 
+                self .coalesces +=1 
+            self ._add_extent (start ,end -start )
+
+        if self .on_bitmap_update :
+            self .on_bitmap_update (self ._bitmap_view )
+
+    def reserve_exact (self ,indices :Sequence [int ])->None :
+
+        self ._check_indices (indices )
+
+        for i in indices :
+            if self ._first_free_in (i ,i +1 )is None :
+                raise ValueError (f"El bloque {i } ya está ocupado")
+        for start ,count in physical_runs (sorted (set (indices ))):
+            node =self ._by_start .floor (start )
+            self ._take (node .key ,node .length ,start ,count )
+
+    def used_count (self )->int :
+
+        return self .n_blocks -self ._free 
+
+    def free_count (self )->int :
+
+        return self ._free 
+
+    def occupancy_pct (self )->float :
+
+        return 100.0 *(self .used_count ()/self .n_blocks )
+
+    def free_runs (self )->List [Tuple [int ,int ]]:
+
+        return list (self ._by_start .items ())
+
+    def largest_free_run_size (self )->int :
+
+        return self ._by_start .max_length ()
+
+    def external_fragmentation_ratio (self )->float :
+
+        if self ._free ==0 :
+            return 0.0 
+        return 1.0 -(self .largest_free_run_size ()/self ._free )
+
+    def internal_fragmentation_ratio (self )->float :
+
+        return 0.0 
+
+    def extent_count (self )->int :
+
+        return len (self ._by_start )
+
+    def snapshot_bitmap (self )->List [int ]:
+
+        bitmap =[1 ]*self .n_blocks 
+        for start ,length in self ._by_start .items ():
+            bitmap [start :start +length ]=[0 ]*length 
+        return bitmap 
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "policy":self .policy ,
+        "free_extents":self .extent_count (),
+        "largest_free_extent":self .largest_free_run_size (),
+        "coalesces":self .coalesces ,
+        "splits":self .splits ,
+        }
+
+    def _find_extent (self ,n :int )->Optional [Tuple [int ,int ]]:
+        if self .policy =="best":
+            node =self ._by_length .ceiling ((n ,-1 ))
+            return None if node is None else (node .key [1 ],node .key [0 ])
+        if self .policy =="worst":
+            node =self ._by_length .last ()
+            return None if node is None or node .length <n else (node .key [1 ],node .key [0 ])
+        if self .policy =="next":
+            node =self ._by_start .first_fit (n ,self ._cursor )
+            if node is not None :
+                return node .key ,node .length 
+        node =self ._by_start .first_fit (n )
+        return None if node is None else (node .key ,node .length )
+
+    def _goal_window_runs (self ,goal :int )->List [Tuple [int ,int ]]:
+        lo ,hi =max (0 ,goal -GOAL_WINDOW_BLOCKS ),goal +GOAL_WINDOW_BLOCKS 
+        runs :List [Tuple [int ,int ]]=[]
+        node =self ._by_start .floor (lo )
+        if node is None or node .key +node .length <=lo :
+            node =self ._by_start .ceiling (lo )
+        while node is not None and node .key <hi :
+            start =max (node .key ,lo )
+            runs .append ((start ,min (node .key +node .length ,hi )-start ))
+            node =self ._by_start .ceiling (node .key +node .length )
+        return runs 
+
+    def _gather_near_goal (self ,n :int ,goal :int )->List [int ]:
+        runs =self ._goal_window_runs (goal )
+        start =nearest_run (runs ,n ,goal )
+        if start is not None :
+            return list (range (start ,start +n ))
+        return nearest_blocks (runs ,n ,goal )
+
+    def _take_blocks (self ,start :int ,count :int )->None :
+        node =self ._by_start .floor (start )
+        self ._take (node .key ,node .length ,start ,count )
+
+    def _next_extent (self )->Tuple [int ,int ]:
+        if self .policy in ("best","worst"):
+            node =self ._by_length .last ()
+            return node .key [1 ],node .key [0 ]
+        node =self ._by_start .ceiling (self ._cursor )if self .policy =="next"else None 
+        if node is None :
+            node =self ._by_start .ceiling (0 )
+        return node .key ,node .length 
+
+    def _take (self ,ext_start :int ,ext_len :int ,start :int ,count :int )->None :
+        self ._remove_extent (ext_start ,ext_len )
+        if start >ext_start :
+            self ._add_extent (ext_start ,start -ext_start )
+        tail =ext_start +ext_len -(start +count )
+        if tail >0 :
+            self ._add_extent (start +count ,tail )
+        if start >ext_start or tail >0 :
+            self .splits +=1 
+
+    def _first_free_in (self ,start :int ,end :int )->Optional [int ]:
+        node =self ._by_start .floor (start )
+        if node is not None and node .key +node .length >start :
+            return start 
+        node =self ._by_start .ceiling (start )
+        if node is not None and node .key <end :
+            return node .key 
+        return None 
+
+    def _bit (self ,i :int )->int :
+        return 0 if self ._first_free_in (i ,i +1 )is not None else 1 
+
+    def _add_extent (self ,start :int ,length :int )->None :
+        self ._by_start .insert (start ,length )
+        self ._by_length .insert ((length ,start ),length )
+        self ._free +=length 
+
+    def _remove_extent (self ,start :int ,length :int )->None :
+        self ._by_start .remove (start )
+        self ._by_length .remove ((length ,start ))
+        self ._free -=length 
+
+    def _check_index (self ,i :int )->None :
+        if not isinstance (i ,int ):
+            raise TypeError ("El índice debe ser int")
+        if i <0 or i >=self .n_blocks :
+            raise IndexError (f"Índice fuera de rango: {i } (0..{self .n_blocks -1 })")
+
+    def _check_indices (self ,idxs :Sequence [int ])->None :
+        for i in idxs :
+            self ._check_index (i )
+
+
+def _update (node :_Node )->None :
+    best =node .length 
+    if node .left is not None and node .left .max_len >best :
+        best =node .left .max_len 
+    if node .right is not None and node .right .max_len >best :
+        best =node .right .max_len 
+    node .max_len =best 
+
+
+def _split (node :Optional [_Node ],key :Any )->Tuple [Optional [_Node ],Optional [_Node ]]:
+    if node is None :
+        return None ,None 
+    if node .key <key :
+        node .right ,right =_split (node .right ,key )
+        _update (node )
+        return node ,right 
+    left ,node .left =_split (node .left ,key )
+    _update (node )
+    return left ,node 
+
+
+def _merge (left :Optional [_Node ],right :Optional [_Node ])->Optional [_Node ]:
+    if left is None :
+        return right 
+    if right is None :
+        return left 
+    if left .prio >right .prio :
+        left .right =_merge (left .right ,right )
+        _update (left )
+        return left 
+    right .left =_merge (left ,right .left )
+    _update (right )
+    return right 
+
+
+def _remove (node :Optional [_Node ],key :Any )->Optional [_Node ]:
+    if node is None :
+        raise KeyError (key )
+    if key ==node .key :
+        return _merge (node .left ,node .right )
+    if key <node .key :
+        node .left =_remove (node .left ,key )
+    else :
+        node .right =_remove (node .right ,key )
+    _update (node )
+    return node 
+
+
+def _first_fit (node :Optional [_Node ],length :int ,lo :Any )->Optional [_Node ]:
+    if node is None or node .max_len <length :
+        return None 
+    if lo is not None and node .key <lo :
+        return _first_fit (node .right ,length ,lo )
+    found =_first_fit (node .left ,length ,lo )
+    if found is not None :
+        return found 
+    if node .length >=length :
+        return node 
+    return _first_fit (node .right ,length ,lo )
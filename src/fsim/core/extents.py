@@ -0,0 +1,13 @@
+from __future__ import annotations 
+from typing import Iterable ,List ,Tuple 
+
+
+def physical_runs (indices :Iterable [int ])->List [Tuple [int ,int ]]:
+
+    runs :List [Tuple [int ,int ]]=[]
+    for i in indices :
+        if runs and i ==runs [-1 ][0 ]+runs [-1 ][1 ]:
+            runs [-1 ]=(runs [-1 ][0 ],runs [-1 ][1 ]+1 )
+        else :
+            runs .append ((i ,1 ))
+    return runs 
@@ -13,6 +13,8 @@ Tuple ,
 runtime_checkable ,
 )
 
+from .extents import physical_runs 
+
 
 
 
@@ -33,7 +35,7 @@ class FreeSpaceManagerLike (Protocol ):
 
     n_blocks :int 
 
-    def allocate (self ,n :int ,contiguous :bool =False )->List [int ]:...
+    def allocate (self ,n :int ,contiguous :bool =False ,goal :Optional [int ]=None )->List [int ]:...
     def free (self ,block_list :List [int ])->None :...
 
 
@@ -54,6 +56,9 @@ class FilesystemBase (ABC ):
     free_space_manager :FreeSpaceManagerLike ,
     *,
     on_event :Optional [Callable [[str ],None ]]|Optional [Callable [[str ,Any ],None ]]=None ,
+    zero_copy_reads :bool =False ,
+    readahead :Optional [Any ]=None ,
+    goal_allocation :bool =False ,
     )->None :
 
         if not isinstance (disk ,DiskLike .__constraints__ if hasattr (DiskLike ,"__constraints__")else DiskLike ):
@@ -68,6 +73,17 @@ class FilesystemBase (ABC ):
         self .fsm :FreeSpaceManagerLike =free_space_manager 
         self .file_table :Dict [str ,Dict [str ,Any ]]={}
         self .on_event :Optional [Callable [...,None ]]=on_event 
+        self .zero_copy_reads :bool =bool (zero_copy_reads )and hasattr (disk ,"read_block_view")
+        self ._range_io :bool =hasattr (disk ,"read_range")and hasattr (disk ,"write_range")
+        self .readahead :Optional [Any ]=readahead 
+        self .pread_ops :int =0 
+        self .pread_bytes :int =0 
+        self .pwrite_ops :int =0 
+        self .pwrite_bytes :int =0 
+        self .unaligned_pwrites :int =0 
+        self .rmw_blocks :int =0 
+        self .pwrite_blocks :int =0 
+        self .goal_allocation :bool =bool (goal_allocation )
 
     @property 
     def n_blocks (self )->int :
@@ -77,6 +93,10 @@ class FilesystemBase (ABC ):
     def block_size (self )->int :
         return self .disk .block_size 
 
+    @property 
+    def payload_size (self )->int :
+        return self .disk .block_size 
+
 
 
 
@@ -116,7 +136,160 @@ class FilesystemBase (ABC ):
 
         raise NotImplementedError 
 
+    def pread (self ,name :str ,offset :int ,size :int )->bytes :
 
+        self ._assert_file_exists (name )
+        self ._assert_non_negative (offset )
+        if size <0 :
+            raise ValueError ("size debe ser >= 0")
+
+        cap =self .payload_size 
+        end =min (offset +size ,self ._file_bytes (name ))
+        if end <=offset :
+            return b""
+        first ,last =offset //cap ,(end -1 )//cap 
+        payloads =self .read (name ,first ,last -first +1 ,"seq")
+        joined =b"".join (bytes (p ).ljust (cap ,b"\x00")for p in payloads )
+        self .pread_ops +=1 
+        self .pread_bytes +=end -offset 
+        return joined [offset -first *cap :end -first *cap ]
+
+    def pwrite (self ,name :str ,offset :int ,data :bytes )->int :
+
+        self ._assert_file_exists (name )
+        self ._assert_non_negative (offset )
+        if not isinstance (data ,(bytes ,bytearray ,memoryview )):
+            raise TypeError ("data debe ser bytes-like")
+
+        cap =self .payload_size 
+        file_end =self ._file_bytes (name )
+        if offset >=file_end :
+            raise ValueError (f"offset ({offset }) fuera del archivo ({file_end } B)")
+        data =bytes (data )
+        end =min (offset +len (data ),file_end )
+        if end <=offset :
+            return 0 
+
+        first ,last =offset //cap ,(end -1 )//cap 
+        payloads :List [bytes ]=[]
+        unaligned =False 
+        for block in range (first ,last +1 ):
+            base =block *cap 
+            lo =max (offset ,base )-base 
+            hi =min (end ,base +cap )-base 
+            piece =data [base +lo -offset :base +hi -offset ]
+            if lo ==0 and hi ==cap :
+                payloads .append (piece )
+                continue 
+            old =self .read (name ,block ,1 ,"rand")[0 ]
+            merged =bytearray (bytes (old ).ljust (hi ,b"\x00"))
+            merged [lo :hi ]=piece 
+            payloads .append (bytes (merged ))
+            self .rmw_blocks +=1 
+            unaligned =True 
+
+        self .write (name ,first ,len (payloads ),payloads )
+        self .pwrite_ops +=1 
+        self .pwrite_bytes +=end -offset 
+        self .pwrite_blocks +=len (payloads )
+        if unaligned :
+            self .unaligned_pwrites +=1 
+        return end -offset 
+
+    def byte_io_stats (self )->Dict [str ,float ]:
+
+        written =self .pwrite_blocks *self .payload_size 
+        return {
+        "payload_size":self .payload_size ,
+        "pread_ops":self .pread_ops ,
+        "pread_bytes":self .pread_bytes ,
+        "pwrite_ops":self .pwrite_ops ,
+        "pwrite_bytes":self .pwrite_bytes ,
+        "unaligned_pwrites":self .unaligned_pwrites ,
+        "rmw_read_blocks":self .rmw_blocks ,
+        "pwrite_blocks_written":self .pwrite_blocks ,
+        "pwrite_amplification":round ((written +self .rmw_blocks *self .payload_size )/self .pwrite_bytes ,3 )if self .pwrite_bytes else 0.0 ,
+        }
+
+
+
+    def _peek_block (self ,i :int )->bytes |memoryview |None :
+        if self .zero_copy_reads :
+            return self .disk .read_block_view (i )
+        return self .disk .read_block (i )
+
+    def _read_payloads (self ,indices :List [int ],skip :int =0 )->List [bytes |memoryview ]:
+        empty :bytes |memoryview =memoryview (b"")if self .zero_copy_reads else b""
+        raw :List [bytes |memoryview |None ]
+        if self ._range_io :
+            raw =[]
+            for start ,count in physical_runs (indices ):
+                raw .extend (self .disk .read_range (start ,count ,zero_copy =self .zero_copy_reads ))
+        elif self .zero_copy_reads :
+            read_view =self .disk .read_block_view 
+            raw =[read_view (i )for i in indices ]
+        else :
+            read =self .disk .read_block 
+            raw =[read (i )for i in indices ]
+
+        if skip :
+            return [empty if data is None else data [skip :]for data in raw ]
+        return [empty if data is None else data for data in raw ]
+
+    def _write_payloads (self ,indices :List [int ],payloads :List [bytes |None ])->None :
+        if not self ._range_io :
+            if hasattr (self .disk ,"write_blocks"):
+                self .disk .write_blocks (indices ,payloads )
+            else :
+                for i ,payload in zip (indices ,payloads ):
+                    self .disk .write_block (i ,payload )
+            return 
+
+        pos =0 
+        for start ,count in physical_runs (indices ):
+            chunk =payloads [pos :pos +count ]
+            extent =_join_extent (chunk ,self .disk .block_size )
+            if extent is None :
+                self .disk .write_blocks (indices [pos :pos +count ],chunk )
+            else :
+                self .disk .write_range (start ,extent ,count )
+            pos +=count 
+
+    def _read_ahead (self ,name :str ,offset :int ,n_blocks :int ,access_mode :str ,physical :List [int ])->None :
+        if self .readahead is None :
+            return 
+        size =int (self .file_table [name ].get ("size_blocks",0 ))
+        window =self .readahead .on_read (name ,offset ,n_blocks ,access_mode ,size )
+        if window is None :
+            return 
+        start ,count =window 
+        self .readahead .prefetch (self ._prefetch_targets (name ,start ,count ,physical ,start -(offset +n_blocks )))
+
+    def _prefetch_targets (self ,name :str ,start :int ,count :int ,physical :List [int ],lead :int )->List [int ]:
+        return self ._resolve_range (name ,start ,count )
+
+    def _file_bytes (self ,name :str )->int :
+        return int (self .file_table [name ].get ("size_blocks",0 ))*self .payload_size 
+
+    def _allocate_clustered (self ,n :int )->List [int ]:
+        if not self .goal_allocation or n ==1 :
+            return self .fsm .allocate (n ,contiguous =False )
+        first =self .fsm .allocate (1 ,contiguous =False )
+        try :
+            rest =self .fsm .allocate (n -1 ,contiguous =False ,goal =first [0 ])
+        except MemoryError :
+            self .fsm .free (first )
+            raise 
+        return first +rest 
+
+    def _forget (self ,name :str )->None :
+        if self .readahead is not None :
+            self .readahead .forget (name )
+
+    def _trim (self ,blocks :List [int ])->None :
+        trim =getattr (self .disk ,"trim",None )
+        if trim is not None and blocks :
+            trim (blocks )
 
     def _assert_new_file (self ,name :str )->None :
         if name in self .file_table :
@@ -178,3 +351,19 @@ class FilesystemBase (ABC ):
             except TypeError :
 
                 self .on_event (event_type )
+
+
+def _join_extent (chunk :List [bytes |None ],block_size :int )->bytes |None :
+    parts :List [bytes ]=[]
+    short_seen =False 
+    for payload in chunk :
+        if not isinstance (payload ,(bytes ,bytearray )):
+            return None 
+        n =len (payload )
+        if n >block_size or (short_seen and n >0 ):
+            return None 
+        if n <block_size :
+            short_seen =True 
+        if n :
+            parts .append (payload )
+    return b"".join (parts )
@@ -1,7 +1,202 @@
 
 from __future__ import annotations 
+import re 
+from bisect import bisect_left ,insort 
+from array import array 
 
-from typing import Iterable ,List ,Sequence ,Tuple ,Optional ,Callable 
+from typing import Dict ,Iterable ,Iterator ,List ,Sequence ,Tuple ,Optional ,Callable 
+
+from .extents import physical_runs 
+
+WORD_BITS =64 
+_WORD_MASK =(1 <<WORD_BITS )-1 
+EMPTY_WORD =0 
+PARTIAL_WORD =1 
+FULL_WORD =2 
+_FREE_SEGMENTS =re .compile (rb"\x00+|\x01")
+ALLOCATION_POLICIES =("first","next","best","worst")
+GOAL_WINDOW_BLOCKS =1024 
+
+
+class PackedBitmap :
+
+    def __init__ (self ,n_bits :int )->None :
+
+        if n_bits <=0 :
+            raise ValueError ("n_bits debe ser > 0")
+        self .n_bits :int =int (n_bits )
+        n_words =-(-self .n_bits //WORD_BITS )
+        self ._words =array ("Q",[0 ])*n_words 
+        self ._summary =bytearray (n_words )
+        self ._ones :int =0 
+        tail =self .n_bits %WORD_BITS 
+        if tail :
+            self ._words [-1 ]=_WORD_MASK ^((1 <<tail )-1 )
+            self ._summarize (n_words -1 )
+
+    def __len__ (self )->int :
+
+        return self .n_bits 
+
+    def __getitem__ (self ,i ):
+
+        if isinstance (i ,slice ):
+            return self .tolist ()[i ]
+        if i <0 :
+            i +=self .n_bits 
+        if i <0 or i >=self .n_bits :
+            raise IndexError ("Índice de bitmap fuera de rango")
+        return (self ._words [i >>6 ]>>(i &63 ))&1 
+
+    def __setitem__ (self ,i :int ,value :int )->None :
+
+        if i <0 :
+            i +=self .n_bits 
+        if i <0 or i >=self .n_bits :
+            raise IndexError ("Índice de bitmap fuera de rango")
+        self .set_range (i ,1 ,value )
+
+    def __iter__ (self )->Iterator [int ]:
+
+        return iter (self .tolist ())
+
+    def __eq__ (self ,other )->bool :
+
+        if isinstance (other ,PackedBitmap ):
+            return self .n_bits ==other .n_bits and self ._words ==other ._words 
+        if isinstance (other ,list ):
+            return self .tolist ()==other 
+        return NotImplemented 
+
+    def count (self ,value :int )->int :
+
+        return self ._ones if value else self .n_bits -self ._ones 
+
+    def tolist (self )->List [int ]:
+
+        packed =int .from_bytes (self ._words .tobytes (),"little")
+        bits =bin (packed )[2 :].zfill (len (self ._words )*WORD_BITS )[::-1 ]
+        return list (map (int ,bits [:self .n_bits ]))
+
+    def set_range (self ,start :int ,count :int ,value :int )->int :
+
+        changed =0 
+        end =start +count 
+        words =self ._words 
+        for w in range (start >>6 ,((end -1 )>>6 )+1 ):
+            lo =max (start ,w <<6 )-(w <<6 )
+            hi =min (end ,(w +1 )<<6 )-(w <<6 )
+            mask =((1 <<(hi -lo ))-1 )<<lo 
+            old =words [w ]
+            if value :
+                changed +=(mask &~old ).bit_count ()
+                words [w ]=old |mask 
+            else :
+                changed +=(mask &old ).bit_count ()
+                words [w ]=old &~mask 
+            self ._summarize (w )
+        self ._ones +=changed if value else -changed 
+        return changed 
+
+    def iter_zeros (self )->Iterator [int ]:
+
+        words =self ._words 
+        for m in _FREE_SEGMENTS .finditer (self ._summary ):
+            w =m .start ()
+            if self ._summary [w ]==EMPTY_WORD :
+                yield from range (w <<6 ,min (self .n_bits ,m .end ()<<6 ))
+                continue 
+            free =~words [w ]&_WORD_MASK 
+            while free :
+                low =free &-free 
+                yield (w <<6 )+low .bit_length ()-1 
+                free ^=low 
+
+    def prev_one (self ,i :int )->int :
+
+        i =min (i ,self .n_bits )
+        if i <=0 :
+            return -1 
+        w =(i -1 )>>6 
+        v =self ._words [w ]&((1 <<(((i -1 )&63 )+1 ))-1 )
+        if not v :
+            w =max (self ._summary .rfind (b"\x01",0 ,w ),self ._summary .rfind (b"\x02",0 ,w ))
+            if w <0 :
+                return -1 
+            v =self ._words [w ]
+        return (w <<6 )+v .bit_length ()-1 
+
+    def zero_runs (self ,start :int =0 ,end :Optional [int ]=None )->Iterator [Tuple [int ,int ]]:
+
+        end =self .n_bits if end is None else min (end ,self .n_bits )
+        if start >=end :
+            return 
+        run_start ,run_len =0 ,0 
+        for seg_start ,length in self ._word_runs (start >>6 ,((end -1 )>>6 )+1 ):
+            lo ,hi =max (seg_start ,start ),min (seg_start +length ,end )
+            if lo >=hi :
+                continue 
+            seg_start ,length =lo ,hi -lo 
+            if run_len and run_start +run_len ==seg_start :
+                run_len +=length 
+                continue 
+            if run_len :
+                yield run_start ,run_len 
+            run_start ,run_len =seg_start ,length 
+        if run_len :
+            yield run_start ,run_len 
+
+    def _word_runs (self ,first_w :int ,last_w :int )->Iterator [Tuple [int ,int ]]:
+        words =self ._words 
+        for m in _FREE_SEGMENTS .finditer (self ._summary ,first_w ,last_w ):
+            w =m .start ()
+            if self ._summary [w ]==EMPTY_WORD :
+                yield w <<6 ,(m .end ()-w )<<6 
+                continue 
+            free =~words [w ]&_WORD_MASK 
+            while free :
+                low =(free &-free ).bit_length ()-1 
+                t =free >>low 
+                length =(t ^(t +1 )).bit_length ()-1 
+                yield (w <<6 )+low ,length 
+                free &=~(((1 <<length )-1 )<<low )
+
+    def _summarize (self ,w :int )->None :
+        v =self ._words [w ]
+        self ._summary [w ]=EMPTY_WORD if v ==0 else (FULL_WORD if v ==_WORD_MASK else PARTIAL_WORD )
+
+
+class BitmapView :
+
+    __slots__ =("_n_bits","_bit","_tolist")
+
+    def __init__ (self ,n_bits :int ,bit :Callable [[int ],int ],tolist :Callable [[],List [int ]])->None :
+
+        self ._n_bits =n_bits 
+        self ._bit =bit 
+        self ._tolist =tolist 
+
+    def __len__ (self )->int :
+
+        return self ._n_bits 
+
+    def __getitem__ (self ,i ):
+
+        if isinstance (i ,slice ):
+            return self ._tolist ()[i ]
+        if i <0 :
+            i +=self ._n_bits 
+        if i <0 or i >=self ._n_bits :
+            raise IndexError ("Índice de bitmap fuera de rango")
+        return self ._bit (i )
+
+    def __iter__ (self )->Iterator [int ]:
+
+        return iter (self ._tolist ())
+
+    def tolist (self )->List [int ]:
+
+        return self ._tolist ()
 
 
 class FreeSpaceManager :
@@ -15,14 +210,25 @@ class FreeSpaceManager :
     self ,
     n_blocks :int ,
     *,
+    policy :str ="first",
     preoccupied :Optional [Sequence [int ]]=None ,
-    on_bitmap_update :Optional [Callable [[List [int ]],None ]]=None 
+    on_bitmap_update :Optional [Callable [[BitmapView ],None ]]=None 
     )->None :
 
         if n_blocks <=0 :
             raise ValueError ("n_blocks debe ser > 0")
+        if policy not in ALLOCATION_POLICIES :
+            raise ValueError (f"Política de asignación inválida: {policy } (usa {', '.join (ALLOCATION_POLICIES )})")
         self .n_blocks :int =int (n_blocks )
-        self .bitmap :List [int ]=[0 ]*self .n_blocks 
+        self .policy :str =policy 
+        self ._cursor :int =0 
+        self .bitmap :PackedBitmap =PackedBitmap (self .n_blocks )
+        self ._bitmap_view =BitmapView (self .n_blocks ,self .bitmap .__getitem__ ,self .bitmap .tolist )
+        self ._runs :Dict [int ,int ]={}
+        self ._run_ends :Dict [int ,int ]={}
+        self ._by_length :Dict [int ,Dict [int ,None ]]={}
+        self ._lengths :List [int ]=[]
+        self ._run_added (0 ,self .n_blocks )
 
 
         self .on_bitmap_update =on_bitmap_update 
@@ -36,36 +242,39 @@ class FreeSpaceManager :
 
 
 
-    def allocate (self ,n :int ,contiguous :bool =False )->List [int ]:
+    def allocate (self ,n :int ,contiguous :bool =False ,goal :Optional [int ]=None )->List [int ]:
 
         if n <=0 :
             raise ValueError ("n debe ser > 0")
+        if goal is not None :
+            self ._check_index (goal )
 
         indices :List [int ]=[]
 
         if contiguous :
-            run =self ._find_first_fit_run (n )
+            run =self ._find_goal_run (n ,goal )if goal is not None else None 
+            if run is None :
+                run =self ._find_run (n )
             if run is None :
                 raise MemoryError ("No hay espacio contiguo suficiente")
             start ,length =run 
             indices =list (range (start ,start +n ))
-            for i in indices :
-                self ._set_used (i )
+            self ._mark (start ,n ,1 )
         else :
 
-            for i ,bit in enumerate (self .bitmap ):
-                if bit ==0 :
-                    indices .append (i )
-                    if len (indices )==n :
-                        break 
-            if len (indices )<n :
+            if self .free_count ()<n :
                 raise MemoryError ("No hay bloques libres suficientes")
-            for i in indices :
-                self ._set_used (i )
+            if goal is not None :
+                indices =self ._gather_near_goal (n ,goal )
+            if not indices :
+                indices =self ._gather_free_blocks (n )
+            for start ,count in physical_runs (sorted (indices )):
+                self ._mark (start ,count ,1 )
+        self ._cursor =indices [-1 ]+1 
 
 
         if self .on_bitmap_update :
-            self .on_bitmap_update (self .bitmap )
+            self .on_bitmap_update (self ._bitmap_view )
 
 
         return indices 
@@ -83,38 +292,154 @@ class FreeSpaceManager :
             if self .bitmap [i ]==0 :
                 raise ValueError (f"El bloque {i } ya está libre (posible doble liberación)")
 
-        for i in block_list :
-            self ._set_free (i )
+        for start ,count in physical_runs (sorted (block_list )):
+            self ._mark (start ,count ,0 )
 
 
         if self .on_bitmap_update :
-            self .on_bitmap_update (self .bitmap )
+            self .on_bitmap_update (self ._bitmap_view )
+
+
 
 
 
 
+    def _find_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
+        if self .policy =="next":
+            return self ._find_next_fit_run (needed )
+        if self .policy =="best":
+            return self ._find_best_fit_run (needed )
+        if self .policy =="worst":
+            return self ._find_worst_fit_run (needed )
+        return self ._find_first_fit_run (needed )
 
+    def _find_next_fit_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
+        for start ,length in self ._runs_from_cursor ():
+            if length >=needed :
+                return (start ,needed )
+        return None 
+
+    def _runs_from_cursor (self )->Iterator [Tuple [int ,int ]]:
+        cursor =self ._cursor 
+        for start ,length in self .bitmap .zero_runs (cursor ):
+            if start ==cursor and cursor >0 and self .bitmap [cursor -1 ]==0 :
+                continue 
+            yield start ,length 
+        for start ,length in self .bitmap .zero_runs ():
+            if start >=cursor :
+                return 
+            yield start ,length 
+
+    def _find_best_fit_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
+        k =bisect_left (self ._lengths ,needed )
+        if k ==len (self ._lengths ):
+            return None 
+        return (next (iter (self ._by_length [self ._lengths [k ]])),needed )
+
+    def _find_worst_fit_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
+        if not self ._lengths or self ._lengths [-1 ]<needed :
+            return None 
+        return (next (iter (self ._by_length [self ._lengths [-1 ]])),needed )
+
+    def _gather_free_blocks (self ,n :int )->List [int ]:
+        if self .policy =="first":
+            runs =self .bitmap .zero_runs ()
+        elif self .policy =="next":
+            runs =self ._runs_from_cursor ()
+        else :
+            run =self ._find_run (n )
+            if run is not None :
+                return list (range (run [0 ],run [0 ]+n ))
+            runs =self ._runs_by_size ()
+        return self ._take_from_runs (runs ,n )
+
+    def _goal_window_runs (self ,goal :int )->List [Tuple [int ,int ]]:
+        return list (self .bitmap .zero_runs (max (0 ,goal -GOAL_WINDOW_BLOCKS ),goal +GOAL_WINDOW_BLOCKS ))
+
+    def _find_goal_run (self ,needed :int ,goal :int )->Optional [Tuple [int ,int ]]:
+        start =nearest_run (self ._goal_window_runs (goal ),needed ,goal )
+        return None if start is None else (start ,needed )
+
+    def _gather_near_goal (self ,n :int ,goal :int )->List [int ]:
+        runs =self ._goal_window_runs (goal )
+        start =nearest_run (runs ,n ,goal )
+        if start is not None :
+            return list (range (start ,start +n ))
+        return nearest_blocks (runs ,n ,goal )
+
+    def _runs_by_size (self )->Iterator [Tuple [int ,int ]]:
+        return ((start ,length )for length in reversed (self ._lengths )for start in self ._by_length [length ])
+
+    def _take_from_runs (self ,runs :Iterable [Tuple [int ,int ]],n :int )->List [int ]:
+        indices :List [int ]=[]
+        for start ,length in runs :
+            indices .extend (range (start ,start +min (length ,n -len (indices ))))
+            if len (indices )==n :
+                break 
+        return indices 
 
     def _find_first_fit_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
 
-        run_len =0 
-        run_start =0 
-        for i ,bit in enumerate (self .bitmap ):
-            if bit ==0 :
-                if run_len ==0 :
-                    run_start =i 
-                run_len +=1 
-                if run_len >=needed :
-                    return (run_start ,run_len )
-            else :
-                run_len =0 
+        for start ,length in self .bitmap .zero_runs ():
+            if length >=needed :
+                return (start ,needed )
         return None 
 
     def _set_used (self ,i :int )->None :
-        self .bitmap [i ]=1 
+        self ._mark (i ,1 ,1 )
 
     def _set_free (self ,i :int )->None :
-        self .bitmap [i ]=0 
+        self ._mark (i ,1 ,0 )
+
+    def _mark (self ,start :int ,count :int ,value :int )->None :
+        changed =self .bitmap .set_range (start ,count ,value )
+        if changed ==0 :
+            return 
+        end =start +count 
+        if changed !=count :
+            self ._rebuild_runs ()
+        elif value :
+            run_start =self .bitmap .prev_one (start )+1 
+            run_end =run_start +self ._runs [run_start ]
+            self ._run_removed (run_start ,run_end -run_start )
+            if run_start <start :
+                self ._run_added (run_start ,start -run_start )
+            if end <run_end :
+                self ._run_added (end ,run_end -end )
+        else :
+            run_start =self ._run_ends .get (start ,start )
+            if run_start <start :
+                self ._run_removed (run_start ,start -run_start )
+            run_end =end +self ._runs .get (end ,0 )
+            if run_end >end :
+                self ._run_removed (end ,run_end -end )
+            self ._run_added (run_start ,run_end -run_start )
+
+    def _rebuild_runs (self )->None :
+        self ._runs .clear ()
+        self ._run_ends .clear ()
+        self ._by_length .clear ()
+        self ._lengths .clear ()
+        for start ,length in self .bitmap .zero_runs ():
+            self ._run_added (start ,length )
+
+    def _run_added (self ,start :int ,length :int )->None :
+        self ._runs [start ]=length 
+        self ._run_ends [start +length ]=start 
+        starts =self ._by_length .get (length )
+        if starts is None :
+            starts =self ._by_length [length ]={}
+            insort (self ._lengths ,length )
+        starts [start ]=None 
+
+    def _run_removed (self ,start :int ,length :int )->None :
+        del self ._runs [start ]
+        del self ._run_ends [start +length ]
+        starts =self ._by_length [length ]
+        del starts [start ]
+        if not starts :
+            del self ._by_length [length ]
+            del self ._lengths [bisect_left (self ._lengths ,length )]
 
 
 
@@ -134,7 +459,7 @@ class FreeSpaceManager :
 
     def used_count (self )->int :
 
-        return sum (self .bitmap )
+        return self .bitmap .count (1 )
 
     def free_count (self )->int :
 
@@ -148,26 +473,19 @@ class FreeSpaceManager :
 
     def free_runs (self )->List [Tuple [int ,int ]]:
 
-        runs :List [Tuple [int ,int ]]=[]
-        run_len =0 
-        run_start =0 
-        for i ,bit in enumerate (self .bitmap ):
-            if bit ==0 :
-                if run_len ==0 :
-                    run_start =i 
-                run_len +=1 
-            else :
-                if run_len >0 :
-                    runs .append ((run_start ,run_len ))
-                run_len =0 
-        if run_len >0 :
-            runs .append ((run_start ,run_len ))
-        return runs 
+        return list (self .bitmap .zero_runs ())
 
     def largest_free_run_size (self )->int :
 
-        runs =self .free_runs ()
-        return 0 if not runs else max (length for _ ,length in runs )
+        return self ._lengths [-1 ]if self ._lengths else 0 
+
+    def free_run_count (self )->int :
+
+        return len (self ._runs )
+
+    def free_run_histogram (self )->Dict [int ,int ]:
+
+        return {length :len (self ._by_length [length ])for length in self ._lengths }
 
     def external_fragmentation_ratio (self )->float :
 
@@ -177,9 +495,22 @@ class FreeSpaceManager :
         largest =self .largest_free_run_size ()
         return 1.0 -(largest /total_free )
 
+    def internal_fragmentation_ratio (self )->float :
+
+        return 0.0 
+
     def snapshot_bitmap (self )->List [int ]:
 
-        return list (self .bitmap )
+        return self .bitmap .tolist ()
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "policy":self .policy ,
+        "free_runs":self .free_run_count (),
+        "largest_free_run":self .largest_free_run_size (),
+        "free_run_histogram":self .free_run_histogram (),
+        }
 
 
 
@@ -191,5 +522,33 @@ class FreeSpaceManager :
         for i in indices :
             if self .bitmap [i ]==1 :
                 raise ValueError (f"El bloque {i } ya está ocupado")
-        for i in indices :
-            self ._set_used (i )
\ No newline at end of file
+        for start ,count in physical_runs (sorted (set (indices ))):
+            self ._mark (start ,count ,1 )
+
+
+def nearest_run (runs :Sequence [Tuple [int ,int ]],needed :int ,goal :int )->Optional [int ]:
+    best :Optional [int ]=None 
+    for start ,length in runs :
+        if length <needed :
+            continue 
+        pos =min (max (goal ,start ),start +length -needed )
+        if best is None or abs (pos -goal )<abs (best -goal ):
+            best =pos 
+    return best 
+
+
+def nearest_blocks (runs :Sequence [Tuple [int ,int ]],n :int ,goal :int )->List [int ]:
+    ahead =[i for start ,length in runs for i in range (max (start ,goal ),start +length )]
+    behind =[i for start ,length in reversed (runs )for i in range (min (start +length ,goal )-1 ,start -1 ,-1 )]
+    if len (ahead )+len (behind )<n :
+        return []
+    picked :List [int ]=[]
+    a ,b =0 ,0 
+    while len (picked )<n :
+        if b >=len (behind )or (a <len (ahead )and ahead [a ]-goal <=goal -behind [b ]):
+            picked .append (ahead [a ])
+            a +=1 
+        else :
+            picked .append (behind [b ])
+            b +=1 
+    return sorted (picked )
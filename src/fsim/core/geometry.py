@@ -0,0 +1,173 @@
+from __future__ import annotations 
+import math 
+from dataclasses import dataclass ,fields 
+from typing import Any ,Dict ,Optional ,Protocol ,Tuple ,runtime_checkable 
+
+
+@runtime_checkable 
+class LatencyModel (Protocol ):
+
+    def access (self ,start_block :int ,count :int ,block_size :int ,is_write :bool =False )->float :...
+    def stats (self )->Dict [str ,float ]:...
+    def reset (self )->None :...
+
+
+@dataclass (frozen =True )
+class HDDGeometry :
+
+    cylinders :int 
+    heads :int =8 
+    sectors_per_track :int =500 
+    sector_size :int =512 
+    rpm :int =7200 
+    track_to_track_ms :float =0.8 
+    full_stroke_ms :float =16.0 
+    transfer_rate_mb_s :float =160.0 
+
+    def __post_init__ (self )->None :
+        if self .cylinders <=0 or self .heads <=0 or self .sectors_per_track <=0 :
+            raise ValueError ("cylinders, heads y sectors_per_track deben ser > 0")
+        if self .sector_size <=0 or self .rpm <=0 or self .transfer_rate_mb_s <=0 :
+            raise ValueError ("sector_size, rpm y transfer_rate_mb_s deben ser > 0")
+        if self .track_to_track_ms <0 or self .full_stroke_ms <self .track_to_track_ms :
+            raise ValueError ("Curva de seek inválida: 0 <= track_to_track_ms <= full_stroke_ms")
+
+    @classmethod 
+    def for_disk (cls ,n_blocks :int ,block_size :int ,**params :Any )->"HDDGeometry":
+
+        known ={f .name for f in fields (cls )}
+        unknown =set (params )-known 
+        if unknown :
+            raise ValueError (f"Parámetros de geometría desconocidos: {sorted (unknown )}")
+        params ={k :v for k ,v in params .items ()if v is not None }
+        heads =int (params .get ("heads",cls .heads ))
+        spt =int (params .get ("sectors_per_track",cls .sectors_per_track ))
+        sector_size =int (params .get ("sector_size",cls .sector_size ))
+        sectors_needed =n_blocks *-(-block_size //sector_size )
+        min_cylinders =-(-sectors_needed //(heads *spt ))
+        cylinders =max (int (params .pop ("cylinders",0 )or 0 ),min_cylinders )
+        return cls (cylinders =cylinders ,**params )
+
+    @property 
+    def rotation_ms (self )->float :
+
+        return 60000.0 /self .rpm 
+
+    @property 
+    def capacity_sectors (self )->int :
+
+        return self .cylinders *self .heads *self .sectors_per_track 
+
+    def sectors_per_block (self ,block_size :int )->int :
+
+        return -(-block_size //self .sector_size )
+
+    def locate (self ,lba :int )->Tuple [int ,int ,int ]:
+
+        per_cylinder =self .heads *self .sectors_per_track 
+        cylinder ,rest =divmod (lba ,per_cylinder )
+        head ,sector =divmod (rest ,self .sectors_per_track )
+        return cylinder ,head ,sector 
+
+    def seek_time_ms (self ,distance :int )->float :
+
+        if distance <=0 :
+            return 0.0 
+        span =max (1 ,self .cylinders -1 )
+        frac =(distance -1 )/span 
+        return self .track_to_track_ms +(self .full_stroke_ms -self .track_to_track_ms )*math .sqrt (frac )
+
+    def transfer_time_ms (self ,nbytes :int )->float :
+
+        return nbytes /(self .transfer_rate_mb_s *1000.0 )
+
+
+class HDDModel :
+
+    def __init__ (self ,geometry :HDDGeometry )->None :
+
+        self .geometry :HDDGeometry =geometry 
+        self .reset ()
+
+    def reset (self )->None :
+
+        self .head_cylinder :int =0 
+        self .clock_ms :float =0.0 
+        self ._next_lba :Optional [int ]=None 
+        self .accesses :int =0 
+        self .seeks :int =0 
+        self .seek_distance :int =0 
+        self .seek_ms :float =0.0 
+        self .rotational_ms :float =0.0 
+        self .transfer_ms :float =0.0 
+        self .bytes_transferred :int =0 
+
+    def cylinder_of (self ,block :int ,block_size :int )->int :
+
+        return self .geometry .locate (block *self .geometry .sectors_per_block (block_size ))[0 ]
+
+    def access (self ,start_block :int ,count :int ,block_size :int ,is_write :bool =False )->float :
+
+        g =self .geometry 
+        spb =g .sectors_per_block (block_size )
+        lba =start_block *spb 
+        if lba +count *spb >g .capacity_sectors :
+            raise ValueError (
+            f"Acceso fuera de la geometría: bloque {start_block } + {count } "
+            f"excede {g .capacity_sectors } sectores"
+            )
+
+        seek =rotation =0.0 
+        if lba !=self ._next_lba :
+            cylinder ,_ ,sector =g .locate (lba )
+            distance =abs (cylinder -self .head_cylinder )
+            seek =g .seek_time_ms (distance )
+            if distance :
+                self .seeks +=1 
+                self .seek_distance +=distance 
+            angle =((self .clock_ms +seek )%g .rotation_ms )/g .rotation_ms 
+            target =sector /g .sectors_per_track 
+            rotation =((target -angle )%1.0 )*g .rotation_ms 
+
+        nbytes =count *block_size 
+        transfer =g .transfer_time_ms (nbytes )
+        service =seek +rotation +transfer 
+
+        end_lba =lba +count *spb 
+        self .head_cylinder =g .locate (end_lba -1 )[0 ]
+        self ._next_lba =end_lba 
+        self .clock_ms +=service 
+        self .accesses +=1 
+        self .seek_ms +=seek 
+        self .rotational_ms +=rotation 
+        self .transfer_ms +=transfer 
+        self .bytes_transferred +=nbytes 
+        return service 
+
+    def seek_to (self ,cylinder :int )->float :
+
+        g =self .geometry 
+        cylinder =min (max (0 ,cylinder ),g .cylinders -1 )
+        distance =abs (cylinder -self .head_cylinder )
+        seek =g .seek_time_ms (distance )
+        if distance :
+            self .seeks +=1 
+            self .seek_distance +=distance 
+        self .head_cylinder =cylinder 
+        self ._next_lba =None 
+        self .clock_ms +=seek 
+        self .seek_ms +=seek 
+        return seek 
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "accesses":self .accesses ,
+        "seeks":self .seeks ,
+        "seek_distance_cyl":self .seek_distance ,
+        "seek_ms":round (self .seek_ms ,3 ),
+        "rotational_ms":round (self .rotational_ms ,3 ),
+        "transfer_ms":round (self .transfer_ms ,3 ),
+        "service_ms":round (self .clock_ms ,3 ),
+        "bytes_transferred":self .bytes_transferred ,
+        }
@@ -0,0 +1,148 @@
+from __future__ import annotations 
+import mmap 
+import struct 
+import sys 
+from array import array 
+from pathlib import Path 
+from typing import Iterable ,Optional 
+
+from .disk import Disk ,EMPTY_LENGTH 
+from .geometry import LatencyModel 
+
+IMAGE_MAGIC =b"FSIMDISK"
+IMAGE_VERSION =1 
+HEADER_FORMAT ="<8sIqq"
+HEADER_SIZE =struct .calcsize (HEADER_FORMAT )
+LENGTH_FORMAT ="<i"
+LENGTH_ITEM_SIZE =struct .calcsize (LENGTH_FORMAT )
+NATIVE_LENGTHS =sys .byteorder =="little"
+
+
+class MappedDisk (Disk ):
+
+    def __init__ (
+    self ,
+    path :str |Path ,
+    n_blocks :Optional [int ]=None ,
+    block_size :Optional [int ]=None ,
+    *,
+    prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
+    )->None :
+
+        self .path :Path =Path (path )
+
+        if array ("i").itemsize !=LENGTH_ITEM_SIZE :
+            raise ValueError (f"Plataforma no soportada: array('i') ocupa {array ('i').itemsize } B (se esperan {LENGTH_ITEM_SIZE })")
+
+        if n_blocks is None and block_size is None :
+            if prefill is not None :
+                raise ValueError ("prefill solo aplica al crear una imagen nueva")
+            self ._file =self .path .open ("r+b")
+            try :
+                n_blocks ,block_size =_parse_header (self ._file .read (HEADER_SIZE ),self .path )
+            except ValueError :
+                self ._file .close ()
+                raise 
+            creating =False 
+        else :
+            if n_blocks is None or block_size is None :
+                raise ValueError ("Para crear una imagen se requieren n_blocks y block_size")
+            if n_blocks <=0 :
+                raise ValueError ("n_blocks debe ser > 0")
+            if block_size <=0 :
+                raise ValueError ("block_size debe ser > 0")
+            if prefill is not None and prefill !="zeros":
+                raise ValueError ("prefill inválido. Usa None o 'zeros'.")
+            self .path .parent .mkdir (parents =True ,exist_ok =True )
+            self ._file =self .path .open ("w+b")
+            creating =True 
+
+        self .n_blocks :int =int (n_blocks )
+        self .block_size :int =int (block_size )
+        self .latency_model =latency_model 
+        self .reset_stats ()
+
+        lengths_size =self .n_blocks *LENGTH_ITEM_SIZE 
+        self ._data_offset :int =HEADER_SIZE +lengths_size 
+        image_size =self ._data_offset +self .n_blocks *self .block_size 
+
+        if creating :
+            initial =self .block_size if prefill =="zeros"else EMPTY_LENGTH 
+            self ._file .write (struct .pack (HEADER_FORMAT ,IMAGE_MAGIC ,IMAGE_VERSION ,self .n_blocks ,self .block_size ))
+            self ._file .write (_encode_lengths (array ("i",[initial ])*self .n_blocks ))
+            self ._file .truncate (image_size )
+            self ._file .flush ()
+        elif self .path .stat ().st_size !=image_size :
+            self ._file .close ()
+            raise ValueError (
+            f"Imagen truncada o corrupta: {self .path .stat ().st_size } B "
+            f"(esperados {image_size } B)"
+            )
+
+        self ._buffer =mmap .mmap (self ._file .fileno (),image_size )
+        raw =memoryview (self ._buffer )
+        table =raw [HEADER_SIZE :self ._data_offset ]
+        if NATIVE_LENGTHS :
+            self ._lengths =table .cast ("i")
+        else :
+            self ._lengths =array ("i",table .tobytes ())
+            self ._lengths .byteswap ()
+            table .release ()
+        self ._view :memoryview =raw [self ._data_offset :]
+        self ._raw :memoryview =raw 
+        self ._used :int =self .n_blocks -self ._lengths .tolist ().count (EMPTY_LENGTH )
+
+    @classmethod 
+    def open (cls ,path :str |Path )->"MappedDisk":
+
+        return cls (path )
+
+    @property 
+    def closed (self )->bool :
+
+        return self ._buffer .closed 
+
+    def flush (self )->None :
+
+        if not NATIVE_LENGTHS :
+            self ._raw [HEADER_SIZE :self ._data_offset ]=_encode_lengths (self ._lengths )
+        self ._buffer .flush ()
+
+    def close (self )->None :
+
+        if self ._buffer .closed :
+            return 
+        self .flush ()
+        if NATIVE_LENGTHS :
+            self ._lengths .release ()
+        self ._view .release ()
+        self ._raw .release ()
+        self ._buffer .close ()
+        self ._file .close ()
+
+    def __enter__ (self )->"MappedDisk":
+        return self 
+
+    def __exit__ (self ,*exc )->None :
+        self .close ()
+
+
+def _encode_lengths (lengths :Iterable [int ])->bytes :
+    table =array ("i",lengths )
+    if not NATIVE_LENGTHS :
+        table .byteswap ()
+    return table .tobytes ()
+
+
+def _parse_header (header :bytes ,path :Path )->tuple [int ,int ]:
+    if len (header )<HEADER_SIZE :
+        raise ValueError (f"'{path }' es demasiado pequeño para ser una imagen de disco")
+    magic ,version ,n_blocks ,block_size =struct .unpack (HEADER_FORMAT ,header )
+    if magic !=IMAGE_MAGIC :
+        raise ValueError (f"'{path }' no es una imagen de disco válida")
+    if version !=IMAGE_VERSION :
+        raise ValueError (f"Versión de imagen no soportada: {version }")
+    if n_blocks <=0 or block_size <=0 :
+        raise ValueError (f"Cabecera inválida en '{path }': n_blocks={n_blocks }, block_size={block_size }")
+    return n_blocks ,block_size 
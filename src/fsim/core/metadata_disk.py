@@ -0,0 +1,183 @@
+from __future__ import annotations 
+from bisect import bisect_left ,bisect_right 
+from typing import Dict ,List ,Optional ,Tuple 
+
+from .block import zero_payload 
+from .disk import Disk ,extent_lengths 
+from .geometry import LatencyModel 
+
+_EMPTY =b""
+
+
+class ExtentSet :
+
+    def __init__ (self )->None :
+        self ._starts :List [int ]=[]
+        self ._ends :List [int ]=[]
+        self .count :int =0 
+
+    def __contains__ (self ,i :int )->bool :
+        k =bisect_right (self ._starts ,i )-1 
+        return k >=0 and i <self ._ends [k ]
+
+    def __len__ (self )->int :
+        return len (self ._starts )
+
+    def extents (self )->List [Tuple [int ,int ]]:
+
+        return [(s ,e -s )for s ,e in zip (self ._starts ,self ._ends )]
+
+    def add_range (self ,start :int ,end :int )->int :
+
+        if start >=end :
+            return 0 
+        lo =bisect_left (self ._ends ,start )
+        hi =bisect_right (self ._starts ,end )
+        covered =0 
+        new_start ,new_end =start ,end 
+        for k in range (lo ,hi ):
+            s ,e =self ._starts [k ],self ._ends [k ]
+            covered +=max (0 ,min (e ,end )-max (s ,start ))
+            new_start =min (new_start ,s )
+            new_end =max (new_end ,e )
+        self ._starts [lo :hi ]=[new_start ]
+        self ._ends [lo :hi ]=[new_end ]
+        added =(end -start )-covered 
+        self .count +=added 
+        return added 
+
+    def remove_range (self ,start :int ,end :int )->int :
+
+        if start >=end :
+            return 0 
+        lo =bisect_right (self ._ends ,start )
+        hi =bisect_left (self ._starts ,end )
+        if lo >=hi :
+            return 0 
+        starts :List [int ]=[]
+        ends :List [int ]=[]
+        removed =0 
+        for k in range (lo ,hi ):
+            s ,e =self ._starts [k ],self ._ends [k ]
+            removed +=min (e ,end )-max (s ,start )
+            if s <start :
+                starts .append (s )
+                ends .append (start )
+            if e >end :
+                starts .append (end )
+                ends .append (e )
+        self ._starts [lo :hi ]=starts 
+        self ._ends [lo :hi ]=ends 
+        self .count -=removed 
+        return removed 
+
+
+class MetadataDisk (Disk ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    block_size :int ,
+    *,
+    prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
+    )->None :
+
+        if n_blocks <=0 :
+            raise ValueError ("n_blocks debe ser > 0")
+        if block_size <=0 :
+            raise ValueError ("block_size debe ser > 0")
+        if prefill is not None and prefill !="zeros":
+            raise ValueError ("prefill inválido. Usa None o 'zeros'.")
+
+        self .n_blocks :int =int (n_blocks )
+        self .block_size :int =int (block_size )
+        self .latency_model =latency_model 
+        self .reset_stats ()
+
+        self ._payloads :Dict [int ,bytes ]={}
+        self ._occupied =ExtentSet ()
+        self ._zero_filled =ExtentSet ()
+        self ._zero_block :bytes =zero_payload (self .block_size )
+
+        if prefill =="zeros":
+            self ._zero_filled .add_range (0 ,self .n_blocks )
+
+    @property 
+    def _used (self )->int :
+        return len (self ._payloads )+self ._occupied .count +self ._zero_filled .count 
+
+    def metadata_blocks_count (self )->int :
+
+        return len (self ._payloads )
+
+    def occupancy_extents (self )->int :
+
+        return len (self ._occupied )+len (self ._zero_filled )
+
+    def resident_bytes (self )->int :
+
+        payload_bytes =sum (len (p )for p in self ._payloads .values ())
+        return payload_bytes +16 *self .occupancy_extents ()
+
+    def fill_block_zeros (self ,i :int )->None :
+
+        self ._check_index (i )
+        self ._count (i ,1 ,True )
+        self .bytes_written +=self .block_size 
+        self ._forget (i ,i +1 )
+        self ._zero_filled .add_range (i ,i +1 )
+
+    def _load (self ,i :int )->bytes |None :
+        payload =self ._payloads .get (i )
+        if payload is not None :
+            return payload 
+        if i in self ._occupied :
+            return _EMPTY 
+        if i in self ._zero_filled :
+            return self ._zero_block 
+        return None 
+
+    def _load_view (self ,i :int )->memoryview |None :
+        payload =self ._load (i )
+        return None if payload is None else memoryview (payload )
+
+    def _store (self ,i :int ,data ,length :int )->None :
+        self ._forget (i ,i +1 )
+        if length ==0 :
+            self ._occupied .add_range (i ,i +1 )
+        else :
+            self ._payloads [i ]=bytes (data )
+
+    def _clear (self ,i :int )->None :
+        self ._forget (i ,i +1 )
+
+    def _load_range (self ,start :int ,count :int ,zero_copy :bool )->List [bytes |memoryview |None ]:
+        load =self ._load_view if zero_copy else self ._load 
+        return [load (i )for i in range (start ,start +count )]
+
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        end =start +count 
+        self ._forget (start ,end )
+        if data is None :
+            return 
+
+        view =memoryview (data ).cast ("B")
+        bs =self .block_size 
+        for k ,length in enumerate (extent_lengths (nbytes ,count ,bs )):
+            if length ==0 :
+                self ._occupied .add_range (start +k ,end )
+                break 
+            self ._payloads [start +k ]=view [k *bs :k *bs +length ].tobytes ()
+
+    def _forget (self ,start :int ,end :int )->None :
+        self ._occupied .remove_range (start ,end )
+        self ._zero_filled .remove_range (start ,end )
+        if not self ._payloads :
+            return 
+        if end -start <=len (self ._payloads ):
+            for i in range (start ,end ):
+                self ._payloads .pop (i ,None )
+        else :
+            for i in [k for k in self ._payloads if start <=k <end ]:
+                del self ._payloads [i ]
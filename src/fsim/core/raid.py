@@ -0,0 +1,343 @@
+from __future__ import annotations 
+from typing import Dict ,Iterable ,List ,Optional ,Sequence ,Tuple 
+
+from .disk import _nbytes ,extent_lengths 
+from .filesystem_base import DiskLike 
+
+RAID_LEVELS =(0 ,1 ,5 ,10 )
+DEFAULT_STRIPE_BLOCKS =16 
+
+
+class RaidVolume :
+
+    def __init__ (
+    self ,
+    members :Sequence [DiskLike ],
+    *,
+    level :int =0 ,
+    stripe_blocks :int =DEFAULT_STRIPE_BLOCKS ,
+    n_blocks :Optional [int ]=None ,
+    )->None :
+
+        if level not in RAID_LEVELS :
+            raise ValueError (f"Nivel RAID inválido: {level } (usa {', '.join (str (x )for x in RAID_LEVELS )})")
+        if stripe_blocks <=0 :
+            raise ValueError ("stripe_blocks debe ser > 0")
+        members =list (members )
+        minimum ={0 :1 ,1 :2 ,5 :3 ,10 :4 }[level ]
+        if len (members )<minimum :
+            raise ValueError (f"RAID {level } requiere al menos {minimum } miembros")
+        if level ==10 and len (members )%2 :
+            raise ValueError ("RAID 10 requiere un número par de miembros")
+        if len ({(m .n_blocks ,m .block_size )for m in members })!=1 :
+            raise ValueError ("Todos los miembros deben tener el mismo n_blocks y block_size")
+
+        self .members :List [DiskLike ]=members 
+        self .level :int =level 
+        self .stripe_blocks :int =int (stripe_blocks )
+        self .block_size :int =members [0 ].block_size 
+
+        capacity =self .capacity_for (level ,len (members ),members [0 ].n_blocks ,self .stripe_blocks )
+        if n_blocks is None :
+            n_blocks =capacity 
+        if n_blocks <=0 or n_blocks >capacity :
+            raise ValueError (f"n_blocks debe estar en 1..{capacity } para este arreglo")
+        self .n_blocks :int =int (n_blocks )
+
+        self ._present =bytearray (self .n_blocks )
+        self ._used :int =0 
+        self ._zero_block :bytes =bytes (self .block_size )
+        self .member_reads :List [int ]=[0 ]*len (members )
+        self .member_writes :List [int ]=[0 ]*len (members )
+        self .logical_reads :int =0 
+        self .logical_writes :int =0 
+        self .rmw_writes :int =0 
+        self .full_stripe_writes :int =0 
+        self .parity_writes :int =0 
+
+    @staticmethod 
+    def capacity_for (level :int ,n_members :int ,member_blocks :int ,stripe_blocks :int )->int :
+
+        usable =member_blocks -member_blocks %stripe_blocks 
+        if level ==0 :
+            return usable *n_members 
+        if level ==1 :
+            return member_blocks 
+        if level ==10 :
+            return usable *(n_members //2 )
+        return usable *(n_members -1 )
+
+    @staticmethod 
+    def member_blocks_for (level :int ,n_members :int ,n_blocks :int ,stripe_blocks :int )->int :
+
+        if level not in RAID_LEVELS :
+            raise ValueError (f"Nivel RAID inválido: {level } (usa {', '.join (str (x )for x in RAID_LEVELS )})")
+        if level ==1 :
+            return n_blocks 
+        data_members ={0 :n_members ,10 :n_members //2 ,5 :n_members -1 }[level ]
+        stripes =-(-n_blocks //stripe_blocks )
+        return -(-stripes //data_members )*stripe_blocks 
+
+    def read_block (self ,i :int )->bytes |None :
+
+        self ._check_range (i ,1 )
+        self .logical_reads +=1 
+        member ,mb =self ._read_target (i )
+        self .member_reads [member ]+=1 
+        return self .members [member ].read_block (mb )
+
+    def write_block (self ,i :int ,data :bytes |None )->None :
+
+        self ._check_range (i ,1 )
+        if data is not None :
+            if not isinstance (data ,(bytes ,bytearray ,memoryview )):
+                raise TypeError ("data debe ser bytes-like o None")
+            if _nbytes (data )>self .block_size :
+                raise ValueError (f"Tamaño de data ({_nbytes (data )}) excede block_size ({self .block_size })")
+            data =bytes (data )
+        self ._write_logical ([i ],[data ])
+
+    def clear_block (self ,i :int )->None :
+
+        self .write_block (i ,None )
+
+    def fill_block_zeros (self ,i :int )->None :
+
+        self .write_block (i ,self ._zero_block )
+
+    def read_blocks (self ,indices :Sequence [int ],*,zero_copy :bool =False )->List [bytes |None ]:
+
+        return [self .read_block (i )for i in indices ]
+
+    def write_blocks (self ,indices :Sequence [int ],payloads :Iterable [Optional [bytes ]])->None :
+
+        payloads_list =[None if p is None else bytes (p )for p in payloads ]
+        if len (indices )!=len (payloads_list ):
+            raise ValueError ("indices y payloads deben tener la misma longitud")
+        for i ,p in zip (indices ,payloads_list ):
+            self ._check_range (i ,1 )
+            if p is not None and len (p )>self .block_size :
+                raise ValueError (f"payload excede block_size ({len (p )} > {self .block_size })")
+        self ._write_logical (list (indices ),payloads_list )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |None ]:
+
+        self ._check_range (start ,count )
+        self .logical_reads +=count 
+        payloads :List [bytes |None ]=[]
+        for chunk_start ,chunk_count in self ._stripe_chunks (start ,count ):
+            member ,mb =self ._read_target (chunk_start )
+            self .member_reads [member ]+=chunk_count 
+            payloads .extend (self .members [member ].read_range (mb ,chunk_count ))
+        return payloads 
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        if payload_buffer is None :
+            if count is None :
+                raise ValueError ("count es obligatorio para limpiar un rango")
+            self ._check_range (start ,count )
+            self ._write_logical (list (range (start ,start +count )),[None ]*count )
+            return 
+
+        view =memoryview (payload_buffer ).cast ("B")
+        bs =self .block_size 
+        if count is None :
+            count =max (1 ,-(-view .nbytes //bs ))
+        self ._check_range (start ,count )
+        if view .nbytes >count *bs :
+            raise ValueError (f"payload_buffer ({view .nbytes } B) excede el rango de {count } bloques ({count *bs } B)")
+        payloads =[view [k *bs :k *bs +length ].tobytes ()for k ,length in enumerate (extent_lengths (view .nbytes ,count ,bs ))]
+        self ._write_logical (list (range (start ,start +count )),payloads )
+
+    def used_blocks_count (self )->int :
+
+        return self ._used 
+
+    def empty_blocks_count (self )->int :
+
+        return self .n_blocks -self ._used 
+
+    def is_block_used (self ,i :int )->bool :
+
+        return bool (self ._present [i ])
+
+    def __len__ (self )->int :
+
+        return self .n_blocks 
+
+    def verify_parity (self )->int :
+
+        if self .level !=5 :
+            return 0 
+        n =len (self .members )
+        rows =self .members [0 ].n_blocks //self .stripe_blocks 
+        mismatches =0 
+        for row in range (rows ):
+            parity =self ._parity_member (row )
+            for off in range (self .stripe_blocks ):
+                mb =row *self .stripe_blocks +off 
+                payloads =[self .members [m ].read_block (mb )for m in range (n )if m !=parity ]
+                if _xor_blocks (payloads ,self .block_size )!=(self .members [parity ].read_block (mb )or self ._zero_block ):
+                    mismatches +=1 
+        return mismatches 
+
+    def raid_stats (self )->Dict [str ,float ]:
+
+        ops =[r +w for r ,w in zip (self .member_reads ,self .member_writes )]
+        mean =sum (ops )/len (ops )
+        return {
+        "level":self .level ,
+        "members":len (self .members ),
+        "stripe_blocks":self .stripe_blocks ,
+        "logical_reads":self .logical_reads ,
+        "logical_writes":self .logical_writes ,
+        "member_reads":list (self .member_reads ),
+        "member_writes":list (self .member_writes ),
+        "rmw_writes":self .rmw_writes ,
+        "full_stripe_writes":self .full_stripe_writes ,
+        "parity_writes":self .parity_writes ,
+        "write_penalty":round (sum (ops )/max (1 ,self .logical_reads +self .logical_writes ),3 ),
+        "load_imbalance":round (max (ops )/mean ,3 )if mean else 0.0 ,
+        }
+
+    def _stripe_chunks (self ,start :int ,count :int )->List [Tuple [int ,int ]]:
+        chunks :List [Tuple [int ,int ]]=[]
+        pos ,end =start ,start +count 
+        while pos <end :
+            chunk_end =min (end ,(pos //self .stripe_blocks +1 )*self .stripe_blocks )
+            chunks .append ((pos ,chunk_end -pos ))
+            pos =chunk_end 
+        return chunks 
+
+    def _read_target (self ,i :int )->Tuple [int ,int ]:
+        n =len (self .members )
+        stripe ,off =divmod (i ,self .stripe_blocks )
+        if self .level ==0 :
+            return stripe %n ,(stripe //n )*self .stripe_blocks +off 
+        if self .level ==1 :
+            return stripe %n ,i 
+        if self .level ==10 :
+            pairs =n //2 
+            pair =stripe %pairs 
+            row =stripe //pairs 
+            return 2 *pair +row %2 ,row *self .stripe_blocks +off 
+        row ,k =divmod (stripe ,n -1 )
+        return (self ._parity_member (row )+1 +k )%n ,row *self .stripe_blocks +off 
+
+    def _parity_member (self ,row :int )->int :
+        n =len (self .members )
+        return (n -1 )-row %n 
+
+    def _mirror_targets (self ,i :int )->List [Tuple [int ,int ]]:
+        if self .level ==1 :
+            return [(m ,i )for m in range (len (self .members ))]
+        member ,mb =self ._read_target (i )
+        if self .level ==10 :
+            first =member -member %2 
+            return [(first ,mb ),(first +1 ,mb )]
+        return [(member ,mb )]
+
+    def _track (self ,i :int ,data :bytes |None )->bool :
+        present =data is not None 
+        if not present and not self ._present [i ]:
+            return False 
+        if present !=bool (self ._present [i ]):
+            self ._present [i ]=present 
+            self ._used +=1 if present else -1 
+        self .logical_writes +=1 
+        return True 
+
+    def _member_write (self ,member :int ,mb :int ,data :bytes |None )->None :
+        if data is not None :
+            self .member_writes [member ]+=1 
+        self .members [member ].write_block (mb ,data )
+
+    def _write_logical (self ,indices :List [int ],payloads :List [bytes |None ])->None :
+        kept =[(i ,data )for i ,data in zip (indices ,payloads )if self ._track (i ,data )]
+        if self .level !=5 :
+            for i ,data in kept :
+                for member ,mb in self ._mirror_targets (i ):
+                    self ._member_write (member ,mb ,data )
+            return 
+
+        n =len (self .members )
+        su =self .stripe_blocks 
+        row_span =su *(n -1 )
+        pending :Dict [int ,Dict [int ,bytes |None ]]={}
+        for i ,data in kept :
+            pending .setdefault (i //row_span ,{})[i ]=data 
+
+        for row ,writes in pending .items ():
+            row_start =row *row_span 
+            full =len (writes )==row_span and row_start +row_span <=self .n_blocks 
+            if full :
+                self ._write_full_row (row ,writes )
+            else :
+                for i ,data in writes .items ():
+                    self ._write_small (i ,data )
+
+    def _write_full_row (self ,row :int ,writes :Dict [int ,bytes |None ])->None :
+        su =self .stripe_blocks 
+        parity =self ._parity_member (row )
+        columns :List [List [bytes |None ]]=[[]for _ in range (su )]
+        for i in sorted (writes ):
+            member ,mb =self ._read_target (i )
+            self ._member_write (member ,mb ,writes [i ])
+            columns [i %su ].append (writes [i ])
+        for off in range (su ):
+            self ._member_write (parity ,row *su +off ,_xor_blocks (columns [off ],self .block_size ))
+        self .full_stripe_writes +=1 
+        self .parity_writes +=su 
+
+    def _write_small (self ,i :int ,data :bytes |None )->None :
+        member ,mb =self ._read_target (i )
+        parity =self ._parity_member (i //(self .stripe_blocks *(len (self .members )-1 )))
+        self .member_reads [member ]+=1 
+        self .member_reads [parity ]+=1 
+        old =self .members [member ].read_block (mb )
+        old_parity =self .members [parity ].read_block (mb )
+        self ._member_write (member ,mb ,data )
+        self ._member_write (parity ,mb ,_xor_blocks ([old_parity ,old ,data ],self .block_size ))
+        self .rmw_writes +=1 
+        self .parity_writes +=1 
+
+    def _check_range (self ,start :int ,count :int )->None :
+        if not isinstance (start ,int )or not isinstance (count ,int ):
+            raise TypeError ("start y count deben ser int")
+        if count <=0 :
+            raise ValueError ("count debe ser > 0")
+        if start <0 or start +count >self .n_blocks :
+            raise IndexError (f"Rango fuera de límites: [{start }, {start +count }) (0..{self .n_blocks })")
+
+
+class ArrayClock :
+
+    def __init__ (self ,models :Sequence )->None :
+
+        self .models =list (models )
+
+    @property 
+    def clock_ms (self )->float :
+
+        return max (m .clock_ms for m in self .models )
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "clock_ms":round (self .clock_ms ,3 ),
+        "members":[m .stats ()for m in self .models ],
+        }
+
+    def reset (self )->None :
+
+        for m in self .models :
+            m .reset ()
+
+
+def _xor_blocks (payloads :Iterable [bytes |None ],block_size :int )->bytes :
+    acc =0 
+    for p in payloads :
+        if p :
+            acc ^=int .from_bytes (p ,"little")
+    return acc .to_bytes (block_size ,"little")
@@ -0,0 +1,130 @@
+from __future__ import annotations 
+from typing import Dict ,Optional ,Sequence ,Tuple 
+
+from .cache import BufferCache 
+
+DEFAULT_INITIAL_WINDOW =4 
+DEFAULT_MAX_WINDOW =64 
+
+
+class ReadAheadStream :
+
+    __slots__ =("prev_end","window","ra_end")
+
+    def __init__ (self ,prev_end :int ,window :int ,ra_end :int )->None :
+        self .prev_end =prev_end 
+        self .window =window 
+        self .ra_end =ra_end 
+
+
+class ReadAhead :
+
+    def __init__ (
+    self ,
+    cache :BufferCache ,
+    *,
+    initial_window :int =DEFAULT_INITIAL_WINDOW ,
+    max_window :int =DEFAULT_MAX_WINDOW ,
+    )->None :
+
+        if initial_window <=0 or max_window <=0 :
+            raise ValueError ("Las ventanas de read-ahead deben ser > 0")
+        if initial_window >max_window :
+            raise ValueError ("initial_window no puede superar max_window")
+
+        self .cache :BufferCache =cache 
+        self .initial_window :int =int (initial_window )
+        self .max_window :int =int (max_window )
+        self ._streams :Dict [str ,ReadAheadStream ]={}
+        self .windows_issued :int =0 
+        self .window_blocks :int =0 
+        self .sequential_hits :int =0 
+        self .stream_resets :int =0 
+        self .largest_window :int =0 
+
+    def on_read (
+    self ,
+    name :str ,
+    offset :int ,
+    n_blocks :int ,
+    access_mode :str ,
+    file_size :int ,
+    )->Optional [Tuple [int ,int ]]:
+
+        stream =self ._streams .get (name )
+        if access_mode =="rand":
+            if stream is not None :
+                del self ._streams [name ]
+                self .stream_resets +=1 
+            return None 
+
+        end =offset +n_blocks 
+        if stream is not None and stream .prev_end <=offset <=stream .ra_end :
+            self .sequential_hits +=1 
+            window =self ._next_window (stream .window )
+            start =max (end ,stream .ra_end )
+        else :
+            if stream is not None :
+                self .stream_resets +=1 
+            window =self ._initial_window (n_blocks )
+            start =end 
+
+        ra_end =min (file_size ,end +window )
+        self ._streams [name ]=ReadAheadStream (end ,window ,max (ra_end ,end ))
+        if ra_end <=start :
+            return None 
+
+        self .windows_issued +=1 
+        self .window_blocks +=ra_end -start 
+        self .largest_window =max (self .largest_window ,window )
+        return start ,ra_end -start 
+
+    def prefetch (self ,indices :Sequence [int ])->None :
+
+        if indices :
+            self .cache .prefetch (indices )
+
+    def fetch (self ,i :int )->bytes |None :
+
+        return self .cache .prefetch ([i ])[0 ]
+
+    def forget (self ,name :str )->None :
+
+        self ._streams .pop (name ,None )
+
+    def stats (self )->Dict [str ,float ]:
+
+        issued =self .cache .prefetch_issued 
+        used =self .cache .prefetch_used 
+        return {
+        "initial_window":self .initial_window ,
+        "max_window":self .max_window ,
+        "windows_issued":self .windows_issued ,
+        "avg_window_blocks":round (self .window_blocks /self .windows_issued ,2 )if self .windows_issued else 0.0 ,
+        "largest_window":self .largest_window ,
+        "sequential_hits":self .sequential_hits ,
+        "stream_resets":self .stream_resets ,
+        "prefetched_blocks":issued ,
+        "prefetch_used":used ,
+        "prefetch_wasted":self .cache .prefetch_wasted ,
+        "prefetch_pending":self .cache .prefetch_pending (),
+        "accuracy_pct":round (used /issued *100.0 ,2 )if issued else 0.0 ,
+        }
+
+    def _initial_window (self ,n_blocks :int )->int :
+        size =1 
+        while size <n_blocks :
+            size *=2 
+        if size <=self .max_window //32 :
+            size *=4 
+        elif size <=self .max_window //4 :
+            size *=2 
+        else :
+            size =self .max_window 
+        return max (self .initial_window ,min (size ,self .max_window ))
+
+    def _next_window (self ,window :int )->int :
+        if window <self .max_window //16 :
+            return min (self .max_window ,window *4 )
+        return min (self .max_window ,window *2 )
+
@@ -0,0 +1,226 @@
+from __future__ import annotations 
+from typing import Dict ,Iterable ,List ,Optional ,Sequence ,Tuple 
+
+from .disk_layer import DiskLayer 
+from .extents import physical_runs 
+from .filesystem_base import DiskLike 
+from .geometry import HDDGeometry ,HDDModel 
+
+SCHEDULER_ALGORITHMS =("fcfs","sstf","scan","clook")
+DEFAULT_QUEUE_DEPTH =8 
+
+TraceEntry =Optional [Tuple [int ,int ,bool ]]
+
+
+class IORequest :
+
+    __slots__ =("start","count","is_write","arrival_ms","cylinder")
+
+    def __init__ (self ,start :int ,count :int ,is_write :bool ,arrival_ms :float ,cylinder :int )->None :
+        self .start =start 
+        self .count =count 
+        self .is_write =is_write 
+        self .arrival_ms =arrival_ms 
+        self .cylinder =cylinder 
+
+
+class RequestQueue :
+
+    def __init__ (
+    self ,
+    model :HDDModel ,
+    block_size :int ,
+    *,
+    algorithm :str ="fcfs",
+    queue_depth :int =DEFAULT_QUEUE_DEPTH ,
+    )->None :
+
+        if algorithm not in SCHEDULER_ALGORITHMS :
+            raise ValueError (f"Algoritmo de planificación inválido: {algorithm } (usa {', '.join (SCHEDULER_ALGORITHMS )})")
+        if queue_depth <=0 :
+            raise ValueError ("queue_depth debe ser > 0")
+
+        self .model :HDDModel =model 
+        self .block_size :int =int (block_size )
+        self .algorithm :str =algorithm 
+        self .queue_depth :int =int (queue_depth )
+
+        self ._pending :List [IORequest ]=[]
+        self ._direction :int =1 
+        self .requests :int =0 
+        self .total_wait_ms :float =0.0 
+        self .max_wait_ms :float =0.0 
+        self .total_response_ms :float =0.0 
+        self .max_queue_len :int =0 
+
+    def submit (self ,start :int ,count :int ,is_write :bool )->None :
+
+        cylinder =self .model .cylinder_of (start ,self .block_size )
+        self ._pending .append (IORequest (start ,count ,is_write ,self .model .clock_ms ,cylinder ))
+        self .requests +=1 
+        self .max_queue_len =max (self .max_queue_len ,len (self ._pending ))
+        if len (self ._pending )>=self .queue_depth :
+            self ._dispatch_one ()
+
+    def drain (self )->None :
+
+        while self ._pending :
+            self ._dispatch_one ()
+
+    def pending (self )->int :
+
+        return len (self ._pending )
+
+    def stats (self )->Dict [str ,float ]:
+
+        served =self .requests -len (self ._pending )
+        return {
+        "algorithm":self .algorithm ,
+        "queue_depth":self .queue_depth ,
+        "requests":self .requests ,
+        "max_queue_len":self .max_queue_len ,
+        "seek_distance_cyl":self .model .seek_distance ,
+        "seeks":self .model .seeks ,
+        "service_ms":round (self .model .clock_ms ,3 ),
+        "avg_wait_ms":round (self .total_wait_ms /served ,4 )if served else 0.0 ,
+        "max_wait_ms":round (self .max_wait_ms ,4 ),
+        "avg_response_ms":round (self .total_response_ms /served ,4 )if served else 0.0 ,
+        }
+
+    def _dispatch_one (self )->None :
+        req =self ._pending .pop (self ._pick ())
+        model =self .model 
+        if req .arrival_ms >model .clock_ms :
+            model .clock_ms =req .arrival_ms 
+        wait =model .clock_ms -req .arrival_ms 
+        model .access (req .start ,req .count ,self .block_size ,req .is_write )
+        self .total_wait_ms +=wait 
+        self .max_wait_ms =max (self .max_wait_ms ,wait )
+        self .total_response_ms +=model .clock_ms -req .arrival_ms 
+
+    def _pick (self )->int :
+        pending =self ._pending 
+        if self .algorithm =="fcfs"or len (pending )==1 :
+            return 0 
+
+        head =self .model .head_cylinder 
+        if self .algorithm =="sstf":
+            return min (range (len (pending )),key =lambda k :abs (pending [k ].cylinder -head ))
+
+        if self .algorithm =="clook":
+            ahead =[k for k in range (len (pending ))if pending [k ].cylinder >=head ]
+            if ahead :
+                return min (ahead ,key =lambda k :pending [k ].cylinder )
+            return min (range (len (pending )),key =lambda k :pending [k ].cylinder )
+
+        for _ in range (2 ):
+            d =self ._direction 
+            ahead =[k for k in range (len (pending ))if (pending [k ].cylinder -head )*d >=0 ]
+            if ahead :
+                return min (ahead ,key =lambda k :abs (pending [k ].cylinder -head ))
+            edge =self .model .geometry .cylinders -1 if d >0 else 0 
+            self .model .seek_to (edge )
+            head =self .model .head_cylinder 
+            self ._direction =-d 
+        return 0 
+
+
+class IOScheduler (DiskLayer ):
+
+    def __init__ (
+    self ,
+    disk :DiskLike ,
+    model :HDDModel ,
+    *,
+    algorithm :str ="fcfs",
+    queue_depth :int =DEFAULT_QUEUE_DEPTH ,
+    )->None :
+
+        super ().__init__ (disk )
+        self .queue =RequestQueue (model ,self .block_size ,algorithm =algorithm ,queue_depth =queue_depth )
+        self .trace :List [TraceEntry ]=[]
+
+    @property 
+    def model (self )->HDDModel :
+
+        return self .queue .model 
+
+    def read_block (self ,i :int )->bytes |None :
+
+        data =self .disk .read_block (i )
+        self ._submit (i ,1 ,False )
+        return data 
+
+    def write_block (self ,i :int ,data :bytes |None )->None :
+
+        self .disk .write_block (i ,data )
+        if data is not None :
+            self ._submit (i ,1 ,True )
+
+    def read_blocks (self ,indices :Sequence [int ],*,zero_copy :bool =False )->List [bytes |None ]:
+
+        data =[self .disk .read_block (i )for i in indices ]
+        for start ,count in physical_runs (indices ):
+            self ._submit (start ,count ,False )
+        return data 
+
+    def write_blocks (self ,indices :Sequence [int ],payloads :Iterable [Optional [bytes ]])->None :
+
+        payloads_list =list (payloads )
+        self .disk .write_blocks (indices ,payloads_list )
+        written =[i for i ,p in zip (indices ,payloads_list )if p is not None ]
+        for start ,count in physical_runs (written ):
+            self ._submit (start ,count ,True )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |None ]:
+
+        data =self .disk .read_range (start ,count )
+        self ._submit (start ,count ,False )
+        return data 
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        self .disk .write_range (start ,payload_buffer ,count )
+        if payload_buffer is not None :
+            if count is None :
+                count =max (1 ,-(-len (payload_buffer )//self .block_size ))
+            self ._submit (start ,count ,True )
+
+    def drain (self )->None :
+
+        self .queue .drain ()
+        if self .trace and self .trace [-1 ]is not None :
+            self .trace .append (None )
+
+    def stats (self )->Dict [str ,float ]:
+
+        return self .queue .stats ()
+
+    def compare_algorithms (self ,algorithms :Sequence [str ]=SCHEDULER_ALGORITHMS )->Dict [str ,Dict [str ,float ]]:
+
+        return {
+        alg :replay_trace (self .trace ,self .model .geometry ,self .block_size ,alg ,self .queue .queue_depth )
+        for alg in algorithms 
+        }
+
+    def _submit (self ,start :int ,count :int ,is_write :bool )->None :
+        self .trace .append ((start ,count ,is_write ))
+        self .queue .submit (start ,count ,is_write )
+
+
+def replay_trace (
+trace :Iterable [TraceEntry ],
+geometry :HDDGeometry ,
+block_size :int ,
+algorithm :str ,
+queue_depth :int =DEFAULT_QUEUE_DEPTH ,
+)->Dict [str ,float ]:
+
+    queue =RequestQueue (HDDModel (geometry ),block_size ,algorithm =algorithm ,queue_depth =queue_depth )
+    for entry in trace :
+        if entry is None :
+            queue .drain ()
+        else :
+            queue .submit (*entry )
+    queue .drain ()
+    return queue .stats ()
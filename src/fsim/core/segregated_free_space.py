@@ -0,0 +1,126 @@
+from __future__ import annotations 
+from bisect import bisect_right 
+from typing import Callable ,Dict ,List ,Optional ,Sequence ,Tuple 
+
+from .free_space import BitmapView ,FreeSpaceManager 
+
+DEFAULT_SIZE_CLASSES =(1 ,2 ,3 ,4 ,6 ,8 ,12 ,16 ,24 ,32 )
+
+
+class SegregatedFreeSpaceManager (FreeSpaceManager ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    *,
+    size_classes :Sequence [int ]=DEFAULT_SIZE_CLASSES ,
+    policy :str ="first",
+    preoccupied :Optional [Sequence [int ]]=None ,
+    on_bitmap_update :Optional [Callable [[BitmapView ],None ]]=None ,
+    )->None :
+
+        classes =sorted ({int (c )for c in size_classes })
+        if not classes or classes [0 ]!=1 :
+            raise ValueError ("size_classes debe incluir la clase 1 y solo enteros positivos")
+
+        self .size_classes :Tuple [int ,...]=tuple (classes )
+        self ._class_runs :List [Dict [int ,None ]]=[{}for _ in classes ]
+        self ._class_blocks :List [int ]=[0 ]*len (classes )
+        self .class_requests :List [int ]=[0 ]*len (classes )
+        self .class_hits :List [int ]=[0 ]*len (classes )
+        self .fallbacks :int =0 
+        self ._fell_back :bool =False 
+        super ().__init__ (n_blocks ,policy =policy ,preoccupied =preoccupied ,on_bitmap_update =on_bitmap_update )
+
+    def allocate (self ,n :int ,contiguous :bool =False ,goal :Optional [int ]=None )->List [int ]:
+
+        self ._fell_back =False 
+        try :
+            return super ().allocate (n ,contiguous ,goal )
+        finally :
+            self .fallbacks +=self ._fell_back 
+
+    def class_of (self ,length :int )->int :
+
+        return bisect_right (self .size_classes ,length )-1 
+
+    def class_label (self ,c :int )->str :
+
+        lo =self .size_classes [c ]
+        if c ==len (self .size_classes )-1 :
+            return f"{lo }+"
+        hi =self .size_classes [c +1 ]-1 
+        return str (lo )if hi ==lo else f"{lo }-{hi }"
+
+    def stats (self )->Dict [str ,float ]:
+
+        stats =super ().stats ()
+        total_free =self .free_count ()
+        stats ["size_classes"]={
+        self .class_label (c ):{
+        "free_runs":len (self ._class_runs [c ]),
+        "free_blocks":self ._class_blocks [c ],
+        "free_blocks_pct":round (self ._class_blocks [c ]/total_free *100.0 ,2 )if total_free else 0.0 ,
+        "requests":self .class_requests [c ],
+        "hits":self .class_hits [c ],
+        }
+        for c in range (len (self .size_classes ))
+        }
+        stats ["fallbacks"]=self .fallbacks 
+        return stats 
+
+    def _find_run (self ,needed :int )->Optional [Tuple [int ,int ]]:
+        if needed >self .size_classes [-1 ]:
+            self ._fell_back =True 
+            return super ()._find_run (needed )
+        c =self .class_of (needed )
+        self .class_requests [c ]+=1 
+        start =self ._find_class_run (needed ,c )
+        if start is None :
+            return None 
+        self .class_hits [c ]+=1 
+        return (start ,needed )
+
+    def _find_class_run (self ,needed :int ,c :int )->Optional [int ]:
+        exact =self ._by_length .get (needed )
+        if exact :
+            return next (iter (exact ))
+        runs =self ._class_runs 
+        if c +1 ==len (runs ):
+            return next (iter (runs [c ]))if runs [c ]else None 
+        for length in range (needed +1 ,self .size_classes [c +1 ]):
+            starts =self ._by_length .get (length )
+            if starts :
+                return next (iter (starts ))
+        for k in range (c +1 ,len (runs )):
+            if runs [k ]:
+                return next (iter (runs [k ]))
+        return None 
+
+    def _gather_free_blocks (self ,n :int )->List [int ]:
+        if n >self .size_classes [-1 ]:
+            self ._fell_back =True 
+            return super ()._gather_free_blocks (n )
+        run =self ._find_run (n )
+        if run is not None :
+            return list (range (run [0 ],run [0 ]+n ))
+        self ._fell_back =True 
+        return self ._take_from_runs (self ._runs_by_size (),n )
+
+    def _rebuild_runs (self )->None :
+        for runs in self ._class_runs :
+            runs .clear ()
+        self ._class_blocks =[0 ]*len (self .size_classes )
+        super ()._rebuild_runs ()
+
+    def _run_added (self ,start :int ,length :int )->None :
+        super ()._run_added (start ,length )
+        c =self .class_of (length )
+        self ._class_runs [c ][start ]=None 
+        self ._class_blocks [c ]+=length 
+
+    def _run_removed (self ,start :int ,length :int )->None :
+        super ()._run_removed (start ,length )
+        c =self .class_of (length )
+        del self ._class_runs [c ][start ]
+        self ._class_blocks [c ]-=length 
@@ -0,0 +1,150 @@
+from __future__ import annotations 
+from array import array 
+from typing import Dict ,List ,Optional ,Sequence 
+
+from .block import zero_payload 
+from .disk import Disk ,EMPTY_LENGTH ,extent_lengths 
+from .extents import physical_runs 
+from .geometry import LatencyModel 
+
+DEFAULT_PAGE_BLOCKS =256 
+
+
+class _Page :
+
+    __slots__ =("lengths","data","live")
+
+    def __init__ (self ,n_blocks :int ,initial_length :int )->None :
+        self .lengths :array =array ("i",[initial_length ])*n_blocks 
+        self .data :Optional [bytearray ]=None 
+        self .live :int =0 if initial_length ==EMPTY_LENGTH else n_blocks 
+
+
+class SparseDisk (Disk ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    block_size :int ,
+    *,
+    prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
+    page_blocks :int =DEFAULT_PAGE_BLOCKS ,
+    )->None :
+
+        if n_blocks <=0 :
+            raise ValueError ("n_blocks debe ser > 0")
+        if block_size <=0 :
+            raise ValueError ("block_size debe ser > 0")
+        if page_blocks <=0 :
+            raise ValueError ("page_blocks debe ser > 0")
+        if prefill is not None and prefill !="zeros":
+            raise ValueError ("prefill inválido. Usa None o 'zeros'.")
+
+        self .n_blocks :int =int (n_blocks )
+        self .block_size :int =int (block_size )
+        self .latency_model =latency_model 
+        self .reset_stats ()
+        self .page_blocks :int =int (page_blocks )
+
+        self ._pages :Dict [int ,_Page ]={}
+        self ._zero_view :memoryview =memoryview (zero_payload (self .block_size ))
+        self ._default_length :int =self .block_size if prefill =="zeros"else EMPTY_LENGTH 
+        self ._used :int =self .n_blocks if prefill =="zeros"else 0 
+
+    def materialized_pages (self )->int :
+
+        return len (self ._pages )
+
+    def resident_bytes (self )->int :
+
+        total =0 
+        for page in self ._pages .values ():
+            total +=page .lengths .itemsize *len (page .lengths )
+            if page .data is not None :
+                total +=len (page .data )
+        return total 
+
+    def trim (self ,indices :Sequence [int ])->None :
+
+        self ._check_indices (indices )
+        for start ,count in physical_runs (sorted (set (indices ))):
+            self .cleared_blocks +=count 
+            self ._store_range (start ,count ,None ,0 )
+
+    def _load (self ,i :int )->bytes |None :
+        page_no ,slot =divmod (i ,self .page_blocks )
+        page =self ._pages .get (page_no )
+        length =self ._default_length if page is None else page .lengths [slot ]
+        if length ==EMPTY_LENGTH :
+            return None 
+        if page is None or page .data is None :
+            return bytes (length )
+        offset =slot *self .block_size 
+        return memoryview (page .data )[offset :offset +length ].tobytes ()
+
+    def _load_view (self ,i :int )->memoryview |None :
+        page_no ,slot =divmod (i ,self .page_blocks )
+        page =self ._pages .get (page_no )
+        length =self ._default_length if page is None else page .lengths [slot ]
+        if length ==EMPTY_LENGTH :
+            return None 
+        if page is None or page .data is None :
+            return self ._zero_view [:length ]
+        offset =slot *self .block_size 
+        return memoryview (page .data )[offset :offset +length ]
+
+    def _store (self ,i :int ,data ,length :int )->None :
+        page_no ,slot =divmod (i ,self .page_blocks )
+        page =self ._materialize (page_no )
+        if length >0 :
+            if page .data is None :
+                page .data =bytearray (self .page_blocks *self .block_size )
+            if isinstance (data ,memoryview )and data .format !="B":
+                data =data .cast ("B")
+            offset =slot *self .block_size 
+            page .data [offset :offset +length ]=data 
+        self ._set_page_length (page ,slot ,length )
+
+    def _clear (self ,i :int )->None :
+        page_no ,slot =divmod (i ,self .page_blocks )
+        if page_no not in self ._pages and self ._default_length ==EMPTY_LENGTH :
+            return 
+        page =self ._materialize (page_no )
+        self ._set_page_length (page ,slot ,EMPTY_LENGTH )
+        if not page .live and self ._default_length ==EMPTY_LENGTH :
+            del self ._pages [page_no ]
+
+    def _load_range (self ,start :int ,count :int ,zero_copy :bool )->List [bytes |memoryview |None ]:
+        load =self ._load_view if zero_copy else self ._load 
+        return [load (i )for i in range (start ,start +count )]
+
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        if data is None :
+            for i in range (start ,start +count ):
+                self ._clear (i )
+            return 
+
+        if isinstance (data ,memoryview )and data .format !="B":
+            data =data .cast ("B")
+        view =memoryview (data )
+        bs =self .block_size 
+        for k ,length in enumerate (extent_lengths (nbytes ,count ,bs )):
+            self ._store (start +k ,view [k *bs :k *bs +length ],length )
+
+    def _materialize (self ,page_no :int )->_Page :
+        page =self ._pages .get (page_no )
+        if page is None :
+            page =_Page (self .page_blocks ,self ._default_length )
+            self ._pages [page_no ]=page 
+        return page 
+
+    def _set_page_length (self ,page :_Page ,slot :int ,length :int )->None :
+        previous =page .lengths [slot ]
+        if previous ==EMPTY_LENGTH and length !=EMPTY_LENGTH :
+            self ._used +=1 
+            page .live +=1 
+        elif previous !=EMPTY_LENGTH and length ==EMPTY_LENGTH :
+            self ._used -=1 
+            page .live -=1 
+        page .lengths [slot ]=length 
@@ -0,0 +1,322 @@
+from __future__ import annotations 
+import heapq 
+import math 
+from array import array 
+from typing import Dict ,List ,Optional ,Sequence ,Tuple 
+
+from .disk import Disk 
+from .extents import physical_runs 
+
+GC_POLICIES =("greedy","cost-benefit")
+
+
+class FlashTranslationLayer :
+
+    def __init__ (
+    self ,
+    logical_pages :int ,
+    *,
+    pages_per_block :int =64 ,
+    overprovision :float =0.07 ,
+    gc_policy :str ="greedy",
+    gc_threshold :int =2 ,
+    wear_leveling :bool =True ,
+    wear_threshold :int =16 ,
+    page_read_us :float =25.0 ,
+    page_program_us :float =200.0 ,
+    block_erase_us :float =1500.0 ,
+    )->None :
+
+        if logical_pages <=0 or pages_per_block <=0 :
+            raise ValueError ("logical_pages y pages_per_block deben ser > 0")
+        if overprovision <0 :
+            raise ValueError ("overprovision debe ser >= 0")
+        if gc_policy not in GC_POLICIES :
+            raise ValueError (f"Política de GC inválida: {gc_policy } (usa {', '.join (GC_POLICIES )})")
+        if gc_threshold <1 :
+            raise ValueError ("gc_threshold debe ser >= 1")
+        if wear_threshold <=0 :
+            raise ValueError ("wear_threshold debe ser > 0")
+
+        self .logical_pages :int =int (logical_pages )
+        self .pages_per_block :int =int (pages_per_block )
+        self .overprovision :float =float (overprovision )
+        self .gc_policy :str =gc_policy 
+        self .gc_threshold :int =int (gc_threshold )
+        self .wear_leveling :bool =bool (wear_leveling )
+        self .wear_threshold :int =int (wear_threshold )
+        self .page_read_ms :float =page_read_us /1000.0 
+        self .page_program_ms :float =page_program_us /1000.0 
+        self .block_erase_ms :float =block_erase_us /1000.0 
+
+        data_blocks =math .ceil (self .logical_pages /self .pages_per_block )
+        self .erase_blocks :int =max (
+        math .ceil (self .logical_pages *(1.0 +self .overprovision )/self .pages_per_block ),
+        data_blocks +self .gc_threshold +2 ,
+        )
+        self .reset ()
+
+    def reset (self )->None :
+
+        ppb =self .pages_per_block 
+        self ._l2p =array ("i",[-1 ])*self .logical_pages 
+        self ._p2l =array ("i",[-1 ])*(self .erase_blocks *ppb )
+        self ._valid =array ("i",[0 ])*self .erase_blocks 
+        self ._erases =array ("i",[0 ])*self .erase_blocks 
+        self ._stamp =array ("q",[0 ])*self .erase_blocks 
+        self ._is_free =bytearray (b"\x01")*self .erase_blocks 
+        self ._free :List [Tuple [int ,int ]]=[(0 ,b )for b in range (self .erase_blocks )]
+        heapq .heapify (self ._free )
+        self ._victims :List [List [Tuple [int ,int ]]]=[[]for _ in range (ppb +1 )]
+        self ._wear :List [Tuple [int ,int ]]=[]
+        self ._max_erases :int =0 
+        self ._seq :int =0 
+        self ._collecting :bool =False 
+        self ._active :int =self ._pop_free ()
+        self ._next_page :int =0 
+
+        self .clock_ms :float =0.0 
+        self .page_reads :int =0 
+        self .host_writes :int =0 
+        self .flash_writes :int =0 
+        self .gc_runs :int =0 
+        self .gc_pages_moved :int =0 
+        self .gc_stalls :int =0 
+        self .gc_stall_ms :float =0.0 
+        self .max_gc_stall_ms :float =0.0 
+        self .erases :int =0 
+        self .wear_migrations :int =0 
+        self .trimmed_pages :int =0 
+
+    def access (self ,start_block :int ,count :int ,block_size :int ,is_write :bool =False )->float :
+
+        t0 =self .clock_ms 
+        if not is_write :
+            self .page_reads +=count 
+            self .clock_ms +=count *self .page_read_ms 
+            return self .clock_ms -t0 
+
+        for lpn in range (start_block ,start_block +count ):
+            self .host_writes +=1 
+            self ._program (lpn )
+        return self .clock_ms -t0 
+
+    def trim (self ,start :int ,count :int )->int :
+
+        trimmed =0 
+        for lpn in range (start ,start +count ):
+            if self ._l2p [lpn ]>=0 :
+                self ._invalidate (lpn )
+                trimmed +=1 
+        self .trimmed_pages +=trimmed 
+        return trimmed 
+
+    def write_amplification (self )->float :
+
+        return self .flash_writes /self .host_writes if self .host_writes else 0.0 
+
+    def erase_counts (self )->List [int ]:
+
+        return self ._erases .tolist ()
+
+    def stats (self )->Dict [str ,float ]:
+
+        wear =self ._erases .tolist ()
+        mean =sum (wear )/len (wear )
+        variance =sum ((w -mean )**2 for w in wear )/len (wear )
+        return {
+        "pages_per_block":self .pages_per_block ,
+        "erase_blocks":self .erase_blocks ,
+        "overprovision":self .overprovision ,
+        "gc_policy":self .gc_policy ,
+        "host_writes":self .host_writes ,
+        "flash_writes":self .flash_writes ,
+        "write_amplification":round (self .write_amplification (),4 ),
+        "gc_runs":self .gc_runs ,
+        "gc_pages_moved":self .gc_pages_moved ,
+        "gc_stalls":self .gc_stalls ,
+        "gc_stall_ms_total":round (self .gc_stall_ms ,3 ),
+        "gc_stall_ms_max":round (self .max_gc_stall_ms ,3 ),
+        "erases":self .erases ,
+        "wear_min":min (wear ),
+        "wear_max":max (wear ),
+        "wear_mean":round (mean ,3 ),
+        "wear_stddev":round (math .sqrt (variance ),3 ),
+        "wear_leveling_migrations":self .wear_migrations ,
+        "trimmed_pages":self .trimmed_pages ,
+        "page_reads":self .page_reads ,
+        "clock_ms":round (self .clock_ms ,3 ),
+        }
+
+    def _program (self ,lpn :int )->None :
+        self ._invalidate (lpn )
+        ppn =self ._next_free_page ()
+        block =ppn //self .pages_per_block 
+        self ._p2l [ppn ]=lpn 
+        self ._l2p [lpn ]=ppn 
+        self ._valid [block ]+=1 
+        self ._stamp [block ]=self ._seq 
+        self ._seq +=1 
+        self .flash_writes +=1 
+        self .clock_ms +=self .page_program_ms 
+
+    def _invalidate (self ,lpn :int )->None :
+        ppn =self ._l2p [lpn ]
+        if ppn <0 :
+            return 
+        self ._p2l [ppn ]=-1 
+        block =ppn //self .pages_per_block 
+        self ._valid [block ]-=1 
+        self ._l2p [lpn ]=-1 
+        if block !=self ._active and not self ._is_free [block ]:
+            self ._push_victim (block )
+
+    def _next_free_page (self )->int :
+        if self ._next_page ==self .pages_per_block :
+            if not self ._collecting and len (self ._free )<=self .gc_threshold :
+                self ._collect ()
+            full ,self ._active =self ._active ,self ._pop_free ()
+            self ._seal (full )
+            self ._next_page =0 
+        ppn =self ._active *self .pages_per_block +self ._next_page 
+        self ._next_page +=1 
+        return ppn 
+
+    def _pop_free (self )->int :
+        if not self ._free :
+            raise RuntimeError ("SSD sin bloques libres: aumenta overprovision o gc_threshold")
+        _ ,block =heapq .heappop (self ._free )
+        self ._is_free [block ]=0 
+        return block 
+
+    def _collect (self )->None :
+        self ._collecting =True 
+        t0 =self .clock_ms 
+        runs =self .gc_runs 
+        while len (self ._free )<=self .gc_threshold :
+            victim =self ._pick_victim ()
+            if victim is None :
+                break 
+            self ._reclaim (victim )
+            self .gc_runs +=1 
+        if self .wear_leveling :
+            self ._level_wear ()
+        self ._collecting =False 
+
+        stall =self .clock_ms -t0 
+        if self .gc_runs ==runs and stall <=0 :
+            return 
+        self .gc_stalls +=1 
+        self .gc_stall_ms +=stall 
+        self .max_gc_stall_ms =max (self .max_gc_stall_ms ,stall )
+
+    def _seal (self ,block :int )->None :
+        self ._push_victim (block )
+        wear =self ._wear 
+        heapq .heappush (wear ,(self ._erases [block ],block ))
+        if len (wear )>2 *self .erase_blocks :
+            wear [:]=[e for e in wear if self ._sealed (e [1 ])and self ._erases [e [1 ]]==e [0 ]]
+            heapq .heapify (wear )
+
+    def _push_victim (self ,block :int )->None :
+        valid =self ._valid [block ]
+        bucket =self ._victims [valid ]
+        heapq .heappush (bucket ,(self ._victim_key (block ),block ))
+        if len (bucket )>2 *self .erase_blocks :
+            bucket [:]=[e for e in bucket if self ._is_victim (e ,valid )]
+            heapq .heapify (bucket )
+
+    def _victim_key (self ,block :int )->int :
+        return block if self .gc_policy =="greedy"else self ._stamp [block ]
+
+    def _is_victim (self ,entry :Tuple [int ,int ],valid :int )->bool :
+        key ,block =entry 
+        return self ._sealed (block )and self ._valid [block ]==valid and self ._victim_key (block )==key 
+
+    def _sealed (self ,block :int )->bool :
+        return not self ._is_free [block ]and block !=self ._active 
+
+    def _oldest_with (self ,valid :int )->Optional [int ]:
+        bucket =self ._victims [valid ]
+        while bucket and not self ._is_victim (bucket [0 ],valid ):
+            heapq .heappop (bucket )
+        return bucket [0 ][1 ]if bucket else None 
+
+    def _pick_victim (self )->Optional [int ]:
+        ppb =self .pages_per_block 
+        if self .gc_policy =="greedy":
+            for valid in range (ppb ):
+                block =self ._oldest_with (valid )
+                if block is not None :
+                    return block 
+            return None 
+        best :Optional [int ]=None 
+        best_score =-1.0 
+        for valid in range (ppb ):
+            block =self ._oldest_with (valid )
+            if block is None :
+                continue 
+            u =valid /ppb 
+            age =self ._seq -self ._stamp [block ]
+            score =(1.0 -u )*(age +1 )/(1.0 +u )
+            if score >best_score or score ==best_score and block <best :
+                best ,best_score =block ,score 
+        return best 
+
+    def _reclaim (self ,block :int )->None :
+        ppb =self .pages_per_block 
+        for ppn in range (block *ppb ,(block +1 )*ppb ):
+            lpn =self ._p2l [ppn ]
+            if lpn >=0 :
+                self .clock_ms +=self .page_read_ms 
+                self .gc_pages_moved +=1 
+                self ._program (lpn )
+        self ._erases [block ]+=1 
+        self ._max_erases =max (self ._max_erases ,self ._erases [block ])
+        self .erases +=1 
+        self .clock_ms +=self .block_erase_ms 
+        self ._is_free [block ]=1 
+        heapq .heappush (self ._free ,(self ._erases [block ],block ))
+
+    def _level_wear (self )->None :
+        wear =self ._wear 
+        while wear and not (self ._sealed (wear [0 ][1 ])and self ._erases [wear [0 ][1 ]]==wear [0 ][0 ]):
+            heapq .heappop (wear )
+        if not wear :
+            return 
+        coldest =wear [0 ][1 ]
+        if self ._max_erases -self ._erases [coldest ]>self .wear_threshold and len (self ._free )>1 :
+            self ._reclaim (coldest )
+            self .wear_migrations +=1 
+
+
+class SSDDisk (Disk ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    block_size :int ,
+    *,
+    prefill :Optional [str ]=None ,
+    **ftl_params ,
+    )->None :
+
+        super ().__init__ (n_blocks ,block_size ,prefill =prefill )
+        self .ftl :FlashTranslationLayer =FlashTranslationLayer (self .n_blocks ,**ftl_params )
+        self .latency_model =self .ftl 
+
+    def trim (self ,indices :Sequence [int ])->None :
+
+        self ._check_indices (indices )
+        for start ,count in physical_runs (sorted (set (indices ))):
+            self .cleared_blocks +=count 
+            self ._store_range (start ,count ,None ,0 )
+
+    def _clear (self ,i :int )->None :
+        self .ftl .trim (i ,1 )
+        super ()._clear (i )
+
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        if data is None :
+            self .ftl .trim (start ,count )
+        super ()._store_range (start ,count ,data ,nbytes )
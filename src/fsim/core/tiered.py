@@ -0,0 +1,384 @@
+from __future__ import annotations 
+import heapq 
+from array import array 
+from typing import Dict ,Iterable ,List ,Optional ,Sequence ,Tuple 
+
+from .disk import Disk ,extent_lengths 
+
+DEFAULT_FAST_BLOCKS =1024 
+DEFAULT_DECAY_INTERVAL =1024 
+DEFAULT_MIGRATION_BUDGET =16 
+DEFAULT_PROMOTE_THRESHOLD =2 
+
+
+class TieredDisk :
+
+    def __init__ (
+    self ,
+    fast :Disk ,
+    slow :Disk ,
+    *,
+    decay_interval :int =DEFAULT_DECAY_INTERVAL ,
+    migration_budget :int =DEFAULT_MIGRATION_BUDGET ,
+    promote_threshold :int =DEFAULT_PROMOTE_THRESHOLD ,
+    )->None :
+
+        if fast .block_size !=slow .block_size :
+            raise ValueError ("Los niveles rápido y lento deben tener el mismo block_size")
+        if decay_interval <=0 :
+            raise ValueError ("decay_interval debe ser > 0")
+        if migration_budget <0 :
+            raise ValueError ("migration_budget debe ser >= 0")
+        if promote_threshold <=0 :
+            raise ValueError ("promote_threshold debe ser > 0")
+
+        self .fast :Disk =fast 
+        self .slow :Disk =slow 
+        self .n_blocks :int =slow .n_blocks 
+        self .block_size :int =slow .block_size 
+        self .decay_interval :int =int (decay_interval )
+        self .migration_budget :int =int (migration_budget )
+        self .promote_threshold :int =int (promote_threshold )
+
+        self ._heat =array ("i",[0 ])*self .n_blocks 
+        self ._stamp =array ("i",[0 ])*self .n_blocks 
+        self ._accesses :int =0 
+        self ._present =bytearray (self .n_blocks )
+        self ._used :int =0 
+        self ._slot_of :Dict [int ,int ]={}
+        self ._block_of =array ("i",[-1 ])*fast .n_blocks 
+        self ._dirty =bytearray (fast .n_blocks )
+        self ._free_slots :List [int ]=list (range (fast .n_blocks -1 ,-1 ,-1 ))
+        self ._candidates :Dict [int ,None ]={}
+        self ._warm :Dict [int ,None ]={}
+
+        self .tier_hits :int =0 
+        self .tier_misses :int =0 
+        self .promotions :int =0 
+        self .demotions :int =0 
+        self .writebacks :int =0 
+        self .migration_reads :int =0 
+        self .migration_writes :int =0 
+        self .migration_rounds :int =0 
+        self .migration_ms :float =0.0 
+
+    def read_block (self ,i :int )->bytes |None :
+
+        self ._check_range (i ,1 )
+        self ._touch (i )
+        slot =self ._slot_of .get (i )
+        if slot is None :
+            self .tier_misses +=1 
+            return self .slow .read_block (i )
+        self .tier_hits +=1 
+        return self .fast .read_block (slot )
+
+    def write_block (self ,i :int ,data :bytes |None )->None :
+
+        self ._check_range (i ,1 )
+        if data is None :
+            self ._release (i )
+            self .slow .write_block (i ,None )
+            return 
+        if len (data )>self .block_size :
+            raise ValueError (f"Tamaño de data ({len (data )}) excede block_size ({self .block_size })")
+        self ._touch (i )
+        self ._track (i ,data )
+        slot =self ._slot_of .get (i )
+        if slot is None :
+            self .tier_misses +=1 
+            self .slow .write_block (i ,data )
+            return 
+        self .tier_hits +=1 
+        self ._dirty [slot ]=1 
+        self .fast .write_block (slot ,data )
+
+    def clear_block (self ,i :int )->None :
+
+        self .write_block (i ,None )
+
+    def fill_block_zeros (self ,i :int )->None :
+
+        self .write_block (i ,bytes (self .block_size ))
+
+    def read_blocks (self ,indices :Sequence [int ],*,zero_copy :bool =False )->List [bytes |None ]:
+
+        return [self .read_block (i )for i in indices ]
+
+    def write_blocks (self ,indices :Sequence [int ],payloads :Iterable [Optional [bytes ]])->None :
+
+        payloads_list =[None if p is None else bytes (p )for p in payloads ]
+        if len (indices )!=len (payloads_list ):
+            raise ValueError ("indices y payloads deben tener la misma longitud")
+        for i ,p in zip (indices ,payloads_list ):
+            self .write_block (i ,p )
+
+    def read_range (self ,start :int ,count :int ,*,zero_copy :bool =False )->List [bytes |None ]:
+
+        self ._check_range (start ,count )
+        payloads :List [bytes |None ]=[]
+        for seg_start ,seg_count ,resident in self ._segments (start ,count ):
+            for i in range (seg_start ,seg_start +seg_count ):
+                self ._touch (i )
+            if resident :
+                self .tier_hits +=seg_count 
+                payloads .extend (self .fast .read_block (self ._slot_of [i ])for i in range (seg_start ,seg_start +seg_count ))
+            else :
+                self .tier_misses +=seg_count 
+                payloads .extend (self .slow .read_range (seg_start ,seg_count ))
+        return payloads 
+
+    def write_range (self ,start :int ,payload_buffer :bytes |None ,count :Optional [int ]=None )->None :
+
+        bs =self .block_size 
+        if payload_buffer is None :
+            if count is None :
+                raise ValueError ("count es obligatorio para limpiar un rango")
+            self ._check_range (start ,count )
+            for i in range (start ,start +count ):
+                self ._release (i )
+            self .slow .write_range (start ,None ,count )
+            return 
+
+        view =memoryview (payload_buffer ).cast ("B")
+        if count is None :
+            count =max (1 ,-(-view .nbytes //bs ))
+        if view .nbytes >count *bs :
+            raise ValueError (f"payload_buffer ({view .nbytes } B) excede el rango de {count } bloques ({count *bs } B)")
+        payloads =[view [k *bs :k *bs +length ].tobytes ()for k ,length in enumerate (extent_lengths (view .nbytes ,count ,bs ))]
+        self ._check_range (start ,count )
+
+        for seg_start ,seg_count ,resident in self ._segments (start ,count ):
+            chunk =payloads [seg_start -start :seg_start -start +seg_count ]
+            if resident :
+                for i ,data in zip (range (seg_start ,seg_start +seg_count ),chunk ):
+                    self .write_block (i ,data )
+                continue 
+            for i ,data in zip (range (seg_start ,seg_start +seg_count ),chunk ):
+                self ._touch (i )
+                self ._track (i ,data )
+            self .tier_misses +=seg_count 
+            self .slow .write_blocks (list (range (seg_start ,seg_start +seg_count )),chunk )
+
+    def trim (self ,indices :Sequence [int ])->None :
+
+        for i in indices :
+            self ._check_range (i ,1 )
+        for i in indices :
+            self ._release (i )
+        trim =getattr (self .slow ,"trim",None )
+        if trim is not None :
+            trim (indices )
+        else :
+            for i in indices :
+                self .slow .write_block (i ,None )
+
+    def used_blocks_count (self )->int :
+
+        return self ._used 
+
+    def empty_blocks_count (self )->int :
+
+        return self .n_blocks -self ._used 
+
+    def is_block_used (self ,i :int )->bool :
+
+        return bool (self ._present [i ])
+
+    def __len__ (self )->int :
+
+        return self .n_blocks 
+
+    def hotness (self ,i :int )->int :
+
+        age =self ._accesses //self .decay_interval -self ._stamp [i ]
+        return self ._heat [i ]>>min (age ,31 )
+
+    def is_fast (self ,i :int )->bool :
+
+        return i in self ._slot_of 
+
+    def migrate (self )->int :
+
+        if not self ._candidates :
+            return 0 
+        t0 =self ._clock ()
+        ranked =sorted (self ._candidates ,key =lambda b :(-self .hotness (b ),b ))
+        self ._candidates .clear ()
+        budget =self .migration_budget 
+        moved =0 
+        coldest :Optional [List [Tuple [int ,int ]]]=None 
+
+        for block in ranked :
+            if budget <=0 :
+                break 
+            heat =self .hotness (block )
+            if heat <self .promote_threshold :
+                break 
+            if block in self ._slot_of or not self ._present [block ]:
+                continue 
+            if not self ._free_slots :
+                if coldest is None :
+                    coldest =[(self .hotness (b ),b )for b in self ._slot_of ]
+                    heapq .heapify (coldest )
+                victim_heat ,victim =coldest [0 ]
+                if victim_heat >=heat :
+                    break 
+                if self ._dirty [self ._slot_of [victim ]]and budget <2 :
+                    break 
+                heapq .heappop (coldest )
+                if self ._demote (victim ):
+                    budget -=1 
+                    moved +=1 
+            self ._promote (block )
+            if coldest is not None :
+                heapq .heappush (coldest ,(heat ,block ))
+            budget -=1 
+            moved +=1 
+
+        if moved :
+            self .migration_rounds +=1 
+        self .migration_ms +=self ._clock ()-t0 
+        return moved 
+
+    def flush (self )->None :
+
+        for slot ,block in enumerate (self ._block_of ):
+            if block >=0 and self ._dirty [slot ]:
+                self .slow .write_block (block ,self .fast .read_block (slot ))
+                self ._dirty [slot ]=0 
+                self .writebacks +=1 
+                self .migration_reads +=1 
+                self .migration_writes +=1 
+
+    def close (self )->None :
+
+        self .flush ()
+        for tier in (self .fast ,self .slow ):
+            close =getattr (tier ,"close",None )
+            if close is not None :
+                close ()
+
+    def tier_stats (self )->Dict [str ,float ]:
+
+        accesses =self .tier_hits +self .tier_misses 
+        for b in [b for b in self ._warm if not self ._present [b ]or self .hotness (b )<self .promote_threshold ]:
+            del self ._warm [b ]
+        hot =self ._warm 
+        hot_fast =sum (1 for b in hot if b in self ._slot_of )
+        return {
+        "fast_blocks":self .fast .n_blocks ,
+        "fast_resident":len (self ._slot_of ),
+        "tier_hits":self .tier_hits ,
+        "tier_misses":self .tier_misses ,
+        "tier_hit_ratio":round (self .tier_hits /accesses ,4 )if accesses else 0.0 ,
+        "promotions":self .promotions ,
+        "demotions":self .demotions ,
+        "dirty_writebacks":self .writebacks ,
+        "migration_reads":self .migration_reads ,
+        "migration_writes":self .migration_writes ,
+        "migration_bytes":(self .migration_reads +self .migration_writes )*self .block_size ,
+        "migration_rounds":self .migration_rounds ,
+        "migration_ms":round (self .migration_ms ,3 ),
+        "hot_blocks":len (hot ),
+        "hot_blocks_in_fast_pct":round (hot_fast /len (hot )*100.0 ,2 )if hot else 0.0 ,
+        }
+
+    def _touch (self ,i :int )->None :
+        epoch =self ._accesses //self .decay_interval 
+        self ._heat [i ]=min (self .hotness (i )+1 ,1 <<30 )
+        self ._stamp [i ]=epoch 
+        self ._accesses +=1 
+        if self ._heat [i ]>=self .promote_threshold :
+            self ._warm [i ]=None 
+        if i not in self ._slot_of :
+            self ._candidates [i ]=None 
+
+    def _track (self ,i :int ,data :bytes |None )->None :
+        present =data is not None 
+        if present !=bool (self ._present [i ]):
+            self ._present [i ]=present 
+            self ._used +=1 if present else -1 
+
+    def _release (self ,i :int )->None :
+        self ._track (i ,None )
+        self ._heat [i ]=0 
+        self ._candidates .pop (i ,None )
+        self ._warm .pop (i ,None )
+        if i in self ._slot_of :
+            self ._demote (i ,discard =True )
+
+    def _promote (self ,block :int )->None :
+        slot =self ._free_slots .pop ()
+        data =self .slow .read_block (block )
+        self .fast .write_block (slot ,data )
+        self ._slot_of [block ]=slot 
+        self ._block_of [slot ]=block 
+        self ._dirty [slot ]=0 
+        self .promotions +=1 
+        self .migration_reads +=1 
+        self .migration_writes +=1 
+
+    def _demote (self ,block :int ,discard :bool =False )->bool :
+        slot =self ._slot_of .pop (block )
+        dirty =bool (self ._dirty [slot ])and not discard 
+        if dirty :
+            self .slow .write_block (block ,self .fast .read_block (slot ))
+            self .writebacks +=1 
+            self .migration_reads +=1 
+            self .migration_writes +=1 
+        self .fast .write_block (slot ,None )
+        self ._block_of [slot ]=-1 
+        self ._dirty [slot ]=0 
+        self ._free_slots .append (slot )
+        self .demotions +=1 
+        return dirty 
+
+    def _segments (self ,start :int ,count :int )->List [Tuple [int ,int ,bool ]]:
+        segments :List [Tuple [int ,int ,bool ]]=[]
+        for i in range (start ,start +count ):
+            resident =i in self ._slot_of 
+            if segments and segments [-1 ][2 ]==resident :
+                seg_start ,seg_count ,_ =segments [-1 ]
+                segments [-1 ]=(seg_start ,seg_count +1 ,resident )
+            else :
+                segments .append ((i ,1 ,resident ))
+        return segments 
+
+    def _clock (self )->float :
+        return sum (d .latency_model .clock_ms for d in (self .fast ,self .slow )if d .latency_model is not None )
+
+    def _check_range (self ,start :int ,count :int )->None :
+        if not isinstance (start ,int )or not isinstance (count ,int ):
+            raise TypeError ("start y count deben ser int")
+        if count <=0 :
+            raise ValueError ("count debe ser > 0")
+        if start <0 or start +count >self .n_blocks :
+            raise IndexError (f"Rango fuera de límites: [{start }, {start +count }) (0..{self .n_blocks })")
+
+
+class TierClock :
+
+    def __init__ (self ,disk :TieredDisk )->None :
+
+        self .disk =disk 
+
+    @property 
+    def clock_ms (self )->float :
+
+        return self .disk ._clock ()-self .disk .migration_ms 
+
+    def stats (self )->Dict [str ,float ]:
+
+        return {
+        "clock_ms":round (self .clock_ms ,3 ),
+        "fast":self .disk .fast .latency_model .stats ()if self .disk .fast .latency_model is not None else {},
+        "slow":self .disk .slow .latency_model .stats ()if self .disk .slow .latency_model is not None else {},
+        }
+
+    def reset (self )->None :
+
+        for d in (self .disk .fast ,self .disk .slow ):
+            if d .latency_model is not None :
+                d .latency_model .reset ()
+        self .disk .migration_ms =0.0 
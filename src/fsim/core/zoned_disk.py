@@ -0,0 +1,181 @@
+from __future__ import annotations 
+from array import array 
+from typing import Dict ,List ,Optional ,Sequence 
+
+from .disk import Disk ,EMPTY_LENGTH 
+from .extents import physical_runs 
+from .geometry import LatencyModel 
+
+ZONE_VIOLATION_MODES =("rewrite","count")
+DEFAULT_ZONE_BLOCKS =256 
+
+
+class ZonedDisk (Disk ):
+
+    def __init__ (
+    self ,
+    n_blocks :int ,
+    block_size :int ,
+    *,
+    zone_blocks :int =DEFAULT_ZONE_BLOCKS ,
+    on_violation :str ="rewrite",
+    seq_mb_s :float =200.0 ,
+    prefill :Optional [str ]=None ,
+    latency_model :Optional [LatencyModel ]=None ,
+    )->None :
+
+        if zone_blocks <=0 :
+            raise ValueError ("zone_blocks debe ser > 0")
+        if on_violation not in ZONE_VIOLATION_MODES :
+            raise ValueError (f"on_violation inválido: {on_violation } (usa {', '.join (ZONE_VIOLATION_MODES )})")
+        if seq_mb_s <=0 :
+            raise ValueError ("seq_mb_s debe ser > 0")
+
+        super ().__init__ (n_blocks ,block_size ,prefill =prefill ,latency_model =latency_model )
+        self .zone_blocks :int =int (zone_blocks )
+        self .on_violation :str =on_violation 
+        self .seq_mb_s :float =float (seq_mb_s )
+        self .n_zones :int =-(-self .n_blocks //self .zone_blocks )
+
+        initial =[self ._zone_size (z )if prefill =="zeros"else 0 for z in range (self .n_zones )]
+        self ._wp :array =array ("i",initial )
+
+        self .host_blocks_written :int =0 
+        self .device_blocks_written :int =0 
+        self .violations :int =0 
+        self .zone_resets :int =0 
+        self .rewrite_resets :int =0 
+        self .relocated_blocks :int =0 
+        self .padded_blocks :int =0 
+
+    def zone_of (self ,i :int )->int :
+
+        return i //self .zone_blocks 
+
+    def write_pointer (self ,zone :int )->int :
+
+        return zone *self .zone_blocks +self ._wp [zone ]
+
+    def reset_zone (self ,zone :int )->None :
+
+        if zone <0 or zone >=self .n_zones :
+            raise IndexError (f"Zona fuera de rango: {zone } (0..{self .n_zones -1 })")
+        start =zone *self .zone_blocks 
+        Disk ._store_range (self ,start ,self ._zone_size (zone ),None ,0 )
+        if self ._wp [zone ]:
+            self ._wp [zone ]=0 
+            self .zone_resets +=1 
+
+    def trim (self ,indices :Sequence [int ])->None :
+
+        self ._check_indices (indices )
+        for start ,count in physical_runs (sorted (set (indices ))):
+            self ._store_range (start ,count ,None ,0 )
+
+    def zone_report (self )->List [Dict [str ,int ]]:
+
+        report :List [Dict [str ,int ]]=[]
+        for z in range (self .n_zones ):
+            start =z *self .zone_blocks 
+            size =self ._zone_size (z )
+            live =size -self ._lengths [start :start +size ].count (EMPTY_LENGTH )
+            report .append ({"zone":z ,"write_pointer":self ._wp [z ],"live_blocks":live ,"size":size })
+        return report 
+
+    def zone_stats (self )->Dict [str ,float ]:
+
+        full =sum (1 for z in range (self .n_zones )if self ._wp [z ]==self ._zone_size (z ))
+        empty =self ._wp .tolist ().count (0 )
+        efficiency =self .host_blocks_written /self .device_blocks_written if self .device_blocks_written else 1.0 
+        return {
+        "zones":self .n_zones ,
+        "zone_blocks":self .zone_blocks ,
+        "on_violation":self .on_violation ,
+        "host_blocks_written":self .host_blocks_written ,
+        "device_blocks_written":self .device_blocks_written ,
+        "write_amplification":round (1.0 /efficiency ,4 )if efficiency else 0.0 ,
+        "violations":self .violations ,
+        "zone_resets":self .zone_resets ,
+        "rewrite_resets":self .rewrite_resets ,
+        "relocated_blocks":self .relocated_blocks ,
+        "padded_blocks":self .padded_blocks ,
+        "empty_zones":empty ,
+        "open_zones":self .n_zones -empty -full ,
+        "full_zones":full ,
+        "effective_throughput_pct":round (efficiency *100.0 ,2 ),
+        "effective_throughput_mb_s":round (self .seq_mb_s *efficiency ,2 ),
+        }
+
+    def _store (self ,i :int ,data ,length :int )->None :
+        self ._advance (i ,1 )
+        super ()._store (i ,data ,length )
+
+    def _clear (self ,i :int )->None :
+        super ()._clear (i )
+        self ._release (i ,1 )
+
+    def _store_range (self ,start :int ,count :int ,data ,nbytes :int )->None :
+        if data is None :
+            super ()._store_range (start ,count ,data ,nbytes )
+            self ._release (start ,count )
+            return 
+
+        pos ,end =start ,start +count 
+        while pos <end :
+            seg_end =min (end ,(pos //self .zone_blocks +1 )*self .zone_blocks )
+            self ._advance (pos ,seg_end -pos )
+            pos =seg_end 
+        super ()._store_range (start ,count ,data ,nbytes )
+
+    def _advance (self ,start :int ,count :int )->None :
+        zone =start //self .zone_blocks 
+        zone_start =zone *self .zone_blocks 
+        wp =zone_start +self ._wp [zone ]
+        self .host_blocks_written +=count 
+        self .device_blocks_written +=count 
+        if start ==wp :
+            self ._wp [zone ]+=count 
+            return 
+
+        self .violations +=1 
+        if self .on_violation =="count":
+            self ._wp [zone ]=max (self ._wp [zone ],start +count -zone_start )
+            return 
+
+        if start >wp :
+            pad =start -wp 
+            self .padded_blocks +=pad 
+            self .device_blocks_written +=pad 
+            self ._charge (wp ,pad ,True )
+            self ._wp [zone ]=start +count -zone_start 
+            return 
+
+        end =max (wp ,start +count )
+        live =[
+        zone_start +k 
+        for k ,length in enumerate (self ._lengths [zone_start :end ])
+        if length !=EMPTY_LENGTH and not start <=zone_start +k <start +count 
+        ]
+        if live :
+            self ._charge_runs (live ,False )
+            self ._charge_runs (live ,True )
+        self .relocated_blocks +=len (live )
+        self .device_blocks_written +=len (live )
+        self .zone_resets +=1 
+        self .rewrite_resets +=1 
+        self ._wp [zone ]=end -zone_start 
+
+    def _release (self ,start :int ,count :int )->None :
+        first =start //self .zone_blocks 
+        last =(start +count -1 )//self .zone_blocks 
+        for zone in range (first ,last +1 ):
+            wp =self ._wp [zone ]
+            if not wp :
+                continue 
+            zone_start =zone *self .zone_blocks 
+            if self ._lengths [zone_start :zone_start +wp ].count (EMPTY_LENGTH )==wp :
+                self ._wp [zone ]=0 
+                self .zone_resets +=1 
+
+    def _zone_size (self ,zone :int )->int :
+        return min (self .zone_blocks ,self .n_blocks -zone *self .zone_blocks )
@@ -33,8 +33,11 @@ class ContiguousFS (FilesystemBase ):
         }
 
 
-        for i in indices :
-            self .disk .write_block (i ,None )
+        if self ._range_io :
+            self .disk .write_range (start ,None ,size_blocks )
+        else :
+            for i in indices :
+                self .disk .write_block (i ,None )
 
         self ._emit (
         "create:done",
@@ -57,10 +60,12 @@ class ContiguousFS (FilesystemBase ):
         indices =list (range (start ,start +length ))
 
 
+        self ._trim (indices )
         self .fsm .free (indices )
 
 
         del self .file_table [name ]
+        self ._forget (name )
 
         self ._emit ("delete:done",strategy ="contiguous",name =name ,released =indices )
 
@@ -84,7 +89,8 @@ class ContiguousFS (FilesystemBase ):
         )
 
 
-        data =[self .disk .read_block (i )or b""for i in phys ]
+        data =self ._read_payloads (phys )
+        self ._read_ahead (name ,offset ,n_blocks ,access_mode ,phys )
 
         self ._emit (
         "read:done",
@@ -124,7 +130,7 @@ class ContiguousFS (FilesystemBase ):
                 raise ValueError ("La cantidad de datos no coincide con n_blocks")
 
 
-        self .disk .write_blocks (phys ,payloads )
+        self ._write_payloads (phys ,payloads )
 
         self ._emit (
         "write:done",
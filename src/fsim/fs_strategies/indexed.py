@@ -21,8 +21,18 @@ class IndexedFS (FilesystemBase ):
     free_space_manager :FreeSpaceManagerLike ,
     *,
     on_event :Optional [Callable [...,None ]]=None ,
+    zero_copy_reads :bool =False ,
+    readahead :Optional [Any ]=None ,
+    goal_allocation :bool =False ,
     )->None :
-        super ().__init__ (disk ,free_space_manager ,on_event =on_event )
+        super ().__init__ (
+        disk ,
+        free_space_manager ,
+        on_event =on_event ,
+        zero_copy_reads =zero_copy_reads ,
+        readahead =readahead ,
+        goal_allocation =goal_allocation ,
+        )
 
         self ._max_file_blocks =self .disk .block_size //POINTER_SIZE_BYTES 
 
@@ -31,7 +41,7 @@ class IndexedFS (FilesystemBase ):
 
 
     def _read_index_block (self ,index_block_idx :int ,size_blocks :int )->List [int ]:
-        data =self .disk .read_block (index_block_idx )
+        data =self ._peek_block (index_block_idx )
         if data is None :
             raise IOError (f"Corrupción: Bloque índice {index_block_idx } está vacío")
 
@@ -40,7 +50,7 @@ class IndexedFS (FilesystemBase ):
 
         try :
 
-            pointers =struct .unpack (format_string ,data [:size_blocks *POINTER_SIZE_BYTES ])
+            pointers =struct .unpack_from (format_string ,data )
             return list (pointers )
         except struct .error :
             raise IOError (f"Corrupción: No se pudo decodificar el bloque índice {index_block_idx }")
@@ -83,7 +93,7 @@ class IndexedFS (FilesystemBase ):
 
         total_blocks_needed =size_blocks +1 
         try :
-            allocated_indices =self .fsm .allocate (total_blocks_needed ,contiguous =False )
+            allocated_indices =self ._allocate_clustered (total_blocks_needed )
         except MemoryError :
             raise MemoryError (f"No hay espacio suficiente para {total_blocks_needed } bloques")
 
@@ -137,8 +147,10 @@ class IndexedFS (FilesystemBase ):
 
 
         del self .file_table [name ]
+        self ._forget (name )
 
 
+        self ._trim (blocks_to_free )
         try :
             self .fsm .free (blocks_to_free )
         except (ValueError ,IndexError )as e :
@@ -178,11 +190,8 @@ class IndexedFS (FilesystemBase ):
         )
 
 
-        payloads =[]
-        for block_idx in physical_indices :
-            data =self .disk .read_block (block_idx )
-
-            payloads .append (b""if data is None else data )
+        payloads =self ._read_payloads (physical_indices )
+        self ._read_ahead (name ,offset ,n_blocks ,access_mode ,physical_indices )
 
         self ._emit ("read:done",strategy ="indexed",name =name )
         return payloads 
@@ -215,11 +224,6 @@ class IndexedFS (FilesystemBase ):
         )
 
 
-        for i in range (n_blocks ):
-            block_idx =physical_indices [i ]
-            payload =data_list [i ]
-
-
-            self .disk .write_block (block_idx ,payload )
+        self ._write_payloads (physical_indices ,data_list )
 
         self ._emit ("write:done",strategy ="indexed",name =name )
\ No newline at end of file
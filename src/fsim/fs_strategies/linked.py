@@ -24,9 +24,19 @@ class LinkedFS (FilesystemBase ):
     free_space_manager :FreeSpaceManagerLike ,
     *,
     on_event :Optional [Callable [...,None ]]=None ,
+    zero_copy_reads :bool =False ,
+    readahead :Optional [Any ]=None ,
+    goal_allocation :bool =False ,
     )->None :
 
-        super ().__init__ (disk ,free_space_manager ,on_event =on_event )
+        super ().__init__ (
+        disk ,
+        free_space_manager ,
+        on_event =on_event ,
+        zero_copy_reads =zero_copy_reads ,
+        readahead =readahead ,
+        goal_allocation =goal_allocation ,
+        )
 
 
         if self .disk .block_size <=POINTER_SIZE_BYTES :
@@ -35,13 +45,17 @@ class LinkedFS (FilesystemBase ):
             f"mayor que el tamaño del puntero ({POINTER_SIZE_BYTES }B)"
             )
 
+    @property 
+    def payload_size (self )->int :
+        return self .disk .block_size -POINTER_SIZE_BYTES 
+
 
 
 
 
     def _read_pointer (self ,block_index :int )->int :
 
-        data =self .disk .read_block (block_index )
+        data =self ._peek_block (block_index )
         if data is None or len (data )<POINTER_SIZE_BYTES :
 
 
@@ -51,7 +65,7 @@ class LinkedFS (FilesystemBase ):
             )
 
 
-        (next_block_index ,)=struct .unpack (POINTER_FORMAT ,data [:POINTER_SIZE_BYTES ])
+        (next_block_index ,)=struct .unpack_from (POINTER_FORMAT ,data )
         return int (next_block_index )
 
     def _write_pointer (self ,block_index :int ,next_block_index :int )->None :
@@ -107,7 +121,7 @@ class LinkedFS (FilesystemBase ):
 
 
 
-        allocated_indices =self .fsm .allocate (size_blocks ,contiguous =False )
+        allocated_indices =self ._allocate_clustered (size_blocks )
 
 
         self .file_table [name ]={
@@ -161,9 +175,11 @@ class LinkedFS (FilesystemBase ):
 
 
         del self .file_table [name ]
+        self ._forget (name )
 
 
         if blocks_to_free :
+            self ._trim (blocks_to_free )
             try :
                 self .fsm .free (blocks_to_free )
             except (ValueError ,IndexError )as e :
@@ -233,21 +249,24 @@ class LinkedFS (FilesystemBase ):
         )
 
 
-        payloads =[]
-        for block_idx in physical_indices :
-            full_data =self .disk .read_block (block_idx )
-
-            if full_data is None :
-
-
-                payloads .append (b"")
-            else :
-
-                user_data =full_data [POINTER_SIZE_BYTES :]
-                payloads .append (user_data )
-
+        payloads =self ._read_payloads (physical_indices ,skip =POINTER_SIZE_BYTES )
+        self ._read_ahead (name ,offset ,n_blocks ,access_mode ,physical_indices )
         return payloads 
 
+    def _prefetch_targets (self ,name :str ,start :int ,count :int ,physical :List [int ],lead :int )->List [int ]:
+        targets :List [int ]=[]
+        current =physical [-1 ]
+        for step in range (lead +count ):
+            data =self .readahead .fetch (current )
+            if data is None or len (data )<POINTER_SIZE_BYTES :
+                break 
+            (current ,)=struct .unpack_from (POINTER_FORMAT ,data )
+            if current ==END_OF_FILE_MARKER :
+                break 
+            if step >=lead :
+                targets .append (current )
+        return targets 
+
     def write (
     self ,
     name :str ,
@@ -78,7 +78,7 @@ def full_metrics_summary (results :List [Dict [str ,Any ]])->Dict [str ,float ]:
     if len (access_times )>1 :
         fairness_index =statistics .pstdev (access_times )/(sum (access_times )/len (access_times ))*100 
 
-    return {
+    summary ={
     "avg_access_time_ms":round (avg_access_time ,3 ),
     "space_usage_pct":round (avg_usage ,2 ),
     "fragmentation_internal_pct":round (avg_internal_frag ,2 ),
@@ -88,6 +88,22 @@ def full_metrics_summary (results :List [Dict [str ,Any ]])->Dict [str ,float ]:
     "cpu_usage_pct":round (cpu_usage_pct ,2 ),
     "fairness_index":round (fairness_index ,2 ),
     }
+    summary .update (simulated_time_summary (results ))
+    return summary 
+
+
+def simulated_time_summary (results :List [Dict [str ,Any ]])->Dict [str ,float ]:
+
+    sim_ops =[r ["sim_service_ms"]for r in results if "sim_service_ms"in r and r .get ("operation")!="TOTAL"]
+    if not sim_ops :
+        return {}
+    total_ms =sum (sim_ops )
+    return {
+    "sim_avg_latency_ms":round (total_ms /len (sim_ops ),4 ),
+    "sim_max_latency_ms":round (max (sim_ops ),4 ),
+    "sim_total_time_ms":round (total_ms ,3 ),
+    "sim_throughput_ops_per_sec":round (len (sim_ops )/(total_ms /1000.0 ),3 )if total_ms >0 else 0.0 ,
+    }
 
 
 
@@ -108,7 +124,7 @@ class Metrics :
         free_blocks =self .fsm .free_count ()
 
         external_frag =self .fsm .external_fragmentation_ratio ()*100 
-        internal_frag =0.0 
+        internal_frag =self .fsm .internal_fragmentation_ratio ()*100 
 
         elapsed =time .perf_counter ()-self .start_time 
         cpu_time =time .process_time ()-self .start_cpu 
@@ -5,7 +5,22 @@ from pathlib import Path
 from typing import Dict ,Any ,List ,Callable ,Optional ,Tuple 
 
 from ..core .disk import Disk 
-from ..core .free_space import FreeSpaceManager 
+from ..core .mapped_disk import MappedDisk 
+from ..core .sparse_disk import SparseDisk ,DEFAULT_PAGE_BLOCKS 
+from ..core .metadata_disk import MetadataDisk 
+from ..core .dedup_disk import DedupDisk 
+from ..core .ssd import SSDDisk 
+from ..core .zoned_disk import ZonedDisk 
+from ..core .raid import RaidVolume ,ArrayClock ,DEFAULT_STRIPE_BLOCKS 
+from ..core .tiered import TieredDisk ,TierClock ,DEFAULT_FAST_BLOCKS 
+from ..core .free_space import BitmapView ,FreeSpaceManager 
+from ..core .extent_free_space import ExtentFreeSpaceManager 
+from ..core .buddy_free_space import BuddyFreeSpaceManager 
+from ..core .segregated_free_space import DEFAULT_SIZE_CLASSES ,SegregatedFreeSpaceManager 
+from ..core .geometry import HDDGeometry ,HDDModel ,LatencyModel 
+from ..core .scheduler import IOScheduler ,DEFAULT_QUEUE_DEPTH 
+from ..core .cache import BufferCache ,DEFAULT_CACHE_BLOCKS 
+from ..core .readahead import ReadAhead 
 from ..fs_strategies .contiguous import ContiguousFS 
 from ..fs_strategies .linked import LinkedFS 
 from ..fs_strategies .indexed import IndexedFS 
@@ -51,6 +66,96 @@ def _make_event_handler (collector :Dict [str ,Any ])->Callable [...,None ]:
     return on_event 
 
 
+def _make_disk (cfg :Dict [str ,Any ],strategy :str ,scenario :str |None ,disk_size :int ,block_size :int )->Disk :
+    backend =cfg .get ("disk_backend","memory")
+    if backend =="memory":
+        return Disk (n_blocks =disk_size ,block_size =block_size ,prefill =None )
+    if backend =="mmap":
+        image_dir =Path (cfg .get ("disk_image_dir","results/disk_images"))
+        image_path =image_dir /f"{scenario or 'custom'}_{strategy }.img"
+        return MappedDisk (image_path ,disk_size ,block_size )
+    if backend =="sparse":
+        return SparseDisk (disk_size ,block_size ,page_blocks =int (cfg .get ("sparse_page_blocks",DEFAULT_PAGE_BLOCKS )))
+    if backend =="metadata":
+        return MetadataDisk (disk_size ,block_size )
+    if backend =="dedup":
+        return DedupDisk (disk_size ,block_size )
+    if backend =="ssd":
+        return SSDDisk (disk_size ,block_size ,**cfg .get ("ssd",{}))
+    if backend =="zoned":
+        return ZonedDisk (disk_size ,block_size ,**cfg .get ("zoned",{}))
+    raise ValueError (f"disk_backend inválido: {backend }")
+
+
+def _make_latency_model (cfg :Dict [str ,Any ],disk :Disk )->Optional [LatencyModel ]:
+    if isinstance (disk ,SSDDisk ):
+        if cfg .get ("io_scheduler")or cfg .get ("hdd_geometry"):
+            raise ValueError ("io_scheduler y hdd_geometry no aplican al backend 'ssd'")
+        return disk .ftl 
+    params =cfg .get ("hdd_geometry")
+    if not params and not cfg .get ("io_scheduler"):
+        return None 
+    if not params :
+        params ={}
+    if params is True :
+        params ={}
+    return HDDModel (HDDGeometry .for_disk (disk .n_blocks ,disk .block_size ,**params ))
+
+
+def _make_raid (cfg :Dict [str ,Any ],strategy :str ,scenario :str |None ,disk_size :int ,block_size :int )->Tuple [RaidVolume ,Optional [ArrayClock ]]:
+    params =cfg ["raid"]if isinstance (cfg ["raid"],dict )else {}
+    if cfg .get ("io_scheduler"):
+        raise ValueError ("io_scheduler no aplica a un volumen 'raid'")
+    level =int (params .get ("level",0 ))
+    n_members =int (params .get ("members",4 ))
+    stripe_blocks =int (params .get ("stripe_blocks",DEFAULT_STRIPE_BLOCKS ))
+    member_blocks =RaidVolume .member_blocks_for (level ,n_members ,disk_size ,stripe_blocks )
+    members =[_make_disk (cfg ,f"{strategy }_m{k }",scenario ,member_blocks ,block_size )for k in range (n_members )]
+    models =[_make_latency_model (cfg ,m )for m in members ]
+    for m ,model in zip (members ,models ):
+        if model is not None :
+            m .latency_model =model 
+    volume =RaidVolume (members ,level =level ,stripe_blocks =stripe_blocks ,n_blocks =disk_size )
+    if all (model is not None for model in models ):
+        return volume ,ArrayClock (models )
+    return volume ,None 
+
+
+def _make_tiered (cfg :Dict [str ,Any ],strategy :str ,scenario :str |None ,disk_size :int ,block_size :int )->Tuple [TieredDisk ,TierClock ]:
+    params =dict (cfg ["tiered"])if isinstance (cfg ["tiered"],dict )else {}
+    if cfg .get ("io_scheduler")or cfg .get ("raid"):
+        raise ValueError ("io_scheduler y raid no aplican a un disco 'tiered'")
+    fast_blocks =int (params .pop ("fast_blocks",DEFAULT_FAST_BLOCKS ))
+    fast =SSDDisk (fast_blocks ,block_size ,**params .pop ("ssd",{}))
+    slow =_make_disk (cfg ,strategy ,scenario ,disk_size ,block_size )
+    if slow .latency_model is None :
+        geometry =cfg .get ("hdd_geometry")
+        slow .latency_model =HDDModel (HDDGeometry .for_disk (disk_size ,block_size ,**(geometry if isinstance (geometry ,dict )else {})))
+    disk =TieredDisk (fast ,slow ,**params )
+    return disk ,TierClock (disk )
+
+
+def _make_fsm (cfg :Dict [str ,Any ],n_blocks :int ,on_bitmap_update :Optional [Callable [[BitmapView ],None ]])->Any :
+    kind =cfg .get ("free_space_manager","bitmap")
+    policy =cfg .get ("allocation_policy","first")
+    if kind =="extent":
+        return ExtentFreeSpaceManager (n_blocks ,policy =policy ,on_bitmap_update =on_bitmap_update )
+    if kind =="segregated":
+        return SegregatedFreeSpaceManager (
+        n_blocks ,
+        size_classes =cfg .get ("size_classes",DEFAULT_SIZE_CLASSES ),
+        policy =policy ,
+        on_bitmap_update =on_bitmap_update ,
+        )
+    if kind =="buddy":
+        if policy !="first":
+            raise ValueError ("allocation_policy no aplica al gestor 'buddy'")
+        return BuddyFreeSpaceManager (n_blocks ,on_bitmap_update =on_bitmap_update )
+    if kind !="bitmap":
+        raise ValueError (f"free_space_manager inválido: {kind }")
+    return FreeSpaceManager (n_blocks ,policy =policy ,on_bitmap_update =on_bitmap_update )
+
+
 def _snapshot_state (fsm :FreeSpaceManager )->Dict [str ,float ]:
     total =fsm .n_blocks 
     used =fsm .used_count ()
@@ -61,7 +166,7 @@ def _snapshot_state (fsm :FreeSpaceManager )->Dict [str ,float ]:
     "space_total":float (total ),
     "space_usage_pct":float (usage_pct ),
     "external_frag":float (ext_frag ),
-    "internal_frag":0.0 ,
+    "internal_frag":float (fsm .internal_fragmentation_ratio ()),
     }
 
 
@@ -72,7 +177,7 @@ scenarios_path :str |None ,
 seed :int |None ,
 overrides :Dict [str ,Any ],
 out :str |None =None ,
-on_bitmap_update :Optional [Callable [[str ,List [int ]],None ]]=None ,
+on_bitmap_update :Optional [Callable [[str ,BitmapView ],None ]]=None ,
 ui_slowdown_ms :Optional [int ]=None ,
 
 user_files :Optional [List [Dict [str ,Any ]]]=None ,
@@ -106,14 +211,42 @@ respect_user_files_only :bool =False ,
 
 
         max_blocks_for_ui =50000 
-        if disk_size >max_blocks_for_ui :
+        if disk_size >max_blocks_for_ui and cfg .get ("disk_backend","memory")not in ("sparse","metadata"):
             disk_size =max_blocks_for_ui 
 
-        disk =Disk (
-        n_blocks =disk_size ,
-        block_size =block_size ,
-        prefill =None ,
-        )
+        latency_model :Optional [Any ]
+        if cfg .get ("tiered"):
+            disk ,latency_model =_make_tiered (cfg ,s ,scenario ,disk_size ,block_size )
+        elif cfg .get ("raid"):
+            disk ,latency_model =_make_raid (cfg ,s ,scenario ,disk_size ,block_size )
+        else :
+            disk =_make_disk (cfg ,s ,scenario ,disk_size ,block_size )
+            latency_model =_make_latency_model (cfg ,disk )
+        scheduler :Optional [IOScheduler ]=None 
+        if cfg .get ("io_scheduler"):
+            scheduler =IOScheduler (
+            disk ,
+            latency_model ,
+            algorithm =cfg ["io_scheduler"],
+            queue_depth =int (cfg .get ("queue_depth",DEFAULT_QUEUE_DEPTH )),
+            )
+        elif latency_model is not None and not isinstance (disk ,(RaidVolume ,TieredDisk )):
+            disk .latency_model =latency_model 
+        device =scheduler if scheduler is not None else disk 
+        cache :Optional [BufferCache ]=None 
+        if cfg .get ("cache_policy")or cfg .get ("cache_blocks")or cfg .get ("cache_write_back")or cfg .get ("readahead"):
+            cache =BufferCache (
+            device ,
+            int (cfg .get ("cache_blocks")or DEFAULT_CACHE_BLOCKS ),
+            policy =cfg .get ("cache_policy")or "lru",
+            write_back =bool (cfg .get ("cache_write_back",False )),
+            dirty_limit =cfg .get ("cache_dirty_limit"),
+            )
+            device =cache 
+        readahead :Optional [ReadAhead ]=None 
+        if cache is not None and cfg .get ("readahead"):
+            ra_params =cfg ["readahead"]if isinstance (cfg ["readahead"],dict )else {}
+            readahead =ReadAhead (cache ,**ra_params )
 
         fsm_callback =None 
         if on_bitmap_update :
@@ -121,22 +254,28 @@ respect_user_files_only :bool =False ,
                 return lambda bitmap :on_bitmap_update (strategy_key ,bitmap )
             fsm_callback =create_callback (s )
 
-        fsm =FreeSpaceManager (
-        disk .n_blocks ,
-        on_bitmap_update =fsm_callback 
-        )
+        fsm =_make_fsm (cfg ,disk .n_blocks ,fsm_callback )
 
         results :List [Dict [str ,Any ]]=[]
         event_acc :Dict [str ,Any ]={}
         on_event =_make_event_handler (event_acc )
         fs_class =STRATEGIES [s ]
-        fs =fs_class (disk ,fsm ,on_event =on_event )
+        fs =fs_class (
+        device ,
+        fsm ,
+        on_event =on_event ,
+        zero_copy_reads =bool (cfg .get ("zero_copy_reads",False )),
+        readahead =readahead ,
+        goal_allocation =bool (cfg .get ("goal_allocation",False )),
+        )
 
 
 
         files_manifest_map :Dict [str ,Dict [str ,Any ]]={}
 
         op_traces :List [Dict [str ,Any ]]=[]
+        alloc_failures =0 
+        first_alloc_failure :Optional [int ]=None 
 
 
         sim_start_wall =time .perf_counter ()
@@ -146,7 +285,11 @@ respect_user_files_only :bool =False ,
             event_acc .clear ()
             op_name =op .get ("op")
             t0_wall =time .perf_counter ()
+            t0_sim =latency_model .clock_ms if latency_model is not None else 0.0 
             t0_cpu =time .process_time ()
+            c0_hits ,c0_misses =(cache .hits ,cache .misses )if cache is not None else (0 ,0 )
+            c0_physical =cache .physical_writes if cache is not None else 0 
+            d0_reads ,d0_writes ,d0_seeks =(disk .reads ,disk .writes ,disk .seeks )if isinstance (disk ,Disk )else (0 ,0 ,0 )
             hit ,miss =1 ,0 
 
 
@@ -180,7 +323,7 @@ respect_user_files_only :bool =False ,
                 fname =op .get ("name")
                 if fname in files_manifest_map :
                     files_manifest_map [fname ]["read_ops"]+=1 
-            elif op_name =="write":
+            elif op_name in ("write","pwrite"):
                 fname =op .get ("name")
                 if fname in files_manifest_map :
                     files_manifest_map [fname ]["write_ops"]+=1 
@@ -202,12 +345,27 @@ respect_user_files_only :bool =False ,
                     fs .read (op ["name"],op ["offset"],op ["n_blocks"],op .get ("access_mode","seq"))
                 elif op_name =="write":
                     fs .write (op ["name"],op ["offset"],op ["n_blocks"],None )
+                elif op_name =="pwrite":
+                    fs .pwrite (op ["name"],op ["offset"]*fs .payload_size +op ["byte_offset"]%fs .payload_size ,bytes (op ["n_bytes"]))
                 else :
                     hit ,miss =0 ,1 
+            except MemoryError :
+                hit ,miss =0 ,1 
+                alloc_failures +=1 
+                if first_alloc_failure is None :
+                    first_alloc_failure =op_idx 
             except Exception :
                 hit ,miss =0 ,1 
+            if scheduler is not None :
+                scheduler .drain ()
+            op_errors =miss 
+            if cache is not None :
+                hit ,miss =cache .hits -c0_hits ,cache .misses -c0_misses 
 
             op_elapsed_ms =(time .perf_counter ()-t0_wall )*1000.0 
+            op_sim_ms =(latency_model .clock_ms -t0_sim )if latency_model is not None else 0.0 
+            if isinstance (disk ,TieredDisk ):
+                disk .migrate ()
             op_cpu_s =(time .process_time ()-t0_cpu )
             snap =_snapshot_state (fsm )
             t_wall_since_start =time .perf_counter ()-sim_start_wall 
@@ -228,6 +386,11 @@ respect_user_files_only :bool =False ,
             "external_frag":snap ["external_frag"],
             "internal_frag":snap ["internal_frag"],
             }
+            if latency_model is not None :
+                result ["sim_service_ms"]=float (op_sim_ms )
+            if cache is not None :
+                result ["op_errors"]=op_errors 
+                result ["physical_writes"]=cache .physical_writes -c0_physical 
             results .append (result )
 
 
@@ -246,10 +409,24 @@ respect_user_files_only :bool =False ,
             "seeks_est":int (event_acc .get ("seeks",0 )),
             "blocks_touched":int (event_acc .get ("blocks_touched",0 )),
             }
+            if latency_model is not None :
+                trace_item ["sim_service_ms"]=float (op_sim_ms )
+            if isinstance (disk ,Disk ):
+                trace_item ["device_reads"]=disk .reads -d0_reads 
+                trace_item ["device_writes"]=disk .writes -d0_writes 
+                trace_item ["device_seeks"]=disk .seeks -d0_seeks 
             op_traces .append (trace_item )
 
 
 
+        final_sync_ms =0.0 
+        if cache is not None and cache .write_back :
+            t0_sim =latency_model .clock_ms if latency_model is not None else 0.0 
+            cache .sync ()
+            if scheduler is not None :
+                scheduler .drain ()
+            final_sync_ms =(latency_model .clock_ms -t0_sim )if latency_model is not None else 0.0 
+
         total_elapsed_s =time .perf_counter ()-sim_start_wall 
         total_cpu_s =time .process_time ()-sim_start_cpu 
         results .append ({
@@ -261,6 +438,8 @@ respect_user_files_only :bool =False ,
         "seeks_est":sum (r ["seeks_est"]for r in results if r .get ("operation")!="TOTAL"),
         "blocks_touched":sum (r ["blocks_touched"]for r in results if r .get ("operation")!="TOTAL"),
         **_snapshot_state (fsm ),
+        **({"sim_service_ms":latency_model .clock_ms }if latency_model is not None else {}),
+        **({"op_errors":sum (r ["op_errors"]for r in results if r .get ("operation")!="TOTAL")}if cache is not None else {}),
         })
 
 
@@ -274,6 +453,46 @@ respect_user_files_only :bool =False ,
         summary_ext ["cpu_time_total_s"]=round (total_cpu_s ,6 )
         summary_ext ["ops_count"]=sum (1 for r in results if r .get ("operation")not in ("TOTAL",None ))
         summary_ext ["seeks_total_est"]=int (sum (r ["seeks_est"]for r in results if r .get ("operation")!="TOTAL"))
+        if isinstance (disk ,Disk ):
+            summary_ext ["disk_io"]=disk .stats ()
+            summary_ext ["disk_heatmap"]=disk .heatmap ()
+        if isinstance (disk ,ZonedDisk ):
+            summary_ext ["zoned"]=disk .zone_stats ()
+        if isinstance (disk ,RaidVolume ):
+            summary_ext ["raid"]=disk .raid_stats ()
+            summary_ext ["raid"]["member_io"]=[m .stats ()for m in disk .members ]
+            if latency_model is not None :
+                summary_ext ["raid"]["member_latency"]=latency_model .stats ()
+        elif isinstance (disk ,TieredDisk ):
+            summary_ext ["tiered"]=disk .tier_stats ()
+            summary_ext ["tiered"]["fast_io"]=disk .fast .stats ()
+            summary_ext ["tiered"]["slow_io"]=disk .slow .stats ()
+            summary_ext ["tiered"]["latency"]=latency_model .stats ()
+        elif isinstance (disk ,SSDDisk ):
+            summary_ext ["ssd"]=disk .ftl .stats ()
+            summary_ext ["ssd_erase_counts"]=disk .ftl .erase_counts ()
+        elif latency_model is not None :
+            summary_ext ["hdd_model"]=latency_model .stats ()
+        if cache is not None :
+            summary_ext ["buffer_cache"]=cache .stats ()
+            if cache .write_back and latency_model is not None :
+                flush_ops =[r ["sim_service_ms"]for r in results if r .get ("physical_writes")]
+                quiet_ops =[r ["sim_service_ms"]for r in results if r .get ("operation")!="TOTAL"and not r .get ("physical_writes")]
+                summary_ext ["buffer_cache"]["final_sync_ms"]=round (final_sync_ms ,3 )
+                summary_ext ["buffer_cache"]["avg_ms_ops_with_flush"]=round (sum (flush_ops )/len (flush_ops ),3 )if flush_ops else 0.0 
+                summary_ext ["buffer_cache"]["avg_ms_ops_without_flush"]=round (sum (quiet_ops )/len (quiet_ops ),3 )if quiet_ops else 0.0 
+        summary_ext ["free_space"]={
+        **fsm .stats (),
+        "alloc_failures":alloc_failures ,
+        "first_alloc_failure_op":first_alloc_failure ,
+        }
+        if fs .pwrite_ops or fs .pread_ops :
+            summary_ext ["byte_io"]=fs .byte_io_stats ()
+        if readahead is not None :
+            summary_ext ["readahead"]=readahead .stats ()
+        if scheduler is not None :
+            summary_ext ["io_scheduler"]=scheduler .stats ()
+            summary_ext ["io_scheduler_comparison"]=scheduler .compare_algorithms ()
         summary_ext ["_scenario"]=scenario or "overrides-only"
         summary_ext ["_seed"]=seed 
 
@@ -283,6 +502,25 @@ respect_user_files_only :bool =False ,
         summary_ext ["op_traces"]=op_traces 
 
 
+        if isinstance (disk ,MappedDisk ):
+            summary_ext ["disk_image"]=str (disk .path )
+            disk .close ()
+        elif isinstance (disk ,SparseDisk ):
+            summary_ext ["disk_resident_bytes"]=disk .resident_bytes ()
+            summary_ext ["disk_materialized_pages"]=disk .materialized_pages ()
+        elif isinstance (disk ,MetadataDisk ):
+            summary_ext ["disk_resident_bytes"]=disk .resident_bytes ()
+            summary_ext ["disk_metadata_blocks"]=disk .metadata_blocks_count ()
+            summary_ext ["disk_occupancy_extents"]=disk .occupancy_extents ()
+        elif isinstance (disk ,DedupDisk ):
+            summary_ext ["disk_dedup"]=disk .dedup_stats ()
+        elif isinstance (disk ,TieredDisk ):
+            disk .close ()
+        elif isinstance (disk ,RaidVolume ):
+            for member in disk .members :
+                if isinstance (member ,MappedDisk ):
+                    member .close ()
+
         summaries [s ]={**summary_ext ,"_basic":summary_basic }
         final_bitmaps [s ]=fsm .snapshot_bitmap ()
 
@@ -96,6 +96,8 @@ respect_user_files_only :bool =False ,
     seq_prob :float =float (cfg .get ("access_pattern",{}).get ("seq",0.5 ))
     delete_rate :float =float (cfg .get ("delete_rate",0.1 ))
     max_io_blocks :int =int (cfg .get ("max_io_blocks",8 ))
+    pwrite_rate :float =float (cfg .get ("pwrite_rate",0.0 ))
+    pwrite_rng :Tuple [int ,int ]=tuple (cfg .get ("pwrite_bytes",(1 ,512 )))
 
 
     files :Dict [str ,Dict [str ,int ]]={}
@@ -249,6 +251,19 @@ respect_user_files_only :bool =False ,
             )
             files [target ]["cursor"]=new_cursor 
 
+            if chosen =="write"and pwrite_rate >0 and rng .random ()<pwrite_rate :
+                ops .append ({
+                "op":"pwrite",
+                "name":target ,
+                "size_blocks":0 ,
+                "offset":offset ,
+                "n_blocks":n_blocks ,
+                "access_mode":access_mode ,
+                "byte_offset":rng .randrange (int (cfg .get ("block_size",4096 ))),
+                "n_bytes":_rand_size (rng ,pwrite_rng ),
+                })
+                continue 
+
             ops .append ({
             "op":chosen ,
             "name":target ,
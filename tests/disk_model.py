@@ -0,0 +1,66 @@
+from __future__ import annotations 
+import random 
+from typing import Dict ,Optional 
+
+STEPS =400 
+
+
+def random_payload (rng :random .Random ,block_size :int )->Optional [bytes ]:
+    if rng .random ()<0.2 :
+        return None 
+    return bytes (rng .randrange (256 )for _ in range (rng .randrange (block_size +1 )))
+
+
+def exercise (disk ,rng :random .Random ,steps :int =STEPS )->Dict [int ,bytes ]:
+    model :Dict [int ,bytes ]={}
+    n =disk .n_blocks 
+    for _ in range (steps ):
+        op =rng .random ()
+        if op <0.3 :
+            i =rng .randrange (n )
+            data =random_payload (rng ,disk .block_size )
+            disk .write_block (i ,data )
+            if data is None :
+                model .pop (i ,None )
+            else :
+                model [i ]=data 
+        elif op <0.45 :
+            indices =rng .sample (range (n ),rng .randint (1 ,min (8 ,n )))
+            payloads =[random_payload (rng ,disk .block_size )for _ in indices ]
+            disk .write_blocks (indices ,payloads )
+            for i ,data in zip (indices ,payloads ):
+                if data is None :
+                    model .pop (i ,None )
+                else :
+                    model [i ]=data 
+        elif op <0.6 :
+            start =rng .randrange (n )
+            count =rng .randint (1 ,min (12 ,n -start ))
+            if rng .random ()<0.25 :
+                disk .write_range (start ,None ,count )
+                for i in range (start ,start +count ):
+                    model .pop (i ,None )
+            else :
+                size =disk .block_size 
+                buf =bytes (rng .randrange (256 )for _ in range (rng .randrange (count *size +1 )))
+                disk .write_range (start ,buf ,count )
+                for k in range (count ):
+                    model [start +k ]=buf [k *size :(k +1 )*size ]
+        elif op <0.75 :
+            i =rng .randrange (n )
+            assert disk .read_block (i )==model .get (i )
+        elif op <0.85 :
+            indices =rng .sample (range (n ),rng .randint (1 ,min (8 ,n )))
+            got =[None if p is None else bytes (p )for p in disk .read_blocks (indices )]
+            assert got ==[model .get (i )for i in indices ]
+        else :
+            start =rng .randrange (n )
+            count =rng .randint (1 ,min (12 ,n -start ))
+            got =[None if p is None else bytes (p )for p in disk .read_range (start ,count )]
+            assert got ==[model .get (i )for i in range (start ,start +count )]
+    return model 
+
+
+def assert_matches (disk ,model :Dict [int ,bytes ])->None :
+    assert [disk .read_block (i )for i in range (disk .n_blocks )]==[model .get (i )for i in range (disk .n_blocks )]
+    assert disk .used_blocks_count ()==len (model )
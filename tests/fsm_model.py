@@ -0,0 +1,71 @@
+from __future__ import annotations 
+import random 
+from typing import List ,Set ,Tuple 
+
+STEPS =600 
+SIZES =(1 ,1 ,2 ,3 ,5 ,8 ,13 ,40 )
+
+
+def zero_runs (bitmap :List [int ])->List [Tuple [int ,int ]]:
+    runs :List [Tuple [int ,int ]]=[]
+    start =None 
+    for i ,bit in enumerate (list (bitmap )+[1 ]):
+        if not bit and start is None :
+            start =i 
+        elif bit and start is not None :
+            runs .append ((start ,i -start ))
+            start =None 
+    return runs 
+
+
+def check_invariants (fsm ,held :Set [int ],exact :bool =True )->None :
+    n =fsm .n_blocks 
+    bitmap =list (fsm .snapshot_bitmap ())
+    assert len (bitmap )==n 
+    assert all (bitmap [i ]==1 for i in held )
+    if exact :
+        assert bitmap ==[1 if i in held else 0 for i in range (n )]
+
+    runs =fsm .free_runs ()
+    covered =[i for start ,length in runs for i in range (start ,start +length )]
+    assert len (covered )==len (set (covered ))
+    assert sorted (covered )==[i for i ,bit in enumerate (bitmap )if not bit ]
+    if exact :
+        assert sorted (runs )==zero_runs (bitmap )
+
+    assert fsm .free_count ()==bitmap .count (0 )
+    assert fsm .used_count ()==n -bitmap .count (0 )
+    assert fsm .largest_free_run_size ()==max ((length for _ ,length in runs ),default =0 )
+
+
+def exercise_fsm (fsm ,rng :random .Random ,steps :int =STEPS ,*,exact :bool =True ,goals :bool =False )->Set [int ]:
+    n_blocks =fsm .n_blocks 
+    allocations :List [List [int ]]=[]
+    held :Set [int ]=set ()
+    for _ in range (steps ):
+        if allocations and rng .random ()<0.4 :
+            blocks =allocations .pop (rng .randrange (len (allocations )))
+            rng .shuffle (blocks )
+            fsm .free (blocks )
+            held .difference_update (blocks )
+        else :
+            n =rng .choice (SIZES )
+            contiguous =rng .random ()<0.5 
+            kwargs ={}
+            if goals and rng .random ()<0.3 :
+                kwargs ["goal"]=rng .randrange (n_blocks )
+            try :
+                blocks =fsm .allocate (n ,contiguous =contiguous ,**kwargs )
+            except MemoryError :
+                check_invariants (fsm ,held ,exact )
+                continue 
+            assert len (blocks )==n 
+            assert len (set (blocks ))==n 
+            assert all (0 <=i <n_blocks for i in blocks )
+            assert held .isdisjoint (blocks )
+            if contiguous :
+                assert blocks ==list (range (blocks [0 ],blocks [0 ]+n ))
+            allocations .append (list (blocks ))
+            held .update (blocks )
+        check_invariants (fsm ,held ,exact )
+    return held 
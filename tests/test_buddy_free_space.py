@@ -0,0 +1,93 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from fsm_model import check_invariants ,exercise_fsm 
+from fsim .core .buddy_free_space import BuddyFreeSpaceManager 
+from fsim .core .extent_free_space import ExtentFreeSpaceManager 
+from fsim .core .free_space import FreeSpaceManager 
+
+
+@pytest .mark .parametrize ("goals",[False ,True ])
+@pytest .mark .parametrize ("seed",range (3 ))
+def test_random_operations_keep_invariants (seed :int ,goals :bool )->None :
+    exercise_fsm (BuddyFreeSpaceManager (300 ),random .Random (seed ),exact =False ,goals =goals )
+
+
+def test_initial_free_blocks_are_aligned_powers_of_two ()->None :
+    assert BuddyFreeSpaceManager (100 ).free_runs ()==[(0 ,64 ),(64 ,32 ),(96 ,4 )]
+
+
+def test_goal_picks_the_nearest_block_of_the_smallest_free_order ()->None :
+    fsm =BuddyFreeSpaceManager (64 )
+    assert fsm .allocate (1 ,goal =40 )==[40 ]
+    assert fsm .free_runs ()==[(0 ,32 ),(32 ,8 ),(41 ,1 ),(42 ,2 ),(44 ,4 ),(48 ,16 )]
+    assert fsm .allocate (2 ,contiguous =True ,goal =10 )==[42 ,43 ]
+    assert fsm .allocate (3 ,contiguous =True ,goal =60 )==[44 ,45 ,46 ]
+    assert fsm .allocate (8 ,contiguous =True ,goal =63 )==list (range (32 ,40 ))
+    assert fsm .allocate (4 ,goal =63 )==[60 ,61 ,62 ,63 ]
+    with pytest .raises (IndexError ):
+        fsm .allocate (1 ,goal =64 )
+
+
+def test_contiguous_request_is_rounded_up_and_padding_counted ()->None :
+    fsm =BuddyFreeSpaceManager (64 )
+    blocks =fsm .allocate (5 ,contiguous =True )
+    assert blocks ==[0 ,1 ,2 ,3 ,4 ]
+    assert fsm .used_count ()==8 
+    assert fsm .snapshot_bitmap ()[:9 ]==[1 ]*8 +[0 ]
+    assert fsm .free_runs ()==[(8 ,8 ),(16 ,16 ),(32 ,32 )]
+    stats =fsm .stats ()
+    assert stats ["wasted_blocks"]==3 
+    assert stats ["splits"]==3 
+    assert fsm .internal_fragmentation_ratio ()==3 /8 
+    check_invariants (fsm ,set (blocks ),exact =False )
+
+
+def test_free_merges_buddies_back ()->None :
+    fsm =BuddyFreeSpaceManager (64 )
+    a =fsm .allocate (5 ,contiguous =True )
+    b =fsm .allocate (3 ,contiguous =True )
+    assert b ==[8 ,9 ,10 ]
+    fsm .free (a )
+    assert fsm .stats ()["merges"]==0 
+    fsm .free (b )
+    assert fsm .free_runs ()==[(0 ,64 )]
+    assert fsm .stats ()["merges"]==4 
+    assert fsm .wasted_blocks ==0 
+
+
+def test_scattered_request_is_split_into_powers_of_two_without_waste ()->None :
+    fsm =BuddyFreeSpaceManager (64 )
+    blocks =fsm .allocate (7 )
+    assert len (blocks )==7 
+    assert fsm .used_count ()==7 
+    assert fsm .wasted_blocks ==0 
+    fsm .free (blocks )
+    assert fsm .free_runs ()==[(0 ,64 )]
+
+
+def test_invalid_frees_are_rejected ()->None :
+    fsm =BuddyFreeSpaceManager (64 )
+    blocks =fsm .allocate (4 ,contiguous =True )
+    with pytest .raises (ValueError ):
+        fsm .free (blocks [1 :])
+    with pytest .raises (ValueError ):
+        fsm .free (blocks [:2 ])
+    fsm .free (blocks )
+    with pytest .raises (ValueError ):
+        fsm .free (blocks )
+
+
+def test_preoccupied_blocks_split_their_enclosing_block ()->None :
+    fsm =BuddyFreeSpaceManager (16 ,preoccupied =[5 ])
+    assert fsm .free_runs ()==[(0 ,4 ),(4 ,1 ),(6 ,2 ),(8 ,8 )]
+    with pytest .raises (ValueError ):
+        fsm .reserve_exact ([5 ])
+
+
+def test_other_managers_have_no_internal_fragmentation ()->None :
+    for fsm in (FreeSpaceManager (16 ),ExtentFreeSpaceManager (16 )):
+        fsm .allocate (5 ,contiguous =True )
+        assert fsm .internal_fragmentation_ratio ()==0.0 
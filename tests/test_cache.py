@@ -0,0 +1,188 @@
+from __future__ import annotations 
+import random 
+from typing import List 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .cache import CACHE_POLICIES ,BufferCache ,CachePolicy ,LRUPolicy ,make_policy 
+from fsim .core .disk import Disk 
+
+BLOCK_SIZE =16 
+SEQUENCE =[1 ,2 ,3 ,4 ,1 ,5 ,1 ,6 ,7 ,8 ,9 ,1 ]
+
+
+class RangeCountingDisk (Disk ):
+
+    def __init__ (self ,n_blocks :int ,block_size :int )->None :
+        super ().__init__ (n_blocks ,block_size )
+        self .range_reads :List [tuple ]=[]
+
+    def read_range (self ,start ,count ,*,zero_copy =False ):
+        self .range_reads .append ((start ,count ))
+        return super ().read_range (start ,count ,zero_copy =zero_copy )
+
+
+def hits_and_misses (cache :BufferCache ,sequence :List [int ])->str :
+    trace =""
+    for block in sequence :
+        hits =cache .hits 
+        cache .read_block (block )
+        trace +="H"if cache .hits >hits else "M"
+    return trace 
+
+
+@pytest .mark .parametrize ("policy,expected",[
+("lru","MMMMHMHMMMMM"),
+("clock","MMMMHMHMMMMH"),
+("2q","MMMMHMMMMMMH"),
+("arc","MMMMHMHMMMMH"),
+])
+def test_hit_miss_sequence_per_policy (policy :str ,expected :str )->None :
+    cache =BufferCache (Disk (16 ,BLOCK_SIZE ),4 ,policy =policy )
+    assert hits_and_misses (cache ,SEQUENCE )==expected 
+    assert cache .hits ==expected .count ("H")
+    assert cache .misses ==expected .count ("M")
+    assert len (cache .policy )==4 
+
+
+def test_clock_degrades_to_fifo_when_every_reference_bit_is_set ()->None :
+    sequence =[1 ,2 ,3 ,3 ,2 ,1 ,4 ,1 ]
+    lru =BufferCache (Disk (8 ,BLOCK_SIZE ),3 ,policy ="lru")
+    clock =BufferCache (Disk (8 ,BLOCK_SIZE ),3 ,policy ="clock")
+    assert hits_and_misses (lru ,sequence )=="MMMHHHMH"
+    assert hits_and_misses (clock ,sequence )=="MMMHHHMM"
+
+
+def test_arc_ghost_hit_grows_the_recency_target ()->None :
+    cache =BufferCache (Disk (16 ,BLOCK_SIZE ),4 ,policy ="arc")
+    hits_and_misses (cache ,SEQUENCE )
+    assert cache .policy .p ==0.0 
+    assert hits_and_misses (cache ,[6 ])=="M"
+    assert cache .policy .p ==1.0 
+
+
+@pytest .mark .parametrize ("policy",sorted (CACHE_POLICIES ))
+def test_discard_frees_room_without_eviction (policy :str )->None :
+    p =make_policy (policy ,2 )
+    assert p .admit (1 )==[]and p .admit (2 )==[]
+    p .discard (1 )
+    assert 1 not in p and len (p )==1 
+    assert p .admit (3 )==[]
+    assert len (p )==2 
+
+
+def test_unknown_policy_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        BufferCache (Disk (4 ,BLOCK_SIZE ),2 ,policy ="mru")
+
+
+def test_write_through_allocates_and_range_reads_fetch_only_missing_runs ()->None :
+    disk =RangeCountingDisk (32 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,8 )
+    cache .write_block (3 ,b"three")
+    assert disk .read_block (3 )==b"three"
+
+    disk .write_block (5 ,b"five")
+    assert cache .read_range (2 ,5 )==[None ,b"three",None ,b"five",None ]
+    assert disk .range_reads ==[(2 ,1 ),(4 ,3 )]
+    assert (cache .hits ,cache .misses )==(1 ,4 )
+
+    cache .write_range (2 ,None ,2 )
+    assert disk .read_block (3 )is None 
+    assert cache .read_block (3 )is None 
+    assert cache .stats ()["resident_blocks"]==4 
+
+
+@pytest .mark .parametrize ("write_back",[False ,True ])
+def test_round_trip_matches_model (write_back :bool )->None :
+    disk =Disk (128 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,16 ,write_back =write_back )
+    model =exercise (cache ,random .Random (0 ))
+    assert cache .used_blocks_count ()==len (model )
+    assert_matches (cache ,model )
+    cache .sync ()
+    assert_matches (disk ,model )
+
+
+def test_write_back_coalesces_repeated_writes ()->None :
+    disk =Disk (16 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,8 ,write_back =True ,dirty_limit =4 )
+    for payload in (b"one",b"two",b"three"):
+        cache .write_block (1 ,payload )
+    assert disk .read_block (1 )is None 
+    assert cache .read_block (1 )==b"three"
+    assert (cache .logical_writes ,cache .physical_writes ,cache .coalesced_writes )==(3 ,0 ,2 )
+
+    assert cache .sync ()==1 
+    assert disk .read_block (1 )==b"three"
+    stats =cache .stats ()
+    assert stats ["physical_writes"]==1 
+    assert stats ["writes_saved"]==2 
+    assert stats ["dirty_blocks"]==0 
+
+
+def test_dirty_limit_flushes_one_sorted_burst ()->None :
+    disk =Disk (16 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,8 ,write_back =True ,dirty_limit =4 )
+    for i in (9 ,2 ,7 ):
+        cache .write_block (i ,b"x")
+    assert cache .dirty_blocks_count ()==3 
+    cache .write_block (4 ,b"x")
+    assert cache .dirty_blocks_count ()==0 
+    assert (cache .flush_bursts ,cache .max_flush_blocks )==(1 ,4 )
+    assert [disk .read_block (i )for i in (2 ,4 ,7 ,9 )]==[b"x"]*4 
+
+
+def test_evicting_a_dirty_block_writes_it_back ()->None :
+    disk =Disk (16 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,2 ,write_back =True ,dirty_limit =8 )
+    for i in (1 ,2 ,3 ):
+        cache .write_block (i ,bytes ([i ]))
+    assert cache .eviction_writebacks ==1 
+    assert disk .read_block (1 )==bytes ([1 ])
+    assert disk .read_block (3 )is None 
+
+
+def test_clears_stay_write_through ()->None :
+    disk =Disk (16 ,BLOCK_SIZE )
+    disk .write_block (5 ,b"old")
+    cache =BufferCache (disk ,8 ,write_back =True )
+    cache .write_block (5 ,b"new")
+    cache .write_block (5 ,None )
+    assert disk .read_block (5 )is None 
+    assert cache .dirty_blocks_count ()==0 
+
+
+def test_used_blocks_count_does_not_flush_dirty_blocks ()->None :
+    disk =Disk (16 ,BLOCK_SIZE )
+    disk .write_block (2 ,b"old")
+    cache =BufferCache (disk ,8 ,write_back =True ,dirty_limit =8 )
+    cache .write_block (2 ,b"new")
+    cache .write_block (5 ,b"a")
+    cache .write_block (5 ,b"b")
+    cache .write_block (7 ,b"c")
+
+    assert cache .used_blocks_count ()==3 
+    assert cache .dirty_blocks_count ()==3 
+    assert cache .physical_writes ==0 
+    assert [cache .is_block_used (i )for i in (2 ,5 ,6 ,7 )]==[True ,True ,False ,True ]
+    assert not disk .is_block_used (5 )
+
+    cache .sync ()
+    assert cache .used_blocks_count ()==disk .used_blocks_count ()==3 
+    cache .write_block (7 ,None )
+    assert cache .used_blocks_count ()==2 
+
+
+def test_cache_policy_is_abstract ()->None :
+    class Partial (CachePolicy ):
+
+        def touch (self ,key :int )->None :
+            pass 
+
+    with pytest .raises (TypeError ):
+        CachePolicy (4 )
+    with pytest .raises (TypeError ):
+        Partial (4 )
+    assert isinstance (LRUPolicy (4 ),CachePolicy )
@@ -0,0 +1,47 @@
+from __future__ import annotations 
+import random 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .dedup_disk import DedupDisk 
+
+BLOCK_SIZE =16 
+
+
+def test_round_trip_matches_model ()->None :
+    disk =DedupDisk (128 ,BLOCK_SIZE )
+    model =exercise (disk ,random .Random (0 ))
+    assert_matches (disk ,model )
+
+
+def test_identical_payloads_are_stored_once ()->None :
+    disk =DedupDisk (16 ,BLOCK_SIZE )
+    for i in range (6 ):
+        disk .write_block (i ,b"same")
+    disk .write_block (6 ,b"other")
+    disk .write_range (7 ,b"",3 )
+
+    stats =disk .dedup_stats ()
+    assert stats ["referenced_blocks"]==10 
+    assert stats ["unique_payloads"]==3 
+    assert stats ["logical_bytes"]==6 *4 +5 
+    assert stats ["stored_bytes"]==4 +5 
+    assert stats ["bytes_saved"]==5 *4 
+    assert stats ["dedup_ratio"]==round (10 /3 ,3 )
+
+
+def test_entry_is_dropped_with_its_last_reference ()->None :
+    disk =DedupDisk (8 ,BLOCK_SIZE )
+    disk .write_block (0 ,b"shared")
+    disk .write_block (1 ,b"shared")
+    disk .write_block (0 ,b"fresh")
+    assert disk .unique_payloads ()==2 
+    disk .write_block (1 ,None )
+    assert disk .unique_payloads ()==1 
+    assert disk .read_block (0 )==b"fresh"
+
+
+def test_prefill_zeros_shares_one_payload ()->None :
+    disk =DedupDisk (1000 ,BLOCK_SIZE ,prefill ="zeros")
+    assert disk .unique_payloads ()==1 
+    assert disk .dedup_ratio ()==1000 
+    assert disk .read_block (999 )==bytes (BLOCK_SIZE )
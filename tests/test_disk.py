@@ -0,0 +1,137 @@
+from __future__ import annotations 
+import random 
+from array import array 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .dedup_disk import DedupDisk 
+from fsim .core .disk import Disk 
+from fsim .core .mapped_disk import MappedDisk 
+from fsim .core .metadata_disk import MetadataDisk 
+from fsim .core .sparse_disk import SparseDisk 
+
+N_BLOCKS =128 
+BLOCK_SIZE =16 
+
+
+@pytest .mark .parametrize ("seed",range (3 ))
+def test_round_trip_matches_model (seed :int )->None :
+    disk =Disk (N_BLOCKS ,BLOCK_SIZE )
+    model =exercise (disk ,random .Random (seed ))
+    assert_matches (disk ,model )
+
+
+def test_empty_and_short_payloads_are_distinct ()->None :
+    disk =Disk (4 ,BLOCK_SIZE )
+    disk .write_block (0 ,b"")
+    disk .write_block (1 ,b"abc")
+    assert disk .read_block (0 )==b""
+    assert disk .read_block (1 )==b"abc"
+    assert disk .read_block (2 )is None 
+    assert disk .used_blocks_count ()==2 
+
+    disk .clear_block (1 )
+    assert disk .read_block (1 )is None 
+    assert disk .empty_blocks_count ()==3 
+
+
+def test_prefill_zeros_marks_every_block_used ()->None :
+    disk =Disk (4 ,BLOCK_SIZE ,prefill ="zeros")
+    assert disk .used_blocks_count ()==4 
+    assert disk .read_block (3 )==bytes (BLOCK_SIZE )
+
+
+def test_payload_size_counts_bytes_not_elements ()->None :
+    disk =Disk (4 ,8 )
+    disk .write_block (0 ,memoryview (array ("i",[1 ,2 ])))
+    assert disk .read_block (0 )==array ("i",[1 ,2 ]).tobytes ()
+    with pytest .raises (ValueError ):
+        disk .write_block (1 ,memoryview (array ("i",[1 ,2 ,3 ])))
+
+
+def test_out_of_range_index_is_rejected ()->None :
+    disk =Disk (4 ,BLOCK_SIZE )
+    with pytest .raises (IndexError ):
+        disk .read_block (4 )
+    with pytest .raises (IndexError ):
+        disk .write_blocks ([0 ,4 ],[b"a",b"b"])
+
+
+def test_iter_blocks_yields_stored_payloads ()->None :
+    disk =Disk (3 ,BLOCK_SIZE )
+    disk .write_block (1 ,b"xy")
+    assert [(b .index ,b .data )for b in disk .iter_blocks ()]==[(0 ,None ),(1 ,b"xy"),(2 ,None )]
+    assert disk .stats ()["reads"]==0 
+
+
+def test_write_range_lays_out_full_partial_and_empty_blocks ()->None :
+    disk =Disk (8 ,4 )
+    disk .write_range (2 ,b"abcdefghij",4 )
+    assert disk .read_range (2 ,4 )==[b"abcd",b"efgh",b"ij",b""]
+    assert disk .used_blocks_count ()==4 
+
+    disk .write_range (3 ,None ,2 )
+    assert disk .read_range (2 ,4 )==[b"abcd",None ,None ,b""]
+    assert disk .used_blocks_count ()==2 
+
+
+def test_write_range_infers_count_and_checks_bounds ()->None :
+    disk =Disk (8 ,4 )
+    disk .write_range (6 ,b"abcdef")
+    assert disk .read_range (6 ,2 )==[b"abcd",b"ef"]
+    with pytest .raises (ValueError ):
+        disk .write_range (0 ,b"abcdefghi",2 )
+    with pytest .raises (ValueError ):
+        disk .write_range (0 ,None )
+    with pytest .raises (IndexError ):
+        disk .read_range (6 ,3 )
+
+
+def test_read_range_zero_copy_returns_views ()->None :
+    disk =Disk (4 ,4 )
+    disk .write_range (0 ,b"abcdef",2 )
+    views =disk .read_range (0 ,3 ,zero_copy =True )
+    assert [None if v is None else bytes (v )for v in views ]==[b"abcd",b"ef",None ]
+    assert isinstance (views [0 ],memoryview )
+
+
+@pytest .mark .parametrize ("backend",["disk","sparse","metadata","dedup","mapped"])
+def test_io_counters_track_requests_bytes_and_seeks (backend ,tmp_path )->None :
+    if backend =="mapped":
+        disk =MappedDisk (tmp_path /"stats.img",20 ,BLOCK_SIZE )
+    else :
+        disk ={"disk":Disk ,"sparse":SparseDisk ,"metadata":MetadataDisk ,"dedup":DedupDisk }[backend ](20 ,BLOCK_SIZE )
+    disk .write_range (0 ,b"a"*40 ,3 )
+    disk .read_block (1 )
+    disk .write_blocks ([5 ,6 ,9 ],[b"x",b"yy",None ])
+    disk .read_range (5 ,2 )
+    disk .clear_block (0 )
+
+    stats =disk .stats ()
+    assert (stats ["reads"],stats ["read_requests"])==(3 ,2 )
+    assert (stats ["writes"],stats ["write_requests"])==(5 ,2 )
+    assert (stats ["bytes_read"],stats ["bytes_written"])==(19 ,43 )
+    assert stats ["cleared_blocks"]==2 
+    assert stats ["seeks"]==3 
+    assert stats ["blocks_accessed"]==5 
+    assert stats ["max_block_accesses"]==2 
+    assert stats ["hot_blocks"]==[[1 ,2 ],[5 ,2 ],[6 ,2 ],[0 ,1 ],[2 ,1 ]]
+    assert disk .heatmap (5 )==[4 ,4 ,0 ,0 ,0 ]
+
+    disk .reset_stats ()
+    assert disk .stats ()["reads"]==0 
+    assert not any (disk .access_counts ())
+    if backend =="mapped":
+        disk .close ()
+
+
+def test_access_stats_on_a_large_sparse_disk ()->None :
+    disk =SparseDisk (1 <<22 ,BLOCK_SIZE )
+    disk .write_range (1000 ,b"x"*BLOCK_SIZE *3 ,3 )
+    disk .read_block ((1 <<22 )-1 )
+    stats =disk .stats ()
+    assert stats ["blocks_accessed"]==4 
+    assert stats ["hot_blocks"]==[[1000 ,1 ],[1001 ,1 ],[1002 ,1 ],[(1 <<22 )-1 ,1 ]]
+    heatmap =disk .heatmap (4 )
+    assert heatmap ==[3 ,0 ,0 ,1 ]
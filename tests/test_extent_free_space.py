@@ -0,0 +1,89 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from fsm_model import check_invariants ,exercise_fsm 
+from fsim .core .extent_free_space import ExtentFreeSpaceManager ,ExtentTreap 
+from fsim .core .free_space import ALLOCATION_POLICIES 
+
+N_BLOCKS =300 
+RESERVED =[*range (10 ,20 ),*range (23 ,40 ),*range (45 ,60 )]
+
+
+def holes (policy :str )->ExtentFreeSpaceManager :
+    fsm =ExtentFreeSpaceManager (200 ,policy =policy ,preoccupied =RESERVED )
+    assert fsm .free_runs ()==[(0 ,10 ),(20 ,3 ),(40 ,5 ),(60 ,140 )]
+    return fsm 
+
+
+def contiguous_starts (fsm ,sizes )->list :
+    return [fsm .allocate (n ,contiguous =True )[0 ]for n in sizes ]
+
+
+def test_treap_keeps_keys_ordered_and_tracks_max_length ()->None :
+    rng =random .Random (0 )
+    treap =ExtentTreap (seed =3 )
+    model ={}
+    for _ in range (300 ):
+        key =rng .randrange (100 )
+        if key in model :
+            treap .remove (key )
+            del model [key ]
+        else :
+            model [key ]=rng .randint (1 ,50 )
+            treap .insert (key ,model [key ])
+        assert list (treap .items ())==sorted (model .items ())
+        assert len (treap )==len (model )
+        assert treap .max_length ()==max (model .values (),default =0 )
+
+    probe =50 
+    below =[k for k in model if k <=probe ]
+    above =[k for k in model if k >=probe ]
+    assert (treap .floor (probe ).key if below else None )==(max (below )if below else None )
+    assert (treap .ceiling (probe ).key if above else None )==(min (above )if above else None )
+    fitting =[k for k in sorted (model )if k >=probe and model [k ]>=30 ]
+    node =treap .first_fit (30 ,probe )
+    assert (node .key if node else None )==(fitting [0 ]if fitting else None )
+
+
+@pytest .mark .parametrize ("goals",[False ,True ])
+@pytest .mark .parametrize ("policy",ALLOCATION_POLICIES )
+@pytest .mark .parametrize ("seed",range (2 ))
+def test_random_operations_keep_invariants (policy :str ,seed :int ,goals :bool )->None :
+    exercise_fsm (ExtentFreeSpaceManager (N_BLOCKS ,policy =policy ),random .Random (seed ),goals =goals )
+
+
+def test_first_fit_takes_the_lowest_extent ()->None :
+    assert contiguous_starts (holes ("first"),[3 ,4 ,5 ])==[0 ,3 ,40 ]
+
+
+def test_best_fit_takes_the_smallest_extent_that_fits ()->None :
+    assert contiguous_starts (holes ("best"),[3 ,5 ,4 ])==[20 ,40 ,0 ]
+
+
+def test_next_fit_resumes_after_the_last_allocation_and_wraps ()->None :
+    fsm =holes ("next")
+    assert contiguous_starts (fsm ,[3 ,3 ,5 ,2 ])==[0 ,3 ,40 ,60 ]
+    fsm .allocate (138 ,contiguous =True )
+    assert contiguous_starts (fsm ,[4 ])==[6 ]
+
+
+def test_frees_coalesce_with_both_neighbours ()->None :
+    fsm =ExtentFreeSpaceManager (30 )
+    a =fsm .allocate (10 ,contiguous =True )
+    b =fsm .allocate (10 ,contiguous =True )
+    fsm .allocate (10 ,contiguous =True )
+    fsm .free (a )
+    assert fsm .extent_count ()==1 
+    fsm .free (list (reversed (b )))
+    assert fsm .free_runs ()==[(0 ,20 )]
+    assert fsm .stats ()["coalesces"]>=1 
+    check_invariants (fsm ,set (range (20 ,30 )))
+    with pytest .raises (ValueError ):
+        fsm .free (a )
+
+
+def test_invalid_policy_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        ExtentFreeSpaceManager (10 ,policy ="fastest")
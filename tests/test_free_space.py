@@ -0,0 +1,155 @@
+from __future__ import annotations 
+import random 
+from collections import Counter 
+
+import pytest 
+
+from fsm_model import check_invariants ,exercise_fsm ,zero_runs 
+from fsim .core .extent_free_space import ExtentFreeSpaceManager 
+from fsim .core .buddy_free_space import BuddyFreeSpaceManager 
+from fsim .core .free_space import ALLOCATION_POLICIES ,BitmapView ,FreeSpaceManager ,PackedBitmap 
+from fsim .core .segregated_free_space import SegregatedFreeSpaceManager 
+
+N_BLOCKS =300 
+MANAGERS =[FreeSpaceManager ,ExtentFreeSpaceManager ]
+RESERVED =[*range (10 ,20 ),*range (23 ,40 ),*range (45 ,60 )]
+
+
+def holes (manager ,policy :str ):
+    fsm =manager (200 ,policy =policy ,preoccupied =RESERVED )
+    assert fsm .free_runs ()==[(0 ,10 ),(20 ,3 ),(40 ,5 ),(60 ,140 )]
+    return fsm 
+
+
+@pytest .mark .parametrize ("n_bits",[1 ,64 ,130 ,300 ])
+def test_packed_bitmap_matches_a_list (n_bits :int )->None :
+    rng =random .Random (n_bits )
+    bitmap =PackedBitmap (n_bits )
+    model =[0 ]*n_bits 
+    for _ in range (200 ):
+        start =rng .randrange (n_bits )
+        count =rng .randint (1 ,n_bits -start )
+        value =rng .randrange (2 )
+        before =model [start :start +count ].count (1 -value )
+        assert bitmap .set_range (start ,count ,value )==before 
+        model [start :start +count ]=[value ]*count 
+
+        assert bitmap ==model 
+        assert bitmap .count (1 )==model .count (1 )
+        assert list (bitmap .iter_zeros ())==[i for i ,bit in enumerate (model )if not bit ]
+        assert list (bitmap .zero_runs ())==zero_runs (model )
+        probe =rng .randrange (n_bits +1 )
+        assert bitmap .prev_one (probe )==max ((i for i in range (probe )if model [i ]),default =-1 )
+    assert bitmap [-1 ]==model [-1 ]
+    with pytest .raises (IndexError ):
+        bitmap [n_bits ]
+
+
+@pytest .mark .parametrize ("goals",[False ,True ])
+@pytest .mark .parametrize ("policy",ALLOCATION_POLICIES )
+@pytest .mark .parametrize ("seed",range (3 ))
+def test_random_operations_keep_invariants (policy :str ,seed :int ,goals :bool )->None :
+    exercise_fsm (FreeSpaceManager (N_BLOCKS ,policy =policy ),random .Random (seed ),goals =goals )
+
+
+@pytest .mark .parametrize ("steps",[1 ,7 ,60 ,400 ])
+def test_free_run_index_matches_the_bitmap (steps :int )->None :
+    fsm =FreeSpaceManager (N_BLOCKS )
+    exercise_fsm (fsm ,random .Random (steps ),steps )
+    runs =zero_runs (fsm .snapshot_bitmap ())
+    assert fsm .free_run_count ()==len (runs )
+    assert fsm .free_run_histogram ()==dict (sorted (Counter (length for _ ,length in runs ).items ()))
+    assert fsm .stats ()["largest_free_run"]==max ((length for _ ,length in runs ),default =0 )
+
+
+def test_first_fit_takes_the_lowest_run_that_fits ()->None :
+    fsm =FreeSpaceManager (200 )
+    fsm .reserve_exact ([3 ,70 ,71 ,140 ])
+    assert fsm .allocate (3 ,contiguous =True )==[0 ,1 ,2 ]
+    assert fsm .allocate (66 ,contiguous =True )==list (range (4 ,70 ))
+    assert fsm .allocate (3 )==[72 ,73 ,74 ]
+    check_invariants (fsm ,{3 ,70 ,71 ,140 ,*range (0 ,3 ),*range (4 ,70 ),72 ,73 ,74 })
+
+
+def test_double_free_and_reserve_of_used_blocks_are_rejected ()->None :
+    fsm =FreeSpaceManager (16 ,preoccupied =[0 ,1 ])
+    blocks =fsm .allocate (4 ,contiguous =True )
+    assert blocks ==[2 ,3 ,4 ,5 ]
+    fsm .free (blocks )
+    with pytest .raises (ValueError ):
+        fsm .free (blocks )
+    with pytest .raises (ValueError ):
+        fsm .reserve_exact ([1 ])
+    with pytest .raises (MemoryError ):
+        fsm .allocate (15 ,contiguous =True )
+
+
+@pytest .mark .parametrize ("manager",MANAGERS )
+@pytest .mark .parametrize ("policy,sizes,starts",[
+("first",[3 ,4 ,5 ],[0 ,3 ,40 ]),
+("best",[3 ,5 ,4 ],[20 ,40 ,0 ]),
+("worst",[3 ,4 ],[60 ,63 ]),
+("next",[3 ,3 ,5 ,2 ,138 ,4 ],[0 ,3 ,40 ,60 ,62 ,6 ]),
+])
+def test_contiguous_policies_pick_the_expected_run (manager ,policy :str ,sizes ,starts )->None :
+    fsm =holes (manager ,policy )
+    assert [fsm .allocate (n ,contiguous =True )[0 ]for n in sizes ]==starts 
+
+
+@pytest .mark .parametrize ("manager",MANAGERS )
+@pytest .mark .parametrize ("policy,n,expected",[
+("first",12 ,[*range (0 ,10 ),20 ,21 ]),
+("next",12 ,[*range (0 ,10 ),20 ,21 ]),
+("best",12 ,list (range (60 ,72 ))),
+("worst",12 ,list (range (60 ,72 ))),
+("best",150 ,[*range (60 ,200 ),*range (0 ,10 )]),
+("worst",150 ,[*range (60 ,200 ),*range (0 ,10 )]),
+])
+def test_scattered_allocations_follow_the_policy (manager ,policy :str ,n :int ,expected )->None :
+    fsm =holes (manager ,policy )
+    assert fsm .allocate (n )==expected 
+    check_invariants (fsm ,{*RESERVED ,*expected })
+
+
+@pytest .mark .parametrize ("manager",MANAGERS )
+def test_next_fit_scatter_starts_at_the_cursor (manager )->None :
+    fsm =holes (manager ,"next")
+    fsm .allocate (2 ,contiguous =True )
+    fsm .allocate (2 ,contiguous =True )
+    assert fsm .allocate (9 )==[4 ,5 ,6 ,7 ,8 ,9 ,20 ,21 ,22 ]
+
+
+@pytest .mark .parametrize ("manager",[*MANAGERS ,SegregatedFreeSpaceManager ])
+@pytest .mark .parametrize ("n,contiguous,goal,expected",[
+(4 ,True ,65 ,[65 ,66 ,67 ,68 ]),
+(4 ,True ,12 ,[6 ,7 ,8 ,9 ]),
+(3 ,True ,58 ,[60 ,61 ,62 ]),
+(6 ,False ,21 ,[4 ,5 ,6 ,7 ,8 ,9 ]),
+(150 ,False ,0 ,[*range (0 ,10 ),20 ,21 ,22 ,*range (40 ,45 ),*range (60 ,192 )]),
+(20 ,True ,190 ,list (range (180 ,200 ))),
+])
+def test_goal_allocation_takes_the_space_nearest_the_goal (manager ,n :int ,contiguous :bool ,goal :int ,expected )->None :
+    fsm =holes (manager ,"first")
+    assert fsm .allocate (n ,contiguous =contiguous ,goal =goal )==expected 
+    with pytest .raises (IndexError ):
+        fsm .allocate (1 ,goal =200 )
+
+
+@pytest .mark .parametrize ("manager",[*MANAGERS ,SegregatedFreeSpaceManager ,BuddyFreeSpaceManager ])
+def test_bitmap_update_receives_a_lazy_view (manager )->None :
+    views =[]
+    fsm =manager (100 ,on_bitmap_update =views .append )
+    blocks =fsm .allocate (5 ,contiguous =True )
+    fsm .allocate (3 )
+    fsm .free (blocks )
+
+    view =views [0 ]
+    assert isinstance (view ,BitmapView )
+    assert all (v is view for v in views )
+    assert len (view )==100 
+    assert view .tolist ()==list (view )==fsm .snapshot_bitmap ()
+    assert [view [i ]for i in range (100 )]==fsm .snapshot_bitmap ()
+    assert view [-1 ]==fsm .snapshot_bitmap ()[-1 ]
+    assert view [3 :9 ]==fsm .snapshot_bitmap ()[3 :9 ]
+    with pytest .raises (IndexError ):
+        view [100 ]
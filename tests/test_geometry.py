@@ -0,0 +1,60 @@
+from __future__ import annotations 
+
+import pytest 
+
+from fsim .core .disk import Disk 
+from fsim .core .geometry import HDDGeometry ,HDDModel ,LatencyModel 
+
+GEOMETRY =HDDGeometry (
+cylinders =100 ,
+heads =1 ,
+sectors_per_track =10 ,
+sector_size =512 ,
+rpm =6000 ,
+track_to_track_ms =1.0 ,
+full_stroke_ms =10.0 ,
+transfer_rate_mb_s =1.0 ,
+)
+
+
+def test_seek_curve_endpoints ()->None :
+    assert GEOMETRY .rotation_ms ==10.0 
+    assert GEOMETRY .seek_time_ms (0 )==0.0 
+    assert GEOMETRY .seek_time_ms (1 )==1.0 
+    assert GEOMETRY .seek_time_ms (50 )==pytest .approx (1.0 +9.0 *(49 /99 )**0.5 )
+    assert GEOMETRY .locate (57 )==(5 ,0 ,7 )
+
+
+def test_access_charges_seek_rotation_and_transfer ()->None :
+    model =HDDModel (GEOMETRY )
+    assert isinstance (model ,LatencyModel )
+
+    assert model .access (5 ,1 ,512 )==pytest .approx (5.0 +0.512 )
+    assert model .access (6 ,1 ,512 )==pytest .approx (0.512 )
+    assert model .access (17 ,1 ,512 )==pytest .approx (1.0 +9.976 +0.512 )
+
+    stats =model .stats ()
+    assert stats ["accesses"]==3 
+    assert stats ["seeks"]==1 
+    assert stats ["seek_distance_cyl"]==1 
+    assert stats ["service_ms"]==pytest .approx (5.512 +0.512 +11.488 )
+    assert stats ["bytes_transferred"]==3 *512 
+
+
+def test_for_disk_sizes_cylinders_and_rejects_unknown_params ()->None :
+    geometry =HDDGeometry .for_disk (1000 ,4096 ,heads =2 ,sectors_per_track =80 )
+    assert geometry .cylinders ==1000 *8 //160 
+    with pytest .raises (ValueError ):
+        HDDGeometry .for_disk (1000 ,4096 ,platters =3 )
+    with pytest .raises (ValueError ):
+        HDDModel (geometry ).access (999 ,2 ,4096 )
+
+
+def test_disk_charges_one_access_per_consecutive_run ()->None :
+    model =HDDModel (HDDGeometry .for_disk (64 ,512 ))
+    disk =Disk (64 ,512 ,latency_model =model )
+    disk .write_range (0 ,b"x"*2048 ,4 )
+    disk .read_blocks ([0 ,1 ,2 ,10 ,11 ])
+    disk .write_block (3 ,None )
+    assert model .accesses ==3 
+    assert model .bytes_transferred ==(4 +5 )*512 
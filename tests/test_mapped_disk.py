@@ -0,0 +1,61 @@
+from __future__ import annotations 
+import random 
+import struct 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .mapped_disk import HEADER_SIZE ,LENGTH_ITEM_SIZE ,MappedDisk 
+
+N_BLOCKS =128 
+BLOCK_SIZE =16 
+
+
+def test_round_trip_matches_model (tmp_path )->None :
+    with MappedDisk (tmp_path /"disk.img",N_BLOCKS ,BLOCK_SIZE )as disk :
+        model =exercise (disk ,random .Random (0 ))
+        assert_matches (disk ,model )
+
+
+def test_image_survives_reopen (tmp_path )->None :
+    path =tmp_path /"disk.img"
+    disk =MappedDisk (path ,N_BLOCKS ,BLOCK_SIZE )
+    model =exercise (disk ,random .Random (1 ))
+    disk .close ()
+    assert disk .closed 
+
+    with MappedDisk .open (path )as reopened :
+        assert (reopened .n_blocks ,reopened .block_size )==(N_BLOCKS ,BLOCK_SIZE )
+        assert_matches (reopened ,model )
+
+
+def test_prefill_zeros_persists (tmp_path )->None :
+    path =tmp_path /"disk.img"
+    MappedDisk (path ,4 ,BLOCK_SIZE ,prefill ="zeros").close ()
+    with MappedDisk .open (path )as disk :
+        assert disk .used_blocks_count ()==4 
+        assert disk .read_block (0 )==bytes (BLOCK_SIZE )
+
+
+def test_rejects_foreign_and_truncated_files (tmp_path )->None :
+    foreign =tmp_path /"foreign.img"
+    foreign .write_bytes (b"not a disk image at all, just some bytes")
+    with pytest .raises (ValueError ):
+        MappedDisk .open (foreign )
+
+    path =tmp_path /"disk.img"
+    MappedDisk (path ,4 ,BLOCK_SIZE ).close ()
+    with path .open ("r+b")as f :
+        f .truncate (path .stat ().st_size -1 )
+    with pytest .raises (ValueError ):
+        MappedDisk .open (path )
+
+
+def test_length_table_is_little_endian_int32 (tmp_path )->None :
+    path =tmp_path /"disk.img"
+    with MappedDisk (path ,4 ,BLOCK_SIZE )as disk :
+        disk .write_block (1 ,b"abc")
+        disk .write_block (2 ,b"")
+    table =path .read_bytes ()[HEADER_SIZE :HEADER_SIZE +4 *LENGTH_ITEM_SIZE ]
+    assert LENGTH_ITEM_SIZE ==4 
+    assert struct .unpack ("<4i",table )==(-1 ,3 ,0 ,-1 )
@@ -0,0 +1,50 @@
+from __future__ import annotations 
+import random 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .metadata_disk import ExtentSet ,MetadataDisk 
+
+BLOCK_SIZE =16 
+
+
+def test_round_trip_matches_model ()->None :
+    disk =MetadataDisk (128 ,BLOCK_SIZE )
+    model =exercise (disk ,random .Random (0 ))
+    assert_matches (disk ,model )
+
+
+def test_extent_set_merges_and_splits ()->None :
+    extents =ExtentSet ()
+    assert extents .add_range (0 ,4 )==4 
+    assert extents .add_range (8 ,10 )==2 
+    assert extents .add_range (3 ,9 )==4 
+    assert extents .extents ()==[(0 ,10 )]
+    assert extents .count ==10 
+
+    assert extents .remove_range (4 ,6 )==2 
+    assert extents .extents ()==[(0 ,4 ),(6 ,4 )]
+    assert 3 in extents and 4 not in extents 
+    assert extents .remove_range (20 ,30 )==0 
+    assert len (extents )==2 
+
+
+def test_empty_payloads_are_tracked_as_extents_only ()->None :
+    disk =MetadataDisk (100000 ,BLOCK_SIZE )
+    disk .write_range (1000 ,b"",5000 )
+    disk .write_block (20000 ,b"pointer!")
+    assert disk .used_blocks_count ()==5001 
+    assert disk .occupancy_extents ()==1 
+    assert disk .metadata_blocks_count ()==1 
+    assert disk .read_block (3000 )==b""
+    assert disk .read_block (20000 )==b"pointer!"
+
+    disk .write_range (1000 ,None ,5000 )
+    assert disk .used_blocks_count ()==1 
+    assert disk .occupancy_extents ()==0 
+
+
+def test_prefill_zeros_reads_back_a_zero_block ()->None :
+    disk =MetadataDisk (1000 ,BLOCK_SIZE ,prefill ="zeros")
+    assert disk .used_blocks_count ()==1000 
+    assert disk .read_block (999 )==bytes (BLOCK_SIZE )
+    assert disk .metadata_blocks_count ()==0 
@@ -0,0 +1,93 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .disk import Disk 
+from fsim .core .raid import RAID_LEVELS ,RaidVolume 
+
+BLOCK_SIZE =16 
+STRIPE =4 
+
+
+def make_volume (level :int ,n_members :int ,n_blocks :int )->RaidVolume :
+    member_blocks =RaidVolume .member_blocks_for (level ,n_members ,n_blocks ,STRIPE )
+    members =[Disk (member_blocks ,BLOCK_SIZE )for _ in range (n_members )]
+    return RaidVolume (members ,level =level ,stripe_blocks =STRIPE ,n_blocks =n_blocks )
+
+
+@pytest .mark .parametrize ("level",RAID_LEVELS )
+def test_round_trip_matches_model (level )->None :
+    volume =make_volume (level ,4 ,96 )
+    model =exercise (volume ,random .Random (level ))
+    assert_matches (volume ,model )
+    assert volume .verify_parity ()==0 
+
+
+def test_raid0_stripes_across_members ()->None :
+    volume =make_volume (0 ,2 ,32 )
+    volume .write_block (5 ,b"five")
+    assert volume .members [1 ].read_block (1 )==b"five"
+    assert volume .read_range (2 ,4 )==[None ,None ,None ,b"five"]
+    assert volume .member_reads ==[2 ,2 ]
+
+
+def test_mirrors_write_every_copy ()->None :
+    raid1 =make_volume (1 ,2 ,16 )
+    raid1 .write_block (3 ,b"m")
+    assert [m .read_block (3 )for m in raid1 .members ]==[b"m",b"m"]
+    assert raid1 .member_writes ==[1 ,1 ]
+
+    raid10 =make_volume (10 ,4 ,32 )
+    raid10 .write_block (STRIPE ,b"x")
+    assert raid10 .member_writes ==[0 ,0 ,1 ,1 ]
+    assert raid10 .raid_stats ()["write_penalty"]==2.0 
+
+
+def test_raid5_partial_writes_use_read_modify_write ()->None :
+    volume =make_volume (5 ,3 ,32 )
+    volume .write_block (1 ,b"a")
+    volume .write_range (5 ,b"b"*BLOCK_SIZE *2 ,2 )
+    stats =volume .raid_stats ()
+    assert stats ["rmw_writes"]==3 
+    assert stats ["full_stripe_writes"]==0 
+    assert stats ["parity_writes"]==3 
+    assert volume .verify_parity ()==0 
+
+
+def test_raid5_full_rows_compute_parity_directly ()->None :
+    volume =make_volume (5 ,3 ,32 )
+    row =STRIPE *2 
+    volume .write_range (row ,bytes (range (row ))*BLOCK_SIZE ,row )
+    stats =volume .raid_stats ()
+    assert stats ["full_stripe_writes"]==1 
+    assert stats ["rmw_writes"]==0 
+    assert stats ["parity_writes"]==STRIPE 
+    assert sum (volume .member_reads )==0 
+    assert volume .verify_parity ()==0 
+
+    volume .write_block (row +1 ,None )
+    assert volume .verify_parity ()==0 
+    volume .members [0 ].write_block (STRIPE ,b"corrupt")
+    assert volume .verify_parity ()==1 
+
+
+def test_invalid_arrays_are_rejected ()->None :
+    with pytest .raises (ValueError ):
+        make_volume (5 ,2 ,16 )
+    with pytest .raises (ValueError ):
+        make_volume (7 ,4 ,16 )
+    with pytest .raises (ValueError ):
+        RaidVolume ([Disk (16 ,BLOCK_SIZE ),Disk (32 ,BLOCK_SIZE )],level =1 )
+
+
+def test_write_block_measures_memoryviews_in_bytes ()->None :
+    volume =make_volume (5 ,3 ,32 )
+    volume .write_block (0 ,memoryview (bytearray (BLOCK_SIZE )).cast ("I"))
+    assert volume .read_block (0 )==bytes (BLOCK_SIZE )
+
+    before =volume .raid_stats ()
+    with pytest .raises (ValueError ):
+        volume .write_block (1 ,memoryview (bytes ([1 ])*BLOCK_SIZE *2 ).cast ("H"))
+    assert volume .raid_stats ()==before 
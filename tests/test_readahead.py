@@ -0,0 +1,107 @@
+from __future__ import annotations 
+
+import pytest 
+
+from fsim .core .cache import BufferCache 
+from fsim .core .disk import Disk 
+from fsim .core .free_space import FreeSpaceManager 
+from fsim .core .readahead import ReadAhead 
+from fsim .fs_strategies .contiguous import ContiguousFS 
+from fsim .fs_strategies .indexed import IndexedFS 
+from fsim .fs_strategies .linked import LinkedFS 
+
+BLOCK_SIZE =64 
+
+
+def make_readahead (**kwargs )->ReadAhead :
+    return ReadAhead (BufferCache (Disk (128 ,BLOCK_SIZE ),32 ),**kwargs )
+
+
+def test_sequential_stream_grows_the_window ()->None :
+    ra =make_readahead ()
+    assert ra .on_read ("f",0 ,2 ,"seq",100 )==(2 ,8 )
+    assert ra .on_read ("f",2 ,2 ,"seq",100 )==(10 ,10 )
+    assert ra .on_read ("f",4 ,2 ,"seq",100 )==(20 ,18 )
+    assert ra .on_read ("f",6 ,2 ,"seq",100 )==(38 ,34 )
+    assert ra .on_read ("f",8 ,2 ,"seq",100 )==(72 ,2 )
+    stats =ra .stats ()
+    assert stats ["sequential_hits"]==4 
+    assert stats ["largest_window"]==64 
+    assert stats ["windows_issued"]==5 
+
+
+def test_window_is_clamped_to_the_file_end ()->None :
+    ra =make_readahead ()
+    assert ra .on_read ("f",0 ,2 ,"seq",6 )==(2 ,4 )
+    assert ra .on_read ("f",2 ,4 ,"seq",6 )is None 
+
+
+def test_random_read_drops_the_stream_and_a_jump_resets_it ()->None :
+    ra =make_readahead ()
+    ra .on_read ("f",0 ,2 ,"seq",100 )
+    assert ra .on_read ("f",40 ,2 ,"rand",100 )is None 
+    assert ra .on_read ("f",2 ,2 ,"seq",100 )==(4 ,8 )
+    assert ra .on_read ("f",60 ,1 ,"seq",100 )==(61 ,4 )
+    assert ra .stats ()["stream_resets"]==2 
+    assert ra .stats ()["sequential_hits"]==0 
+
+
+def test_streams_are_tracked_per_file ()->None :
+    ra =make_readahead ()
+    ra .on_read ("a",0 ,2 ,"seq",100 )
+    ra .on_read ("b",0 ,2 ,"seq",100 )
+    assert ra .on_read ("a",2 ,2 ,"seq",100 )==(10 ,10 )
+    ra .forget ("b")
+    assert ra .on_read ("b",2 ,2 ,"seq",100 )==(4 ,8 )
+
+
+def test_invalid_windows_are_rejected ()->None :
+    with pytest .raises (ValueError ):
+        make_readahead (initial_window =0 )
+    with pytest .raises (ValueError ):
+        make_readahead (initial_window =8 ,max_window =4 )
+
+
+@pytest .mark .parametrize ("fs_class",[ContiguousFS ,LinkedFS ,IndexedFS ])
+def test_sequential_reads_are_served_from_prefetched_blocks (fs_class )->None :
+    disk =Disk (64 ,BLOCK_SIZE )
+    cache =BufferCache (disk ,32 )
+    ra =ReadAhead (cache )
+    fs =fs_class (cache ,FreeSpaceManager (64 ),readahead =ra )
+    fs .create ("f",8 )
+    fs .write ("f",0 ,8 ,[bytes ([65 +k ])*8 for k in range (8 )])
+    for i in range (64 ):
+        cache .invalidate (i )
+
+    first =fs .read ("f",0 ,2 ,"seq")
+    misses =cache .misses 
+    rest =fs .read ("f",2 ,6 ,"seq")
+    assert first +rest ==[bytes ([65 +k ])*8 for k in range (8 )]
+    assert cache .misses ==misses 
+    stats =ra .stats ()
+    assert stats ["prefetched_blocks"]==6 
+    assert stats ["prefetch_used"]==6 
+    assert stats ["accuracy_pct"]==100.0 
+
+
+def test_random_reads_do_not_prefetch ()->None :
+    cache =BufferCache (Disk (64 ,BLOCK_SIZE ),32 )
+    ra =ReadAhead (cache )
+    fs =ContiguousFS (cache ,FreeSpaceManager (64 ),readahead =ra )
+    fs .create ("f",8 )
+    fs .read ("f",0 ,2 ,"rand")
+    assert cache .prefetch_issued ==0 
+
+
+@pytest .mark .parametrize ("fs_class",[ContiguousFS ,LinkedFS ,IndexedFS ])
+def test_delete_forgets_the_file_stream (fs_class )->None :
+    cache =BufferCache (Disk (64 ,BLOCK_SIZE ),32 )
+    ra =ReadAhead (cache )
+    fs =fs_class (cache ,FreeSpaceManager (64 ),readahead =ra )
+    fs .create ("f",8 )
+    fs .read ("f",0 ,2 ,"seq")
+    fs .delete ("f")
+
+    fs .create ("f",8 )
+    fs .read ("f",2 ,2 ,"seq")
+    assert ra .stats ()["sequential_hits"]==0 
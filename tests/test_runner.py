@@ -0,0 +1,205 @@
+from __future__ import annotations 
+from typing import Any ,Dict 
+
+import pytest 
+
+from fsim .sim .runner import run_simulation 
+
+SMALL ={
+"disk_size":512 ,
+"block_size":64 ,
+"n_files_small":12 ,
+"file_small_range":[1 ,8 ],
+"n_files_large":2 ,
+"file_large_range":[16 ,48 ],
+"access_pattern":{"seq":0.6 ,"rand":0.4 },
+"delete_rate":0.2 ,
+"ops":120 ,
+}
+
+
+def run (strategy :str ="contiguous",**overrides :Any )->Dict [str ,Any ]:
+    summaries ,_ =run_simulation (strategy ,None ,None ,1 ,{**SMALL ,**overrides })
+    return summaries [strategy ]
+
+
+def test_mmap_backend_writes_an_image (tmp_path )->None :
+    summary =run (disk_backend ="mmap",disk_image_dir =str (tmp_path ))
+    assert summary ["disk_image"]==str (tmp_path /"custom_contiguous.img")
+    assert (tmp_path /"custom_contiguous.img").exists ()
+
+
+def test_unknown_disk_backend_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        run (disk_backend ="tape")
+
+
+def test_sparse_backend_reports_resident_pages ()->None :
+    summary =run (disk_backend ="sparse",sparse_page_blocks =32 )
+    assert 0 <summary ["disk_materialized_pages"]<=SMALL ["disk_size"]//32 
+    assert summary ["disk_resident_bytes"]>0 
+
+
+def test_zero_copy_reads_do_not_change_results ()->None :
+    keys =("seeks_total_est","ops_count","space_usage_pct")
+    for strategy in ("contiguous","linked","indexed"):
+        plain =run (strategy )
+        viewing =run (strategy ,zero_copy_reads =True )
+        assert [plain [k ]for k in keys ]==[viewing [k ]for k in keys ]
+
+
+def test_metadata_backend_matches_memory_backend ()->None :
+    keys =("seeks_total_est","ops_count","space_usage_pct")
+    for strategy in ("contiguous","linked","indexed"):
+        memory =run (strategy )
+        metadata =run (strategy ,disk_backend ="metadata")
+        assert [memory [k ]for k in keys ]==[metadata [k ]for k in keys ]
+    assert run (disk_backend ="metadata")["disk_occupancy_extents"]>0 
+
+
+def test_dedup_backend_reports_dedup_stats ()->None :
+    stats =run (disk_backend ="dedup")["disk_dedup"]
+    assert stats ["referenced_blocks"]>0 
+    assert stats ["unique_payloads"]<=stats ["referenced_blocks"]
+    assert stats ["dedup_ratio"]>=1.0 
+
+
+def test_hdd_geometry_adds_simulated_latency ()->None :
+    summary =run (hdd_geometry =True )
+    assert summary ["hdd_model"]["accesses"]>0 
+    assert summary ["sim_total_time_ms"]==pytest .approx (summary ["hdd_model"]["service_ms"],abs =0.01 )
+    assert "sim_avg_latency_ms"not in run ()
+
+
+def test_io_scheduler_reports_queue_stats_and_comparison ()->None :
+    summary =run (io_scheduler ="sstf",queue_depth =4 )
+    assert summary ["io_scheduler"]["algorithm"]=="sstf"
+    assert summary ["io_scheduler"]["requests"]>0 
+    assert set (summary ["io_scheduler_comparison"])=={"fcfs","sstf","scan","clook"}
+    assert summary ["io_scheduler_comparison"]["sstf"]["requests"]==summary ["io_scheduler"]["requests"]
+
+
+def test_cache_policy_counts_hits_from_the_cache ()->None :
+    summary =run (cache_policy ="arc",cache_blocks =32 )
+    stats =summary ["buffer_cache"]
+    assert stats ["policy"]=="arc"
+    assert stats ["capacity_blocks"]==32 
+    assert stats ["hits"]+stats ["misses"]>0 
+
+
+def test_cache_write_back_reports_coalescing_and_final_sync ()->None :
+    summary =run (cache_write_back =True ,cache_blocks =64 ,hdd_geometry =True )
+    stats =summary ["buffer_cache"]
+    assert stats ["write_back"]is True 
+    assert stats ["dirty_blocks"]==0 
+    assert stats ["physical_writes"]<=stats ["logical_writes"]
+    assert "final_sync_ms"in stats 
+
+
+def test_readahead_reports_window_and_accuracy_stats ()->None :
+    summary =run (readahead ={"initial_window":2 ,"max_window":16 },cache_blocks =64 )
+    stats =summary ["readahead"]
+    assert stats ["initial_window"]==2 
+    assert stats ["max_window"]==16 
+    assert stats ["largest_window"]<=16 
+    assert stats ["prefetch_used"]+stats ["prefetch_wasted"]+stats ["prefetch_pending"]==stats ["prefetched_blocks"]
+
+
+def test_ssd_backend_reports_write_amplification_and_wear ()->None :
+    summary =run (disk_backend ="ssd",ssd ={"pages_per_block":8 ,"gc_threshold":2 })
+    stats =summary ["ssd"]
+    assert stats ["pages_per_block"]==8 
+    assert stats ["write_amplification"]>=1.0 
+    assert len (summary ["ssd_erase_counts"])==stats ["erase_blocks"]
+
+
+def test_zoned_backend_reports_zone_stats ()->None :
+    summary =run (disk_backend ="zoned",zoned ={"zone_blocks":64 })
+    stats =summary ["zoned"]
+    assert stats ["zones"]==8 
+    assert stats ["device_blocks_written"]>=stats ["host_blocks_written"]
+
+
+def test_raid_reports_member_counters ()->None :
+    summary =run (raid ={"level":5 ,"members":3 ,"stripe_blocks":8 },hdd_geometry =True )
+    stats =summary ["raid"]
+    assert stats ["level"]==5 
+    assert len (stats ["member_writes"])==3 
+    assert stats ["rmw_writes"]+stats ["full_stripe_writes"]>0 
+    assert len (stats ["member_latency"]["members"])==3 
+
+
+def test_tiered_reports_migration_stats ()->None :
+    summary =run (tiered ={"fast_blocks":32 ,"migration_budget":4 })
+    stats =summary ["tiered"]
+    assert stats ["fast_blocks"]==32 
+    assert stats ["fast_resident"]<=32 
+    assert stats ["promotions"]>=stats ["demotions"]
+    assert "slow"in stats ["latency"]
+
+
+def test_summary_reports_device_io_and_heatmap ()->None :
+    summary =run ()
+    stats =summary ["disk_io"]
+    assert stats ["writes"]>0 
+    assert stats ["blocks_accessed"]<=SMALL ["disk_size"]
+    assert len (summary ["disk_heatmap"])==64 
+    assert sum (summary ["disk_heatmap"])>=stats ["reads"]+stats ["writes"]
+
+
+def test_pwrite_rate_reports_byte_io ()->None :
+    summary =run (pwrite_rate =0.5 ,pwrite_bytes =[1 ,200 ])
+    stats =summary ["byte_io"]
+    assert stats ["payload_size"]==SMALL ["block_size"]
+    assert stats ["pwrite_ops"]>0 
+    assert stats ["pwrite_amplification"]>=1.0 
+
+
+def test_extent_free_space_manager_reports_policy_stats ()->None :
+    summary =run (free_space_manager ="extent",allocation_policy ="best")
+    stats =summary ["free_space"]
+    assert stats ["policy"]=="best"
+    assert stats ["free_extents"]>=1 
+
+
+def test_unknown_free_space_manager_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        run (free_space_manager ="tree")
+
+
+def test_bitmap_manager_reports_free_run_histogram ()->None :
+    stats =run ()["free_space"]
+    assert stats ["free_runs"]==sum (stats ["free_run_histogram"].values ())
+    assert stats ["largest_free_run"]==max (stats ["free_run_histogram"],default =0 )
+
+
+@pytest .mark .parametrize ("manager",["bitmap","extent"])
+def test_allocation_policy_applies_to_both_managers (manager )->None :
+    stats =run (free_space_manager =manager ,allocation_policy ="worst",disk_size =64 )["free_space"]
+    assert stats ["policy"]=="worst"
+    assert stats ["alloc_failures"]>0 
+    assert isinstance (stats ["first_alloc_failure_op"],int )
+    with pytest .raises (ValueError ):
+        run (free_space_manager =manager ,allocation_policy ="fastest")
+
+
+def test_buddy_manager_reports_internal_fragmentation ()->None :
+    stats =run (free_space_manager ="buddy")["free_space"]
+    assert stats ["wasted_blocks"]>=0 
+    assert stats ["internal_fragmentation_pct"]>0 
+    with pytest .raises (ValueError ):
+        run (free_space_manager ="buddy",allocation_policy ="best")
+
+
+def test_segregated_manager_reports_size_classes ()->None :
+    stats =run (free_space_manager ="segregated",size_classes =[1 ,2 ,4 ,8 ])["free_space"]
+    assert list (stats ["size_classes"])==["1","2-3","4-7","8+"]
+    assert sum (c ["requests"]for c in stats ["size_classes"].values ())>0 
+
+
+def test_goal_allocation_leaves_contiguous_results_unchanged ()->None :
+    baseline =run ()
+    clustered =run (goal_allocation =True )
+    assert clustered ["free_space"]==baseline ["free_space"]
+    for strategy in ("linked","indexed"):
+        assert run (strategy =strategy ,goal_allocation =True )["seeks_total_est"]<=run (strategy =strategy )["seeks_total_est"]
@@ -0,0 +1,86 @@
+from __future__ import annotations 
+from typing import List 
+
+import pytest 
+
+from fsim .core .disk import Disk 
+from fsim .core .geometry import HDDGeometry ,HDDModel 
+from fsim .core .scheduler import SCHEDULER_ALGORITHMS ,IOScheduler ,RequestQueue 
+
+BLOCK_SIZE =512 
+GEOMETRY =HDDGeometry (cylinders =100 ,heads =1 ,sectors_per_track =10 ,sector_size =BLOCK_SIZE )
+QUEUE =[50 ,10 ,80 ,30 ,90 ]
+
+
+class RecordingModel (HDDModel ):
+
+    def __init__ (self ,geometry :HDDGeometry )->None :
+        super ().__init__ (geometry )
+        self .served :List [int ]=[]
+
+    def access (self ,start_block :int ,count :int ,block_size :int ,is_write :bool =False )->float :
+        self .served .append (start_block )
+        return super ().access (start_block ,count ,block_size ,is_write )
+
+
+def dispatch_order (algorithm :str )->List [int ]:
+    model =RecordingModel (GEOMETRY )
+    model .access (40 ,1 ,BLOCK_SIZE )
+    queue =RequestQueue (model ,BLOCK_SIZE ,algorithm =algorithm ,queue_depth =len (QUEUE )+1 )
+    for block in QUEUE :
+        queue .submit (block ,1 ,False )
+    assert queue .pending ()==len (QUEUE )
+    queue .drain ()
+    return model .served [1 :]
+
+
+@pytest .mark .parametrize ("algorithm,expected",[
+("fcfs",[50 ,10 ,80 ,30 ,90 ]),
+("sstf",[50 ,30 ,10 ,80 ,90 ]),
+("scan",[50 ,80 ,90 ,30 ,10 ]),
+("clook",[50 ,80 ,90 ,10 ,30 ]),
+])
+def test_dispatch_order_on_a_fixed_queue (algorithm :str ,expected :List [int ])->None :
+    assert dispatch_order (algorithm )==expected 
+
+
+def test_scan_travels_to_the_edge_before_reversing ()->None :
+    model =HDDModel (GEOMETRY )
+    model .access (40 ,1 ,BLOCK_SIZE )
+    queue =RequestQueue (model ,BLOCK_SIZE ,algorithm ="scan",queue_depth =8 )
+    for block in QUEUE :
+        queue .submit (block ,1 ,False )
+    queue .drain ()
+    assert model .seek_distance ==4 +(99 -4 )+(99 -1 )
+
+
+def test_full_queue_dispatches_one_request ()->None :
+    model =HDDModel (GEOMETRY )
+    queue =RequestQueue (model ,BLOCK_SIZE ,queue_depth =2 )
+    queue .submit (10 ,1 ,False )
+    assert model .accesses ==0 
+    queue .submit (20 ,1 ,False )
+    assert (model .accesses ,queue .pending ())==(1 ,1 )
+    assert queue .stats ()["max_queue_len"]==2 
+
+
+def test_invalid_algorithm_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        RequestQueue (HDDModel (GEOMETRY ),BLOCK_SIZE ,algorithm ="elevator")
+
+
+def test_scheduler_serves_data_and_compares_algorithms ()->None :
+    disk =Disk (1000 ,BLOCK_SIZE )
+    scheduler =IOScheduler (disk ,HDDModel (GEOMETRY ),algorithm ="sstf",queue_depth =4 )
+    for block in QUEUE :
+        scheduler .write_block (block ,bytes ([block ]))
+    scheduler .drain ()
+    assert scheduler .read_range (50 ,2 )==[bytes ([50 ]),None ]
+    assert scheduler .used_blocks_count ()==len (QUEUE )
+    scheduler .drain ()
+
+    comparison =scheduler .compare_algorithms ()
+    assert set (comparison )==set (SCHEDULER_ALGORITHMS )
+    assert all (stats ["requests"]==len (QUEUE )+1 for stats in comparison .values ())
+    assert comparison ["sstf"]["seek_distance_cyl"]<=comparison ["fcfs"]["seek_distance_cyl"]
+    assert not hasattr (scheduler ,"read_block_view")
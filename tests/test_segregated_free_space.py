@@ -0,0 +1,82 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from fsm_model import check_invariants ,exercise_fsm 
+from fsim .core .free_space import ALLOCATION_POLICIES 
+from fsim .core .segregated_free_space import SegregatedFreeSpaceManager 
+
+HOLES =[(0 ,3 ),(10 ,8 ),(30 ,5 ),(50 ,7 ),(70 ,30 )]
+
+
+def holes (**kwargs )->SegregatedFreeSpaceManager :
+    free ={i for start ,length in HOLES for i in range (start ,start +length )}
+    fsm =SegregatedFreeSpaceManager (100 ,preoccupied =[i for i in range (100 )if i not in free ],**kwargs )
+    assert fsm .free_runs ()==HOLES 
+    return fsm 
+
+
+@pytest .mark .parametrize ("goals",[False ,True ])
+@pytest .mark .parametrize ("policy",ALLOCATION_POLICIES )
+@pytest .mark .parametrize ("seed",range (2 ))
+def test_random_operations_keep_invariants (policy :str ,seed :int ,goals :bool )->None :
+    exercise_fsm (SegregatedFreeSpaceManager (300 ,policy =policy ),random .Random (seed ),goals =goals )
+
+
+def test_size_classes_and_labels ()->None :
+    fsm =SegregatedFreeSpaceManager (16 )
+    assert [fsm .class_of (n )for n in (1 ,3 ,5 ,7 ,31 ,32 ,500 )]==[0 ,2 ,3 ,4 ,8 ,9 ,9 ]
+    assert [fsm .class_label (c )for c in (0 ,3 ,9 )]==["1","4-5","32+"]
+    with pytest .raises (ValueError ):
+        SegregatedFreeSpaceManager (16 ,size_classes =(2 ,4 ))
+
+
+def test_exact_class_request_takes_a_run_of_that_class ()->None :
+    fsm =holes ()
+    assert fsm .allocate (3 ,contiguous =True )==[0 ,1 ,2 ]
+    assert fsm .allocate (8 ,contiguous =True )==list (range (10 ,18 ))
+    stats =fsm .stats ()["size_classes"]
+    assert stats ["3"]=={"free_runs":0 ,"free_blocks":0 ,"free_blocks_pct":0.0 ,"requests":1 ,"hits":1 }
+    assert stats ["8-11"]["hits"]==1 
+
+
+def test_small_scattered_request_is_served_from_one_run ()->None :
+    fsm =holes ()
+    blocks =fsm .allocate (3 )
+    assert blocks ==[0 ,1 ,2 ]
+    check_invariants (fsm ,{i for i in range (100 )if i not in {*range (10 ,18 ),*range (30 ,35 ),*range (50 ,57 ),*range (70 ,100 )}})
+
+
+def test_large_requests_fall_back_to_the_base_policy ()->None :
+    fsm =holes (policy ="best")
+    assert fsm .allocate (33 ,contiguous =False )==[*range (70 ,100 ),10 ,11 ,12 ]
+    assert fsm .stats ()["fallbacks"]==1 
+    with pytest .raises (MemoryError ):
+        fsm .allocate (40 ,contiguous =True )
+
+
+def test_exact_length_runs_are_taken_first ()->None :
+    fsm =holes ()
+    assert fsm .allocate (5 ,contiguous =True )[0 ]==30 
+    assert fsm .allocate (7 ,contiguous =True )[0 ]==50 
+    assert fsm .allocate (2 ,contiguous =True )[0 ]==0 
+
+
+def test_longer_runs_of_the_same_class_are_taken_before_higher_classes ()->None :
+    fsm =holes ()
+    assert fsm .allocate (4 ,contiguous =True )==[30 ,31 ,32 ,33 ]
+    assert fsm .allocate (6 ,contiguous =True )[0 ]==50 
+    assert fsm .allocate (1 ,contiguous =True )[0 ]==34 
+    assert fsm .stats ()["size_classes"]["4-5"]["hits"]==1 
+
+
+def test_each_request_counts_at_most_one_fallback ()->None :
+    fsm =holes (policy ="best")
+    fsm .allocate (33 )
+    assert fsm .fallbacks ==1 
+    with pytest .raises (MemoryError ):
+        fsm .allocate (40 ,contiguous =True )
+    assert fsm .fallbacks ==2 
+    fsm .allocate (2 ,contiguous =True )
+    assert fsm .fallbacks ==2 
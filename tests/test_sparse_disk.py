@@ -0,0 +1,89 @@
+from __future__ import annotations 
+import random 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .free_space import FreeSpaceManager 
+from fsim .core .sparse_disk import SparseDisk 
+from fsim .fs_strategies .contiguous import ContiguousFS 
+
+BLOCK_SIZE =16 
+
+
+def test_round_trip_matches_model ()->None :
+    disk =SparseDisk (128 ,BLOCK_SIZE ,page_blocks =16 )
+    model =exercise (disk ,random .Random (0 ))
+    assert_matches (disk ,model )
+
+
+def test_pages_materialize_on_first_write ()->None :
+    disk =SparseDisk (1000000 ,BLOCK_SIZE ,page_blocks =64 )
+    assert disk .materialized_pages ()==0 
+    assert disk .resident_bytes ()==0 
+    assert disk .read_block (999999 )is None 
+
+    disk .write_block (5 ,b"abc")
+    disk .write_block (63 ,b"def")
+    assert disk .materialized_pages ()==1 
+    disk .write_block (64 ,b"ghi")
+    assert disk .materialized_pages ()==2 
+    assert disk .read_block (63 )==b"def"
+
+
+def test_empty_payload_keeps_page_data_unallocated ()->None :
+    disk =SparseDisk (256 ,BLOCK_SIZE ,page_blocks =64 )
+    disk .write_block (0 ,b"")
+    assert disk .read_block (0 )==b""
+    assert disk .resident_bytes ()==64 *4 
+
+
+def test_prefill_zeros_without_materializing ()->None :
+    disk =SparseDisk (1000 ,BLOCK_SIZE ,prefill ="zeros",page_blocks =64 )
+    assert disk .used_blocks_count ()==1000 
+    assert disk .read_block (999 )==bytes (BLOCK_SIZE )
+    assert disk .materialized_pages ()==0 
+
+    disk .clear_block (999 )
+    assert disk .used_blocks_count ()==999 
+    assert disk .read_block (999 )is None 
+
+
+def test_zero_copy_view_of_untouched_prefilled_block ()->None :
+    disk =SparseDisk (1000 ,BLOCK_SIZE ,prefill ="zeros",page_blocks =64 )
+    view =disk .read_block_view (500 )
+    assert isinstance (view ,memoryview )
+    assert bytes (view )==bytes (BLOCK_SIZE )
+    assert disk .materialized_pages ()==0 
+
+    disk .write_block (501 ,b"abc")
+    assert bytes (disk .read_block_view (501 ))==b"abc"
+
+
+def test_clearing_the_last_live_block_releases_the_page ()->None :
+    disk =SparseDisk (256 ,BLOCK_SIZE ,page_blocks =64 )
+    disk .write_range (60 ,b"x"*BLOCK_SIZE *8 ,8 )
+    assert disk .materialized_pages ()==2 
+    disk .write_range (64 ,None ,4 )
+    assert disk .materialized_pages ()==1 
+    for i in range (60 ,63 ):
+        disk .clear_block (i )
+    assert disk .materialized_pages ()==1 
+    disk .clear_block (63 )
+    assert disk .materialized_pages ()==0 
+    assert disk .resident_bytes ()==0 
+    assert disk .read_block (63 )is None 
+
+
+def test_trim_on_delete_releases_pages ()->None :
+    disk =SparseDisk (1024 ,BLOCK_SIZE ,page_blocks =16 )
+    fs =ContiguousFS (disk ,FreeSpaceManager (1024 ))
+    fs .create ("keep",4 )
+    fs .write ("keep",0 ,4 ,[b"k"]*4 )
+    fs .create ("f",40 )
+    fs .write ("f",0 ,40 ,[b"x"]*40 )
+    assert disk .materialized_pages ()==3 
+    cleared =disk .stats ()["cleared_blocks"]
+
+    fs .delete ("f")
+    assert disk .materialized_pages ()==1 
+    assert disk .stats ()["cleared_blocks"]==cleared +40 
+    assert disk .used_blocks_count ()==4 
@@ -0,0 +1,116 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .ssd import FlashTranslationLayer ,SSDDisk 
+
+BLOCK_SIZE =16 
+
+
+def small_ftl (**kwargs )->FlashTranslationLayer :
+    params ={"pages_per_block":4 ,"overprovision":0.0 ,"gc_threshold":2 }
+    params .update (kwargs )
+    return FlashTranslationLayer (16 ,**params )
+
+
+def test_round_trip_matches_model ()->None :
+    disk =SSDDisk (64 ,BLOCK_SIZE ,pages_per_block =8 )
+    model =exercise (disk ,random .Random (0 ))
+    assert_matches (disk ,model )
+
+
+def test_sequential_writes_have_no_amplification ()->None :
+    ftl =small_ftl ()
+    assert ftl .erase_blocks ==8 
+    ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+    assert ftl .write_amplification ()==1.0 
+    assert ftl .gc_runs ==0 
+
+
+def test_greedy_gc_reclaims_fully_invalid_blocks_without_moving_pages ()->None :
+    ftl =small_ftl ()
+    ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+    for _ in range (3 ):
+        ftl .access (0 ,4 ,BLOCK_SIZE ,is_write =True )
+
+    assert ftl .gc_runs ==1 
+    assert ftl .gc_stalls ==1 
+    assert ftl .gc_pages_moved ==0 
+    assert ftl .erase_counts ()[0 ]==1 
+    assert ftl .write_amplification ()==1.0 
+
+
+def test_gc_pass_without_work_is_not_a_stall ()->None :
+    ftl =small_ftl ()
+    ftl ._collect ()
+    assert (ftl .gc_runs ,ftl .gc_stalls ,ftl .gc_stall_ms )==(0 ,0 ,0.0 )
+
+
+def test_random_overwrites_amplify_writes ()->None :
+    ftl =small_ftl ()
+    rng =random .Random (1 )
+    ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+    for _ in range (200 ):
+        ftl .access (rng .randrange (16 ),1 ,BLOCK_SIZE ,is_write =True )
+
+    assert ftl .gc_runs >0 
+    assert ftl .gc_pages_moved >0 
+    assert ftl .flash_writes ==ftl .host_writes +ftl .gc_pages_moved 
+    assert 0 <ftl .gc_stalls <=ftl .gc_runs 
+    assert ftl .write_amplification ()>1.0 
+    assert sum (ftl .erase_counts ())==ftl .erases 
+
+
+def test_trim_lowers_gc_work ()->None :
+    def moved (trim :bool )->int :
+        ftl =small_ftl ()
+        rng =random .Random (2 )
+        ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+        if trim :
+            assert ftl .trim (8 ,8 )==8 
+            assert ftl .trim (8 ,8 )==0 
+        for _ in range (200 ):
+            ftl .access (rng .randrange (8 ),1 ,BLOCK_SIZE ,is_write =True )
+        return ftl .gc_pages_moved 
+
+    assert moved (True )<moved (False )
+
+
+def test_static_wear_leveling_migrates_cold_blocks ()->None :
+    def spread (wear_leveling :bool ):
+        ftl =small_ftl (wear_leveling =wear_leveling ,wear_threshold =2 )
+        ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+        for _ in range (300 ):
+            ftl .access (0 ,4 ,BLOCK_SIZE ,is_write =True )
+        wear =ftl .erase_counts ()
+        return max (wear )-min (wear ),ftl .wear_migrations 
+
+    leveled ,migrations =spread (True )
+    unleveled ,_ =spread (False )
+    assert migrations >0 
+    assert leveled <unleveled 
+
+
+def test_cost_benefit_policy_is_accepted_and_invalid_params_rejected ()->None :
+    ftl =small_ftl (gc_policy ="cost-benefit")
+    ftl .access (0 ,16 ,BLOCK_SIZE ,is_write =True )
+    for k in range (40 ):
+        ftl .access (k %16 ,1 ,BLOCK_SIZE ,is_write =True )
+    assert ftl .gc_runs >0 
+    with pytest .raises (ValueError ):
+        small_ftl (gc_policy ="fifo")
+    with pytest .raises (ValueError ):
+        small_ftl (gc_threshold =0 )
+
+
+def test_ssd_disk_trims_cleared_blocks ()->None :
+    disk =SSDDisk (16 ,BLOCK_SIZE ,pages_per_block =4 )
+    disk .write_range (0 ,b"x"*BLOCK_SIZE *8 ,8 )
+    disk .write_block (2 ,None )
+    disk .trim ([4 ,5 ,6 ])
+    assert disk .ftl .trimmed_pages ==4 
+    assert disk .stats ()["cleared_blocks"]==4 
+    assert disk .ftl .host_writes ==8 
+    assert [disk .read_block (i )is None for i in range (8 )]==[False ,False ,True ,False ,True ,True ,True ,False ]
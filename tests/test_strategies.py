@@ -0,0 +1,193 @@
+from __future__ import annotations 
+from typing import List 
+
+import pytest 
+
+from fsim .core .disk import Disk 
+from fsim .core .extents import physical_runs 
+from fsim .core .free_space import FreeSpaceManager 
+from fsim .fs_strategies .contiguous import ContiguousFS 
+from fsim .fs_strategies .indexed import IndexedFS 
+from fsim .fs_strategies .linked import LinkedFS 
+
+STRATEGIES =[ContiguousFS ,LinkedFS ,IndexedFS ]
+BLOCK_SIZE =64 
+
+
+def make_fs (fs_class ,n_blocks :int =64 ,**kwargs ):
+    disk =Disk (n_blocks ,BLOCK_SIZE )
+    return fs_class (disk ,FreeSpaceManager (n_blocks ),**kwargs )
+
+
+def payloads (fs ,n :int )->List [bytes ]:
+    room =BLOCK_SIZE -8 if isinstance (fs ,LinkedFS )else BLOCK_SIZE 
+    return [bytes ([65 +k ])*(room -k )for k in range (n )]
+
+
+@pytest .mark .parametrize ("fs_class",STRATEGIES )
+def test_zero_copy_reads_return_views_with_the_same_bytes (fs_class )->None :
+    copying =make_fs (fs_class )
+    viewing =make_fs (fs_class ,zero_copy_reads =True )
+    for fs in (copying ,viewing ):
+        fs .create ("a",6 )
+        fs .write ("a",1 ,4 ,payloads (fs ,4 ))
+
+    expected =copying .read ("a",0 ,6 )
+    got =viewing .read ("a",0 ,6 )
+    assert all (isinstance (p ,bytes )for p in expected )
+    assert all (isinstance (p ,memoryview )for p in got )
+    assert [bytes (p )for p in got ]==expected 
+    assert expected [1 :5 ]==payloads (copying ,4 )
+
+
+def test_zero_copy_views_alias_the_disk_buffer ()->None :
+    disk =Disk (4 ,BLOCK_SIZE )
+    disk .write_block (2 ,b"before")
+    view =disk .read_block_view (2 )
+    disk .write_block (2 ,b"after!")
+    assert bytes (view )==b"after!"
+    assert disk .read_block_view (0 )is None 
+    assert [bytes (v )for v in disk .read_blocks ([2 ],zero_copy =True )]==[b"after!"]
+
+
+def test_zero_copy_is_ignored_without_read_block_view ()->None :
+    class PlainDisk :
+        def __init__ (self )->None :
+            self .n_blocks ,self .block_size ,self .data =16 ,BLOCK_SIZE ,{}
+
+        def read_block (self ,i :int ):
+            return self .data .get (i )
+
+        def write_block (self ,i :int ,data )->None :
+            self .data [i ]=data 
+
+        def write_blocks (self ,indices ,payloads )->None :
+            for i ,p in zip (indices ,payloads ):
+                self .write_block (i ,p )
+
+    fs =ContiguousFS (PlainDisk (),FreeSpaceManager (16 ),zero_copy_reads =True )
+    assert not fs .zero_copy_reads 
+    fs .create ("a",2 )
+    fs .write ("a",0 ,2 ,[b"x",b"y"])
+    assert fs .read ("a",0 ,2 )==[b"x",b"y"]
+
+
+class CountingDisk (Disk ):
+
+    def __init__ (self ,n_blocks :int ,block_size :int )->None :
+        super ().__init__ (n_blocks ,block_size )
+        self .calls :List [str ]=[]
+
+    def read_range (self ,start ,count ,*,zero_copy =False ):
+        self .calls .append ("read_range")
+        return super ().read_range (start ,count ,zero_copy =zero_copy )
+
+    def write_range (self ,start ,payload_buffer ,count =None ):
+        self .calls .append ("write_range")
+        super ().write_range (start ,payload_buffer ,count )
+
+    def write_blocks (self ,indices ,payloads ):
+        self .calls .append ("write_blocks")
+        super ().write_blocks (indices ,payloads )
+
+
+def test_physical_runs_split_on_gaps ()->None :
+    assert physical_runs ([3 ,4 ,5 ,9 ,10 ,2 ])==[(3 ,3 ),(9 ,2 ),(2 ,1 )]
+    assert physical_runs ([])==[]
+
+
+def test_contiguous_file_moves_each_extent_with_one_range_call ()->None :
+    disk =CountingDisk (32 ,BLOCK_SIZE )
+    fs =ContiguousFS (disk ,FreeSpaceManager (32 ))
+    fs .create ("a",8 )
+    disk .calls .clear ()
+
+    data =[b"x"*BLOCK_SIZE ]*5 +[b"tail"]
+    fs .write ("a",1 ,6 ,data )
+    assert disk .calls ==["write_range"]
+    assert fs .read ("a",1 ,6 )==data 
+    assert disk .calls ==["write_range","read_range"]
+
+
+def test_run_that_is_not_one_extent_falls_back_to_write_blocks ()->None :
+    disk =CountingDisk (32 ,BLOCK_SIZE )
+    fs =ContiguousFS (disk ,FreeSpaceManager (32 ))
+    fs .create ("a",3 )
+    disk .calls .clear ()
+
+    data =[b"short",b"x"*BLOCK_SIZE ,b""]
+    fs .write ("a",0 ,3 ,data )
+    assert disk .calls ==["write_blocks"]
+    assert fs .read ("a",0 ,3 )==data 
+
+
+def test_unaligned_pwrite_reads_and_rewrites_the_boundary_blocks ()->None :
+    fs =make_fs (ContiguousFS )
+    fs .create ("f",4 )
+    assert fs .pwrite ("f",60 ,b"z"*72 )==72 
+
+    stats =fs .byte_io_stats ()
+    assert stats ["rmw_read_blocks"]==2 
+    assert stats ["pwrite_blocks_written"]==3 
+    assert stats ["unaligned_pwrites"]==1 
+    assert stats ["pwrite_amplification"]==round (5 *BLOCK_SIZE /72 ,3 )
+    assert fs .pread ("f",56 ,80 )==bytes (4 )+b"z"*72 +bytes (4 )
+
+
+def test_aligned_pwrite_skips_the_read ()->None :
+    fs =make_fs (ContiguousFS )
+    fs .create ("f",4 )
+    fs .pwrite ("f",BLOCK_SIZE ,b"a"*BLOCK_SIZE *2 )
+    stats =fs .byte_io_stats ()
+    assert stats ["rmw_read_blocks"]==0 
+    assert stats ["unaligned_pwrites"]==0 
+    assert stats ["pwrite_amplification"]==1.0 
+
+
+@pytest .mark .parametrize ("fs_class",STRATEGIES )
+def test_pread_and_pwrite_use_the_payload_space (fs_class )->None :
+    fs =make_fs (fs_class )
+    fs .create ("f",3 )
+    cap =fs .payload_size 
+    assert cap ==(BLOCK_SIZE -8 if fs_class is LinkedFS else BLOCK_SIZE )
+    fs .pwrite ("f",cap -2 ,b"abcd")
+    assert fs .pread ("f",cap -3 ,6 )==b"\x00abcd\x00"
+    assert fs .read ("f",1 ,1 )==[b"cd"]
+    assert fs .pwrite ("f",3 *cap -1 ,b"xyz")==1 
+    assert fs .pread ("f",3 *cap -1 ,10 )==b"x"
+    with pytest .raises (ValueError ):
+        fs .pwrite ("f",3 *cap ,b"x")
+
+
+class RecordingManager (FreeSpaceManager ):
+
+    def __init__ (self ,n_blocks :int )->None :
+        super ().__init__ (n_blocks )
+        self .calls :List [tuple ]=[]
+
+    def allocate (self ,n :int ,contiguous :bool =False ,goal =None )->List [int ]:
+        self .calls .append ((n ,goal ))
+        return super ().allocate (n ,contiguous ,goal )
+
+
+@pytest .mark .parametrize ("fs_class",[LinkedFS ,IndexedFS ])
+@pytest .mark .parametrize ("goal_allocation",[False ,True ])
+def test_goal_allocation_places_the_file_around_its_first_block (fs_class ,goal_allocation :bool )->None :
+    fsm =RecordingManager (64 )
+    fsm .reserve_exact ([1 ,2 ,3 ])
+    fs =fs_class (Disk (64 ,BLOCK_SIZE ),fsm ,goal_allocation =goal_allocation )
+    fs .create ("a",4 )
+    n =5 if fs_class is IndexedFS else 4 
+    if goal_allocation :
+        assert fsm .calls ==[(1 ,None ),(n -1 ,0 )]
+    else :
+        assert fsm .calls ==[(n ,None )]
+    assert fsm .snapshot_bitmap ()[:n +3 ]==[1 ]*(n +3 )
+
+
+def test_goal_allocation_releases_the_first_block_on_failure ()->None :
+    fsm =FreeSpaceManager (8 )
+    fs =LinkedFS (Disk (8 ,BLOCK_SIZE ),fsm ,goal_allocation =True )
+    with pytest .raises (MemoryError ):
+        fs .create ("big",9 )
+    assert fsm .free_count ()==8 
@@ -0,0 +1,166 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .disk import Disk 
+from fsim .core .mapped_disk import MappedDisk 
+from fsim .core .tiered import TieredDisk 
+
+BLOCK_SIZE =16 
+
+
+class MigratingTieredDisk (TieredDisk ):
+
+    def read_block (self ,i :int ):
+        data =super ().read_block (i )
+        self .migrate ()
+        return data 
+
+    def write_block (self ,i :int ,data )->None :
+        super ().write_block (i ,data )
+        self .migrate ()
+
+
+def make_tiered (fast_blocks :int =4 ,**kwargs )->TieredDisk :
+    return TieredDisk (Disk (fast_blocks ,BLOCK_SIZE ),Disk (32 ,BLOCK_SIZE ),**kwargs )
+
+
+def heat_up (disk :TieredDisk ,block :int ,times :int )->None :
+    for _ in range (times ):
+        disk .read_block (block )
+
+
+def test_round_trip_matches_model_while_migrating ()->None :
+    disk =MigratingTieredDisk (Disk (8 ,BLOCK_SIZE ),Disk (64 ,BLOCK_SIZE ),decay_interval =32 ,migration_budget =3 )
+    model =exercise (disk ,random .Random (0 ))
+    assert disk .promotions >0 
+    assert disk .demotions >0 
+    assert_matches (disk ,model )
+
+
+def test_hot_blocks_are_promoted_and_served_from_the_fast_tier ()->None :
+    disk =make_tiered ()
+    disk .write_block (3 ,b"hot")
+    disk .write_block (5 ,b"cold")
+    heat_up (disk ,3 ,2 )
+    assert disk .hotness (3 )==3 
+    assert disk .migrate ()==1 
+    assert disk .is_fast (3 )
+    assert not disk .is_fast (5 )
+
+    hits =disk .tier_hits 
+    assert disk .read_block (3 )==b"hot"
+    assert disk .tier_hits ==hits +1 
+    assert disk .tier_stats ()["hot_blocks_in_fast_pct"]==100.0 
+
+
+def test_empty_blocks_are_not_promoted ()->None :
+    disk =make_tiered ()
+    heat_up (disk ,2 ,5 )
+    assert disk .migrate ()==0 
+
+
+def test_coldest_resident_is_demoted_and_dirty_blocks_written_back ()->None :
+    disk =make_tiered (fast_blocks =2 )
+    for block in (0 ,1 ):
+        disk .write_block (block ,bytes ([65 +block ]))
+        heat_up (disk ,block ,2 )
+    assert disk .migrate ()==2 
+    disk .write_block (0 ,b"dirty")
+    disk .write_block (7 ,b"new")
+    heat_up (disk ,7 ,6 )
+    disk .write_block (0 ,b"dirtier")
+
+    assert disk .migrate ()==1 
+    assert disk .is_fast (7 )
+    assert not disk .is_fast (1 )
+    assert disk .demotions ==1 
+    assert disk .writebacks ==0 
+    assert disk .slow .read_block (1 )==b"B"
+
+    heat_up (disk ,9 ,1 )
+    disk .write_block (9 ,b"x")
+    heat_up (disk ,9 ,20 )
+    disk .migrate ()
+    assert disk .writebacks ==1 
+    assert disk .slow .read_block (0 )==b"dirtier"
+
+
+def test_heat_decays_every_interval ()->None :
+    disk =make_tiered (decay_interval =4 )
+    heat_up (disk ,1 ,4 )
+    assert disk .hotness (1 )==2 
+    heat_up (disk ,2 ,8 )
+    assert disk .hotness (1 )==0 
+
+
+def test_migration_budget_limits_moves_per_round ()->None :
+    disk =make_tiered (migration_budget =1 )
+    for block in (1 ,2 ,3 ):
+        disk .write_block (block ,b"x")
+        heat_up (disk ,block ,3 )
+    assert disk .migrate ()==1 
+    assert disk .is_fast (1 )
+
+
+def test_invalid_configuration_is_rejected ()->None :
+    with pytest .raises (ValueError ):
+        TieredDisk (Disk (4 ,BLOCK_SIZE ),Disk (32 ,32 ))
+    with pytest .raises (ValueError ):
+        make_tiered (promote_threshold =0 )
+
+
+def test_clear_and_trim_release_fast_slots_without_writeback ()->None :
+    disk =make_tiered (fast_blocks =2 )
+    for block in (0 ,1 ):
+        disk .write_block (block ,b"v")
+        heat_up (disk ,block ,2 )
+    disk .migrate ()
+    disk .write_block (0 ,b"dirty")
+
+    disk .write_block (0 ,None )
+    disk .trim ([1 ])
+    assert not disk .is_fast (0 )and not disk .is_fast (1 )
+    assert disk .hotness (0 )==disk .hotness (1 )==0 
+    assert disk .writebacks ==0 
+    assert disk .slow .read_block (0 )is None and disk .slow .read_block (1 )is None 
+    assert disk .used_blocks_count ()==0 
+    assert disk .tier_stats ()["hot_blocks"]==0 
+
+
+def test_dirty_victim_is_kept_when_the_budget_cannot_cover_the_promotion ()->None :
+    def round_with (budget :int ):
+        disk =make_tiered (fast_blocks =1 ,migration_budget =budget )
+        disk .write_block (0 ,b"a")
+        heat_up (disk ,0 ,2 )
+        disk .migrate ()
+        disk .write_block (0 ,b"dirty")
+        disk .write_block (5 ,b"hot")
+        heat_up (disk ,5 ,8 )
+        return disk ,disk .migrate ()
+
+    disk ,moved =round_with (1 )
+    assert moved ==0 
+    assert disk .is_fast (0 )and not disk .is_fast (5 )
+    assert disk .writebacks ==0 
+
+    disk ,moved =round_with (2 )
+    assert moved ==2 
+    assert disk .is_fast (5 )
+    assert disk .slow .read_block (0 )==b"dirty"
+
+
+def test_close_writes_back_dirty_blocks_and_closes_both_tiers (tmp_path )->None :
+    slow =MappedDisk (tmp_path /"slow.img",32 ,BLOCK_SIZE )
+    disk =TieredDisk (Disk (4 ,BLOCK_SIZE ),slow )
+    disk .write_block (3 ,b"a")
+    heat_up (disk ,3 ,2 )
+    disk .migrate ()
+    disk .write_block (3 ,b"dirty")
+    disk .close ()
+    assert slow .closed 
+    assert disk .writebacks ==1 
+    with MappedDisk .open (tmp_path /"slow.img")as reopened :
+        assert reopened .read_block (3 )==b"dirty"
@@ -0,0 +1,106 @@
+from __future__ import annotations 
+import random 
+
+import pytest 
+
+from disk_model import assert_matches ,exercise 
+from fsim .core .zoned_disk import ZONE_VIOLATION_MODES ,ZonedDisk 
+
+BLOCK_SIZE =16 
+
+
+def make_disk (**kwargs )->ZonedDisk :
+    return ZonedDisk (32 ,BLOCK_SIZE ,zone_blocks =8 ,**kwargs )
+
+
+@pytest .mark .parametrize ("mode",ZONE_VIOLATION_MODES )
+def test_round_trip_matches_model (mode )->None :
+    disk =ZonedDisk (100 ,BLOCK_SIZE ,zone_blocks =16 ,on_violation =mode )
+    model =exercise (disk ,random .Random (0 ))
+    assert_matches (disk ,model )
+
+
+def test_sequential_writes_advance_the_write_pointer ()->None :
+    disk =make_disk ()
+    disk .write_range (0 ,b"a"*BLOCK_SIZE *10 ,10 )
+    assert disk .write_pointer (0 )==8 
+    assert disk .write_pointer (1 )==10 
+    stats =disk .zone_stats ()
+    assert stats ["violations"]==0 
+    assert stats ["write_amplification"]==1.0 
+    assert (stats ["full_zones"],stats ["open_zones"],stats ["empty_zones"])==(1 ,1 ,2 )
+
+
+def test_in_place_write_rewrites_the_live_prefix ()->None :
+    disk =make_disk ()
+    for i in range (4 ):
+        disk .write_block (i ,b"x")
+    disk .write_block (1 ,b"y")
+
+    stats =disk .zone_stats ()
+    assert stats ["violations"]==1 
+    assert stats ["rewrite_resets"]==1 
+    assert stats ["relocated_blocks"]==3 
+    assert stats ["host_blocks_written"]==5 
+    assert stats ["device_blocks_written"]==8 
+    assert disk .write_pointer (0 )==4 
+    assert (disk .stats ()["reads"],disk .stats ()["writes"])==(3 ,8 )
+    assert disk .read_block (1 )==b"y"
+
+
+def test_rewrite_skips_empty_blocks_in_the_prefix ()->None :
+    disk =make_disk (on_violation ="rewrite")
+    for i in range (4 ):
+        disk .write_block (i ,b"x")
+    disk .write_block (2 ,None )
+    disk .write_block (1 ,b"y")
+    assert disk .zone_stats ()["relocated_blocks"]==2 
+    assert disk .stats ()["reads"]==2 
+
+
+def test_write_past_the_pointer_pads_the_gap ()->None :
+    disk =make_disk ()
+    disk .write_block (0 ,b"x")
+    disk .write_block (3 ,b"z")
+    stats =disk .zone_stats ()
+    assert stats ["padded_blocks"]==2 
+    assert stats ["device_blocks_written"]==4 
+    assert disk .write_pointer (0 )==4 
+
+
+def test_count_mode_only_tallies_violations ()->None :
+    disk =make_disk (on_violation ="count")
+    for i in range (4 ):
+        disk .write_block (i ,b"x")
+    disk .write_block (1 ,b"y")
+    stats =disk .zone_stats ()
+    assert stats ["violations"]==1 
+    assert stats ["relocated_blocks"]==0 
+    assert stats ["device_blocks_written"]==stats ["host_blocks_written"]==5 
+
+
+def test_clearing_the_last_live_block_resets_the_zone ()->None :
+    disk =make_disk ()
+    disk .write_range (8 ,b"a"*BLOCK_SIZE *3 ,3 )
+    disk .write_block (8 ,None )
+    disk .trim ([9 ])
+    assert disk .zone_stats ()["zone_resets"]==0 
+    disk .trim ([10 ])
+    assert disk .zone_stats ()["zone_resets"]==1 
+    assert disk .write_pointer (1 )==8 
+    disk .write_block (8 ,b"again")
+    assert disk .zone_stats ()["violations"]==0 
+
+
+def test_reset_zone_and_report ()->None :
+    disk =make_disk ()
+    disk .write_range (0 ,b"a"*BLOCK_SIZE *5 ,5 )
+    disk .write_block (2 ,None )
+    assert disk .zone_report ()[0 ]=={"zone":0 ,"write_pointer":5 ,"live_blocks":4 ,"size":8 }
+    disk .reset_zone (0 )
+    assert disk .zone_report ()[0 ]["live_blocks"]==0 
+    assert disk .write_pointer (0 )==0 
+    with pytest .raises (IndexError ):
+        disk .reset_zone (4 )
+    with pytest .raises (ValueError ):
+        make_disk (on_violation ="ignore")